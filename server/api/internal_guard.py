@@ -1,12 +1,18 @@
 import logging
 import os
-from typing import Tuple
+import threading
+import time
+from typing import Dict, Tuple
 
 import requests
 
 _GO_SERVICE_URL = os.getenv("GO_SERVICE_URL", "http://localhost:5276")
 _GUARD_ENDPOINT = f"{_GO_SERVICE_URL}/seeding-limit/check"
 _REQUEST_TIMEOUT = 15
+# 同一下载器的校验结果短暂复用：批量发布时多个目标站点会在很短时间内重复校验
+_GATE_CACHE_TTL = 2.0
+_gate_cache: Dict[str, Tuple[float, Tuple[bool, str]]] = {}
+_gate_cache_lock = threading.Lock()
 
 
 def check_downloader_gate(downloader_id: str, *_args, **_kwargs) -> Tuple[bool, str]:
@@ -38,3 +44,20 @@ def check_downloader_gate(downloader_id: str, *_args, **_kwargs) -> Tuple[bool,
         return True, ""
 
     return bool(payload.get("can_continue", True)), payload.get("message", "")
+
+
+def check_downloader_gate_cached(downloader_id: str) -> Tuple[bool, str]:
+    """check_downloader_gate 的短 TTL 缓存版本，结果在 _GATE_CACHE_TTL 秒内复用。"""
+    if not downloader_id:
+        return True, ""
+
+    now = time.monotonic()
+    with _gate_cache_lock:
+        cached = _gate_cache.get(downloader_id)
+    if cached and now - cached[0] < _GATE_CACHE_TTL:
+        return cached[1]
+
+    result = check_downloader_gate(downloader_id)
+    with _gate_cache_lock:
+        _gate_cache[downloader_id] = (now, result)
+    return result
@@ -1,11 +1,11 @@
 # server/api/routes_cross_seed_data.py
 from flask import Blueprint, jsonify, current_app, request
 import logging
-import yaml
-import os
 import time
 import json
 from datetime import datetime, timedelta
+from utils.global_mappings import load_global_mappings_config
+from models.seed_parameter import invalidate_seed_identity_cache
 
 # 创建蓝图
 cross_seed_data_bp = Blueprint("cross_seed_data", __name__, url_prefix="/api")
@@ -46,18 +46,17 @@ def generate_reverse_mappings():
     """Generate reverse mappings from standard keys to Chinese display names"""
     try:
         # Import config_manager
-        from config import config_manager, GLOBAL_MAPPINGS
+        from config import config_manager
 
-        # First try to read from global_mappings.yaml
+        # First try to read from global_mappings.yaml (parsed once per file mtime)
         global_mappings = {}
 
-        if os.path.exists(GLOBAL_MAPPINGS):
-            try:
-                with open(GLOBAL_MAPPINGS, "r", encoding="utf-8") as f:
-                    config_data = yaml.safe_load(f)
-                    global_mappings = config_data.get("global_standard_keys", {})
-            except Exception as e:
-                logging.warning(f"Failed to read global_mappings.yaml: {e}")
+        try:
+            config_data = load_global_mappings_config()
+            if config_data is not None:
+                global_mappings = config_data.get("global_standard_keys", {})
+        except Exception as e:
+            logging.warning(f"Failed to read global_mappings.yaml: {e}")
 
         # If YAML file read fails, get from config manager
         if not global_mappings:
@@ -629,6 +628,7 @@ def delete_cross_seed_data():
                     cursor.execute(delete_query, (torrent_id, site_name))
 
                 deleted_count += 1
+                invalidate_seed_identity_cache(torrent_id, site_name)
 
             conn.commit()
 
@@ -663,6 +663,7 @@ def delete_cross_seed_data():
                 cursor.execute(delete_query, (torrent_id, site_name))
 
             conn.commit()
+            invalidate_seed_identity_cache(torrent_id, site_name)
 
             return jsonify(
                 {"success": True, "message": f"种子数据 {torrent_id} from {site_name} 已删除"}
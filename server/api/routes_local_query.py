@@ -1,71 +1,204 @@
 import logging
 import os
-import json
+import re
+import tempfile
 from pathlib import Path
-from flask import Blueprint, jsonify
-from collections import defaultdict
+import orjson
+from flask import Blueprint, current_app, request, stream_with_context
+from collections import defaultdict, namedtuple
+from contextlib import closing
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import chain, groupby
 from config import config_manager, DATA_DIR
 from utils import _get_downloader_proxy_config
+from utils.json_response import dumps as _dumps, jsonify_compat as jsonify
 import requests
+from requests.adapters import HTTPAdapter
 
 logger = logging.getLogger(__name__)
 
+# 代理文件检查复用同一个会话，保持 HTTP keep-alive，避免每次调用重新建连
+_proxy_session = requests.Session()
+_proxy_session.mount("http://",
+                     HTTPAdapter(pool_connections=8, pool_maxsize=32))
+_proxy_session.mount("https://",
+                     HTTPAdapter(pool_connections=8, pool_maxsize=32))
+
+MULTI_SLASH_PATTERN = re.compile(r"/{2,}")
+
 
 def _normalize_path(path):
     """与 proxy.go normalizePath 保持一致的路径归一化
     将反斜杠替换为正斜杠，移除连续的双斜杠"""
-    normalized = path.replace("\\", "/")
-    while "//" in normalized:
-        normalized = normalized.replace("//", "/")
-    return normalized
+    return MULTI_SLASH_PATTERN.sub("/", path.replace("\\", "/"))
+
 
 local_query_bp = Blueprint("local_query_api",
                            __name__,
                            url_prefix="/api/local_query")
 
 # 缓存文件路径
-SCAN_CACHE_FILE = os.path.join(DATA_DIR, "local_scan_cache.json")
+SCAN_CACHE_FILE = os.path.join(DATA_DIR, "local_scan_cache.ndjson")
+# 旧版本写出的整块 JSON 缓存，首次读取时转存为 NDJSON，新缓存写入后删除
+LEGACY_SCAN_CACHE_FILE = os.path.join(DATA_DIR, "local_scan_cache.json")
+# 扫描结果中的列表字段（缓存与流式响应按此顺序输出）
+SCAN_RESULT_LISTS = ("missing_files", "orphaned_files", "synced_torrents")
+# 缓存文件中各列表记录行的前缀，例如 b'["missing_files",'
+SCAN_CACHE_LINE_PREFIXES = tuple(
+    (key, b'["' + key.encode() + b'",') for key in SCAN_RESULT_LISTS)
+# 流式响应每次写出的字节数
+STREAM_CHUNK_SIZE = 64 * 1024
+# 扫描过程中每条种子记录的轻量表示（替代逐行构建 dict）
+ScanTorrent = namedtuple(
+    "ScanTorrent",
+    "name save_path size downloader_id downloader_name is_remote local_path")
+# 扫描时每批从数据库读取的种子行数
+SCAN_FETCH_BATCH_SIZE = 10000
+# 远程路径并发检查的最大线程数
+REMOTE_CHECK_MAX_WORKERS = 8
+# 重复种子分析最多返回的同名组数，避免响应体无限增长
+DUPLICATE_GROUPS_LIMIT = 1000
 
 # --- 依赖注入占位符 ---
 # db_manager = None
 
 
 def save_scan_cache(scan_result):
-    """保存扫描结果到缓存文件"""
+    """保存扫描结果到缓存文件
+
+    缓存为 NDJSON：首行是 scan_summary，之后每行一条 [列表名, 记录]，
+    逐条写盘，避免把整个结果再序列化成一个大字符串。
+    先写入同目录的临时文件再原子替换，读取方不会看到写了一半的缓存。
+    """
+    fd, tmp_path = tempfile.mkstemp(prefix="local_scan_cache.",
+                                    suffix=".tmp",
+                                    dir=os.path.dirname(SCAN_CACHE_FILE))
     try:
-        with open(SCAN_CACHE_FILE, 'w', encoding='utf-8') as f:
-            json.dump(scan_result, f, ensure_ascii=False, indent=2)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(_dumps({"scan_summary": scan_result["scan_summary"]}))
+            f.write(b"\n")
+            for key in SCAN_RESULT_LISTS:
+                for item in scan_result.get(key, []):
+                    f.write(_dumps([key, item]))
+                    f.write(b"\n")
+        os.replace(tmp_path, SCAN_CACHE_FILE)
         logger.info(f"扫描结果已保存到缓存: {SCAN_CACHE_FILE}")
+        try:
+            os.remove(LEGACY_SCAN_CACHE_FILE)
+        except OSError:
+            pass
     except Exception as e:
         logger.error(f"保存扫描缓存失败: {str(e)}")
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
 
+def _iter_cache_entries(f):
+    """逐行读取缓存文件中的 (列表名, 已序列化记录)
 
-def load_scan_cache():
-    """从缓存文件读取扫描结果"""
+    行由 save_scan_cache 以紧凑格式写出，直接按前缀截取记录的字节，无需反序列化再序列化。
+    """
+    for line in f:
+        line = line.rstrip(b"\r\n")
+        if not line:
+            continue
+        for key, prefix in SCAN_CACHE_LINE_PREFIXES:
+            if line.startswith(prefix) and line.endswith(b"]"):
+                yield key, line[len(prefix):-1]
+                break
+        else:
+            key, item = orjson.loads(line)
+            yield key, _dumps(item)
+
+
+def _iter_scan_json(summary, entries):
+    """把 scan_summary 与按 SCAN_RESULT_LISTS 顺序排列的 (列表名, 已序列化记录)
+    拼成完整的 JSON 对象，按约 STREAM_CHUNK_SIZE 字节分块产出，减少 WSGI 写次数"""
+    buf = bytearray(b'{"scan_summary":')
+    buf += summary
+    pending = list(SCAN_RESULT_LISTS)
+    current = None
+    for key, item in entries:
+        if key != current:
+            if key not in pending:
+                continue
+            if current is not None:
+                buf += b"]"
+            # 补齐中间没有记录的列表
+            while pending[0] != key:
+                buf += b',"' + pending.pop(0).encode() + b'":[]'
+            pending.pop(0)
+            buf += b',"' + key.encode() + b'":['
+            current = key
+        else:
+            buf += b","
+        buf += item
+        if len(buf) >= STREAM_CHUNK_SIZE:
+            yield bytes(buf)
+            buf.clear()
+    if current is not None:
+        buf += b"]"
+    for key in pending:
+        buf += b',"' + key.encode() + b'":[]'
+    buf += b"}"
+    yield bytes(buf)
+
+
+def stream_scan_result(scan_result):
+    """以流式 JSON 返回扫描结果，逐条序列化，不在内存中拼出完整响应体"""
+    entries = ((key, _dumps(item)) for key in SCAN_RESULT_LISTS
+               for item in scan_result.get(key, []))
+    generate = _iter_scan_json(_dumps(scan_result["scan_summary"]), entries)
+    return current_app.response_class(stream_with_context(generate),
+                                      mimetype="application/json")
+
+
+def _stream_legacy_scan_cache():
+    """读取旧版本的 JSON 缓存并转存为 NDJSON，之后改读新缓存；旧缓存也不存在时返回 None"""
     try:
-        if os.path.exists(SCAN_CACHE_FILE):
-            with open(SCAN_CACHE_FILE, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            logger.info(f"从缓存加载扫描结果: {SCAN_CACHE_FILE}")
-            return data
-        return None
-    except Exception as e:
-        logger.error(f"加载扫描缓存失败: {str(e)}")
+        with open(LEGACY_SCAN_CACHE_FILE, 'rb') as f:
+            scan_result = orjson.loads(f.read())
+    except FileNotFoundError:
         return None
+    logger.info(f"从旧版缓存读取扫描结果: {LEGACY_SCAN_CACHE_FILE}")
+    save_scan_cache(scan_result)
+    return stream_scan_result(scan_result)
 
 
-def get_downloader_name_from_config(downloader_id):
-    """从配置文件中获取下载器名称"""
+def stream_scan_cache():
+    """以流式 JSON 返回缓存文件内容，逐行读取，不把整个缓存加载到内存；缓存不存在时返回 None"""
     try:
-        config = config_manager.get()
-        downloaders = config.get("downloaders", [])
-        for dl in downloaders:
-            if dl.get("id") == downloader_id:
-                return dl.get("name", "未知")
-        return "未知"
+        f = open(SCAN_CACHE_FILE, 'rb')
+    except FileNotFoundError:
+        return _stream_legacy_scan_cache()
+    try:
+        summary = _dumps(orjson.loads(f.readline())["scan_summary"])
+    except Exception:
+        f.close()
+        raise
+
+    def generate():
+        with f:
+            yield from _iter_scan_json(summary, _iter_cache_entries(f))
+
+    logger.info(f"从缓存读取扫描结果: {SCAN_CACHE_FILE}")
+    return current_app.response_class(stream_with_context(generate()),
+                                      mimetype="application/json")
+
+
+def get_downloader_names_from_config():
+    """从配置文件中一次性获取所有下载器 ID 到名称的映射"""
+    names = {}
+    try:
+        for dl in config_manager.get().get("downloaders", []):
+            # ID 重复时以配置中的第一个为准
+            names.setdefault(dl.get("id"), dl.get("name", "未知"))
     except Exception as e:
         logger.error(f"从配置获取下载器名称失败: {str(e)}")
-        return "未知"
+    return names
 
 
 def check_remote_file_exists(proxy_config, remote_path):
@@ -77,7 +210,7 @@ def check_remote_file_exists(proxy_config, remote_path):
     :return: (exists, is_file, size) 元组
     """
     try:
-        response = requests.post(
+        response = _proxy_session.post(
             f"{proxy_config['proxy_base_url']}/api/file/check",
             json={"remote_path": remote_path},
             timeout=30)
@@ -112,7 +245,7 @@ def batch_check_remote_files(proxy_config, remote_paths):
     try:
         logger.info(f"发送给代理的路径列表 ({len(remote_paths)} 个): {remote_paths}")
 
-        response = requests.post(
+        response = _proxy_session.post(
             f"{proxy_config['proxy_base_url']}/api/file/batch-check",
             json={"remote_paths": remote_paths},
             timeout=180  # 批量检查可能需要更长时间
@@ -151,9 +284,9 @@ def batch_check_remote_files(proxy_config, remote_paths):
 def get_scan_cache():
     """获取上次扫描的缓存结果"""
     try:
-        cached_result = load_scan_cache()
-        if cached_result:
-            return jsonify(cached_result)
+        response = stream_scan_cache()
+        if response is not None:
+            return response
         else:
             return jsonify({"error": "No cached scan result"}), 404
     except Exception as e:
@@ -166,23 +299,19 @@ def get_paths():
     """获取数据库中所有唯一的保存路径"""
     try:
         db_manager = local_query_bp.db_manager
-        conn = db_manager._get_connection()
-        cursor = db_manager._get_cursor(conn)
+        with closing(db_manager._get_connection()) as conn:
+            cursor = db_manager._get_cursor(conn)
 
-        cursor.execute("""
-            SELECT DISTINCT save_path
-            FROM torrents
-            WHERE save_path IS NOT NULL AND TRIM(save_path) != ''
-            ORDER BY save_path
-        """)
-
-        rows = cursor.fetchall()
-        paths = [
-            row['save_path'] if isinstance(row, dict) else row[0]
-            for row in rows
-        ]
+            cursor.execute("""
+                SELECT DISTINCT save_path
+                FROM torrents
+                WHERE save_path IS NOT NULL AND TRIM(save_path) != ''
+                ORDER BY save_path
+            """)
 
-        conn.close()
+            rows = cursor.fetchall()
+            # _get_cursor 对所有后端都返回可按列名索引的行（sqlite3.Row / dict）
+            paths = [row['save_path'] for row in rows]
 
         return jsonify({"paths": paths, "total": len(paths)})
     except Exception as e:
@@ -202,10 +331,69 @@ def get_downloaders_with_paths():
             return jsonify({"downloaders": []})
 
         db_manager = local_query_bp.db_manager
-        conn = db_manager._get_connection()
-        cursor = db_manager._get_cursor(conn)
+        with closing(db_manager._get_connection()) as conn:
+            cursor = db_manager._get_cursor(conn)
+
+            # 一次查询所有下载器的唯一路径，路径映射（本地 -> 远程）也在 SQL 中展开，
+            # 返回的即是按 (下载器, 路径) 合并好的计数
+            downloader_ids = [dl.get("id") for dl in downloaders_config]
+            mapping_rows = []
+            for downloader in downloaders_config:
+                for mapping in downloader.get("path_mappings", []):
+                    remote = mapping.get("remote", "").rstrip("/")
+                    local = mapping.get("local", "").rstrip("/")
+                    if remote and local:
+                        mapping_rows.append((downloader.get("id"), remote, local))
+
+            ph = db_manager.get_placeholder()
+            placeholders = ", ".join([ph] * len(downloader_ids))
+            params = list(downloader_ids)
+            union_sql = f"""
+                SELECT downloader_id, save_path AS path, COUNT(*) AS torrent_count
+                FROM torrents
+                WHERE downloader_id IN ({placeholders}) AND save_path IS NOT NULL AND TRIM(save_path) != ''
+                GROUP BY downloader_id, save_path
+            """
+            if mapping_rows:
+                if db_manager.db_type == "mysql":
+                    length_fn = "CHAR_LENGTH"
+                    mapped_path_sql = "CONCAT(m.remote_root, SUBSTR(t.save_path, CHAR_LENGTH(m.local_root) + 1))"
+                    local_prefix_sql = "CONCAT(m.local_root, '/')"
+                else:
+                    length_fn = "LENGTH"
+                    mapped_path_sql = "m.remote_root || SUBSTR(t.save_path, LENGTH(m.local_root) + 1)"
+                    local_prefix_sql = "m.local_root || '/'"
+                mapping_table_sql = " UNION ALL ".join(
+                    [f"SELECT {ph} AS downloader_id, {ph} AS remote_root, {ph} AS local_root"]
+                    + [f"SELECT {ph}, {ph}, {ph}"] * (len(mapping_rows) - 1))
+                # 确保完整匹配路径段，避免 /pt 匹配 /pt2
+                union_sql += f"""
+                UNION ALL
+                SELECT t.downloader_id, {mapped_path_sql} AS path, COUNT(*) AS torrent_count
+                FROM torrents t
+                JOIN ({mapping_table_sql}) m ON t.downloader_id = m.downloader_id
+                    AND (t.save_path = m.local_root
+                         OR SUBSTR(t.save_path, 1, {length_fn}(m.local_root) + 1) = {local_prefix_sql})
+                WHERE t.save_path IS NOT NULL AND TRIM(t.save_path) != ''
+                GROUP BY t.downloader_id, t.save_path, m.remote_root, m.local_root
+                """
+                for row in mapping_rows:
+                    params.extend(row)
+
+            cursor.execute(
+                f"""
+                SELECT downloader_id, path, SUM(torrent_count) AS torrent_count
+                FROM ({union_sql}) AS combined
+                GROUP BY downloader_id, path
+            """, tuple(params))
+            paths_by_downloader = defaultdict(dict)
+            for row in cursor.fetchall():
+                paths_by_downloader[row['downloader_id']][row['path']] = int(
+                    row['torrent_count'])
 
         result = []
+        # 多个下载器常共享同一批本地目录，存在性检查结果在本次请求内复用
+        path_exists_cache = {}
         for downloader in downloaders_config:
             downloader_id = downloader.get("id")
             downloader_name = downloader.get("name", "未知")
@@ -215,45 +403,8 @@ def get_downloaders_with_paths():
             proxy_config = _get_downloader_proxy_config(downloader_id)
             is_remote = proxy_config is not None
 
-            # 查询该下载器的所有唯一路径
-            ph = db_manager.get_placeholder()
-            cursor.execute(
-                f"""
-                SELECT save_path, COUNT(*) as torrent_count
-                FROM torrents
-                WHERE downloader_id = {ph} AND save_path IS NOT NULL AND TRIM(save_path) != ''
-                GROUP BY save_path ORDER BY save_path
-            """, (downloader_id, ))
-
-            paths_data = cursor.fetchall()
-            paths_set = {}  # 使用字典来合并相同路径的计数
-
-            # 处理原始路径
-            for row in paths_data:
-                save_path = row['save_path'] if isinstance(row,
-                                                           dict) else row[0]
-                count = row['torrent_count'] if isinstance(row,
-                                                           dict) else row[1]
-
-                # 原始路径
-                if save_path not in paths_set:
-                    paths_set[save_path] = 0
-                paths_set[save_path] += count
-
-                # 应用路径映射，生成映射后的路径
-                # 从本地路径映射到远程路径，用于补充筛选选项
-                for mapping in path_mappings:
-                    remote = mapping.get("remote", "").rstrip("/")
-                    local = mapping.get("local", "").rstrip("/")
-                    if remote and local:
-                        # 确保完整匹配路径段，避免 /pt 匹配 /pt2
-                        if save_path == local or save_path.startswith(local +
-                                                                      "/"):
-                            # 将本地路径映射到远程路径
-                            mapped_path = save_path.replace(local, remote, 1)
-                            if mapped_path not in paths_set:
-                                paths_set[mapped_path] = 0
-                            paths_set[mapped_path] += count
+            # 该下载器的所有唯一路径（含映射后的路径）及种子数
+            paths_set = paths_by_downloader.get(downloader_id, {})
 
             # 转换为列表格式
             paths = []
@@ -271,7 +422,10 @@ def get_downloaders_with_paths():
                                 break
 
                     # 检查路径是否存在
-                    if os.path.exists(local_path):
+                    if local_path not in path_exists_cache:
+                        path_exists_cache[local_path] = os.path.exists(
+                            local_path)
+                    if path_exists_cache[local_path]:
                         paths.append({
                             "path": path,
                             "count": count
@@ -292,7 +446,6 @@ def get_downloaders_with_paths():
                     "paths": paths
                 })
 
-        conn.close()
         return jsonify({"downloaders": result})
     except Exception as e:
         logger.error(f"获取下载器路径统计失败: {str(e)}")
@@ -310,7 +463,6 @@ def scan_local_files():
     - 判断下载器是否为远程，远程下载器跳过本地文件检查
     - **优化：检测并扫描所有路径映射中的目录，即使数据库中没有对应种子**
     """
-    from flask import request
 
     # 获取查询参数中的路径
     target_path = request.args.get('path', None)
@@ -321,105 +473,127 @@ def scan_local_files():
         downloaders_config = config.get("downloaders", [])
         path_mappings_by_downloader = {}
         remote_downloaders = set()  # 存储使用代理的远程下载器ID
+        # 下载器名称与代理配置只在这里解析一次，避免逐个种子扫描配置
+        name_by_id = {}
+        proxy_config_by_id = {}
+        # 预处理后的映射表：(remote, remote + "/", local)，最长前缀优先匹配
+        mappings_by_id = {}
+        # 本地下载器的反向映射表：(local, local + "/", remote)，最长前缀优先匹配
+        reverse_mappings = []
 
         for dl in downloaders_config:
             dl_id = dl.get("id")
             path_mappings_by_downloader[dl_id] = dl.get("path_mappings", [])
+            mapping_pairs = [(m.get("remote", "").rstrip("/"),
+                              m.get("local", "").rstrip("/"))
+                             for m in dl.get("path_mappings", [])]
+            mapping_pairs = [(remote, local) for remote, local in mapping_pairs
+                             if remote and local]
+            mappings_by_id[dl_id] = tuple(
+                (remote, remote + "/", local) for remote, local in sorted(
+                    mapping_pairs, key=lambda pair: -len(pair[0])))
+            name_by_id[dl_id] = dl.get("name", "未知")
             # 使用已有的函数判断是否为远程下载器
             proxy_config = _get_downloader_proxy_config(dl_id)
+            proxy_config_by_id[dl_id] = proxy_config
             if proxy_config:
                 remote_downloaders.add(dl_id)
                 logger.info(
                     f"下载器 {dl.get('name')} (ID: {dl_id}) 使用代理，将跳过本地文件检查")
-            print(
-                f"[DEBUG] 下载器: {dl.get('name')} (ID: {dl_id}), 远程: {dl_id in remote_downloaders}, 映射数: {len(dl.get('path_mappings', []))}"
-            )
-
-        db_manager = local_query_bp.db_manager
-        conn = db_manager._get_connection()
-        cursor = db_manager._get_cursor(conn)
-
-        # 1. 查询所有需要扫描的种子数据
-        if target_path:
-            # 如果指定了路径，只查询该路径下的种子
-            ph = db_manager.get_placeholder()
-            cursor.execute(
-                f"""
-                SELECT t.name, t.save_path, t.size, t.downloader_id
-                FROM torrents t
-                WHERE t.save_path = {ph}
-            """, (target_path, ))
-        else:
-            # 否则查询所有路径
-            cursor.execute("""
-                SELECT t.name, t.save_path, t.size, t.downloader_id
-                FROM torrents t
-                WHERE t.save_path IS NOT NULL AND TRIM(t.save_path) != ''
-            """)
-        torrents = cursor.fetchall()
-        conn.close()
+            else:
+                reverse_mappings.extend((local, local + "/", remote)
+                                        for remote, local in mapping_pairs)
+            logger.debug("下载器: %s (ID: %s), 远程: %s, 映射数: %d",
+                         dl.get('name'), dl_id, dl_id in remote_downloaders,
+                         len(mapping_pairs))
+        reverse_mappings.sort(key=lambda entry: -len(entry[0]))
 
         # 辅助函数：应用路径映射
+        # 同一 save_path 会被大量种子重复使用，按 (路径, 下载器) 缓存映射结果；
+        # 缓存随本次请求的闭包一起释放
+        @lru_cache(maxsize=None)
         def apply_path_mapping(remote_path, downloader_id):
             """将远程路径映射为本地路径"""
-            mappings = path_mappings_by_downloader.get(downloader_id, [])
-            print(
-                f"[DEBUG] apply_path_mapping: 远程路径={remote_path}, 下载器ID={downloader_id}, 映射规则数={len(mappings)}"
-            )
-            for mapping in mappings:
-                remote = mapping.get("remote", "").rstrip("/")
-                local = mapping.get("local", "").rstrip("/")
-                print(f"[DEBUG]   检查映射: remote={remote}, local={local}")
-                if remote and local:
-                    # 确保完整匹配路径段，避免 /pt 匹配 /pt2
-                    if remote_path == remote or remote_path.startswith(remote +
-                                                                       "/"):
-                        mapped = remote_path.replace(remote, local, 1)
-                        print(f"[DEBUG]   ✓ 匹配成功! 映射后={mapped}")
-                        return mapped
-            print(f"[DEBUG]   ✗ 无匹配映射，返回原路径={remote_path}")
+            # 确保完整匹配路径段，避免 /pt 匹配 /pt2
+            for remote, remote_prefix, local in mappings_by_id.get(
+                    downloader_id, ()):
+                if remote_path == remote or remote_path.startswith(
+                        remote_prefix):
+                    return local + remote_path[len(remote):]
             return remote_path  # 如果没有匹配的映射，返回原路径
 
-        # 2. 按 save_path 进行初次分组，并应用路径映射
-        # 分别处理本地和远程下载器
-        local_torrents_by_path = defaultdict(list)
-        remote_torrents_by_path = defaultdict(list)
-
-        for torrent in torrents:
-            row_data = dict(torrent)
-            downloader_id = row_data.get("downloader_id")
-            # 从配置文件获取下载器名称
-            row_data["downloader_name"] = get_downloader_name_from_config(
-                downloader_id)
-
-            # 判断是否为远程下载器
-            is_remote = downloader_id in remote_downloaders
-
-            if is_remote:
-                # 远程下载器：不进行路径映射，直接使用原路径
-                original_path = row_data['save_path']
-                row_data['is_remote'] = True
-                remote_torrents_by_path[original_path].append(row_data)
-                print(
-                    f"[DEBUG] 远程种子: {row_data['name'][:50]} | 路径: {original_path}"
-                )
+        # 辅助函数：反向映射，从本地路径推断远程路径
+        @lru_cache(maxsize=None)
+        def reverse_path_mapping(local_path):
+            """将本地路径映射回远程路径，无匹配时返回原路径"""
+            for local_root, local_prefix, remote_root in reverse_mappings:
+                if local_path == local_root or local_path.startswith(
+                        local_prefix):
+                    return remote_root + local_path[len(local_root):]
+            return local_path
+
+        db_manager = local_query_bp.db_manager
+        with closing(db_manager._get_connection()) as conn:
+            cursor = db_manager._get_cursor(conn)
+
+            # 1. 查询所有需要扫描的种子数据
+            if target_path:
+                # 如果指定了路径，只查询该路径下的种子
+                ph = db_manager.get_placeholder()
+                cursor.execute(
+                    f"""
+                    SELECT t.name, t.save_path, t.size, t.downloader_id
+                    FROM torrents t
+                    WHERE t.save_path = {ph}
+                """, (target_path, ))
             else:
-                # 本地下载器：应用路径映射
-                original_path = row_data['save_path']
-                mapped_path = apply_path_mapping(original_path, downloader_id)
-                row_data['local_path'] = mapped_path  # 保存映射后的本地路径
-                row_data['is_remote'] = False
-                local_torrents_by_path[mapped_path].append(row_data)
-                print(
-                    f"[DEBUG] 本地种子: {row_data['name'][:50]} | 原始: {original_path} | 映射: {mapped_path}"
-                )
+                # 否则查询所有路径
+                cursor.execute("""
+                    SELECT t.name, t.save_path, t.size, t.downloader_id
+                    FROM torrents t
+                    WHERE t.save_path IS NOT NULL AND TRIM(t.save_path) != ''
+                """)
+
+            # 2. 按 save_path 进行初次分组，并应用路径映射
+            # 分别处理本地和远程下载器；分批读取结果，避免一次性把全部行载入内存
+            local_torrents_by_path = defaultdict(list)
+            remote_torrents_by_path = defaultdict(list)
+            # (是否远程, 分组路径, 种子名) -> 下载器名称集合，分组时顺带去重
+            downloader_names_by_group = defaultdict(set)
+            total_torrents_count = 0
+
+            while True:
+                torrents = cursor.fetchmany(SCAN_FETCH_BATCH_SIZE)
+                if not torrents:
+                    break
+                total_torrents_count += len(torrents)
+
+                for row in torrents:
+                    downloader_id = row['downloader_id']
+                    save_path = row['save_path']
+                    # 判断是否为远程下载器
+                    is_remote = downloader_id in remote_downloaders
+                    # 远程下载器不进行路径映射；本地下载器保存映射后的本地路径
+                    mapped_path = None if is_remote else apply_path_mapping(
+                        save_path, downloader_id)
+                    record = ScanTorrent(row['name'], save_path, row['size'] or 0,
+                                         downloader_id,
+                                         name_by_id.get(downloader_id, "未知"),
+                                         is_remote, mapped_path)
+                    if is_remote:
+                        remote_torrents_by_path[save_path].append(record)
+                        group_key = (True, save_path, record.name)
+                    else:
+                        local_torrents_by_path[mapped_path].append(record)
+                        group_key = (False, mapped_path, record.name)
+                    downloader_names_by_group[group_key].add(
+                        record.downloader_name)
 
         # 3. 初始化扫描结果
         missing_files = []
         orphaned_files = []
         synced_torrents = []
         total_local_items = 0
-        total_torrents_count = len(torrents)
         remote_torrents_count = sum(
             len(torrents) for torrents in remote_torrents_by_path.values())
 
@@ -460,42 +634,35 @@ def scan_local_files():
 
         logger.info(f"总共需要扫描 {len(all_local_paths_to_scan)} 个本地路径")
 
-        # 辅助函数：递归查找种子文件的位置
-        def find_torrent_in_tree(root_path, torrent_name):
-            """递归查找种子文件在目录树中的位置"""
+        # 辅助函数：一次遍历目录树，建立 名称 -> (完整路径, 是否目录) 的索引
+        def index_tree(root_path):
+            """递归收集目录树中所有文件和文件夹，同名时保留最先遍历到的位置"""
+            tree_index = {}
             try:
                 for dirpath, dirnames, filenames in os.walk(root_path):
-                    # 检查文件名和文件夹名
-                    if torrent_name in filenames or torrent_name in dirnames:
-                        return os.path.join(dirpath, torrent_name)
-            except Exception as e:
-                logger.debug(f"搜索 {root_path} 时出错: {str(e)}")
-            return None
-
-        # 辅助函数：收集目录树中所有文件和文件夹的名称
-        def collect_all_items_in_tree(root_path):
-            """递归收集目录树中所有文件和文件夹的名称"""
-            all_items = set()
-            try:
-                for dirpath, dirnames, filenames in os.walk(root_path):
-                    all_items.update(dirnames)
-                    all_items.update(filenames)
+                    for item_name in dirnames:
+                        tree_index.setdefault(
+                            item_name, (os.path.join(dirpath, item_name), True))
+                    for item_name in filenames:
+                        tree_index.setdefault(
+                            item_name, (os.path.join(dirpath, item_name), False))
             except Exception as e:
                 logger.debug(f"收集 {root_path} 时出错: {str(e)}")
-            return all_items
+            return tree_index
 
         # 4. 遍历所有路径进行扫描（包括没有种子的路径）
         for local_path in all_local_paths_to_scan:
             path_torrents = local_torrents_by_path.get(local_path, [])
-            print(f"[DEBUG] 扫描本地路径: {local_path} | 种子数: {len(path_torrents)}")
+            logger.debug("扫描本地路径: %s | 种子数: %d", local_path,
+                         len(path_torrents))
 
             # 如果路径不存在，记录缺失的种子
             if not os.path.exists(local_path):
-                print(f"[DEBUG] 路径不存在: {local_path}")
+                logger.debug("路径不存在: %s", local_path)
                 if path_torrents:  # 只有当有种子记录时才报告缺失
                     missing_groups_by_name = defaultdict(list)
                     for torrent in path_torrents:
-                        missing_groups_by_name[torrent['name']].append(torrent)
+                        missing_groups_by_name[torrent.name].append(torrent)
 
                     for name, torrent_group in missing_groups_by_name.items():
                         # 使用第一个种子的信息
@@ -504,50 +671,54 @@ def scan_local_files():
                             "name":
                             name,
                             "save_path":
-                            first_torrent['save_path'],  # 显示原始远程路径
+                            first_torrent.save_path,  # 显示原始远程路径
                             "expected_path":
                             os.path.join(local_path, name),
                             "size":
-                            first_torrent.get('size') or 0,
+                            first_torrent.size,
                             "downloader_name":
-                            first_torrent.get('downloader_name', '未知')
+                            first_torrent.downloader_name
                         })
                 continue
 
             try:
-                # 收集当前目录及其子目录中的所有项目
-                all_items_in_tree = collect_all_items_in_tree(local_path)
-                local_items = set(os.listdir(local_path))  # 只用于孤立文件检测
+                # 收集当前目录及其子目录中的所有项目（每个路径只遍历一次）
+                # 没有种子的路径只需要当前层级做孤立文件检测，跳过递归遍历
+                tree_index = index_tree(local_path) if path_torrents else {}
+                # 只用于孤立文件检测；DirEntry 自带文件类型，无需再逐个 stat
+                with os.scandir(local_path) as it:
+                    entries_by_name = {entry.name: entry for entry in it}
+                local_items = set(entries_by_name)
                 total_local_items += len(local_items)
-                print(
-                    f"[DEBUG] 路径存在，当前层级 {len(local_items)} 个项目，整个目录树 {len(all_items_in_tree)} 个项目"
-                )
+                logger.debug("路径存在，当前层级 %d 个项目，整个目录树 %d 个项目",
+                             len(local_items), len(tree_index))
 
                 torrents_by_name_in_path = defaultdict(list)
                 for torrent in path_torrents:
-                    torrents_by_name_in_path[torrent['name']].append(torrent)
+                    torrents_by_name_in_path[torrent.name].append(torrent)
+
+                torrent_names_in_path = frozenset(torrents_by_name_in_path)
 
-                torrent_names_in_path = set(torrents_by_name_in_path.keys())
-                print(f"[DEBUG] 期望的种子名称: {list(torrent_names_in_path)[:3]}...")
+                # 先用集合运算区分当前目录已有的和不在当前目录的种子
+                # 值为 (完整路径, 是否目录)，目录信息直接取自 DirEntry / os.walk
+                synced_names_with_location = {
+                    name: (os.path.join(local_path, name),
+                           entries_by_name[name].is_dir())
+                    for name in torrent_names_in_path & local_items
+                }
 
-                # 找出缺失的文件组 - 在整个目录树中查找
+                # 找出缺失的文件组 - 只对不在当前目录的名称查目录树索引
                 missing_names = set()
-                synced_names_with_location = {}
-                
-                for name in torrent_names_in_path:
-                    # 先在当前目录查找
-                    if name in local_items:
-                        synced_names_with_location[name] = os.path.join(local_path, name)
+                for name in torrent_names_in_path - local_items:
+                    found = tree_index.get(name)
+                    if found:
+                        synced_names_with_location[name] = found
+                        logger.debug("在子目录中找到种子: %s -> %s", name,
+                                     found[0])
                     else:
-                        # 在整个目录树中查找
-                        found_path = find_torrent_in_tree(local_path, name)
-                        if found_path:
-                            synced_names_with_location[name] = found_path
-                            print(f"[DEBUG] 在子目录中找到种子: {name} -> {found_path}")
-                        else:
-                            missing_names.add(name)
-                
-                print(f"[DEBUG] 缺失的文件: {len(missing_names)} 个")
+                        missing_names.add(name)
+
+                logger.debug("缺失的文件: %d 个", len(missing_names))
                 for name in missing_names:
                     torrent_group = torrents_by_name_in_path[name]
                     # 使用第一个种子的信息
@@ -556,13 +727,13 @@ def scan_local_files():
                         "name":
                         name,
                         "save_path":
-                        first_torrent['save_path'],  # 显示原始远程路径
+                        first_torrent.save_path,  # 显示原始远程路径
                         "expected_path":
                         os.path.join(local_path, name),
                         "size":
-                        first_torrent.get('size') or 0,
+                        first_torrent.size,
                         "downloader_name":
-                        first_torrent.get('downloader_name', '未知')
+                        first_torrent.downloader_name
                     })
 
                 # 找出孤立的文件 (名字在本地有，但数据库没有)
@@ -570,65 +741,38 @@ def scan_local_files():
                 # 同时需要排除那些在种子文件夹内的文件
                 orphaned_names = local_items - torrent_names_in_path
                 
-                # 收集所有被种子引用的文件夹路径
-                referenced_folders = set()
-                for name, location in synced_names_with_location.items():
-                    if os.path.isdir(location):
-                        referenced_folders.add(location)
+                # 收集所有被种子引用的文件夹路径（带分隔符的前缀元组，
+                # 交给 str.startswith 一次性匹配）
+                referenced_prefixes = tuple(
+                    location + os.sep
+                    for location, is_dir in synced_names_with_location.values()
+                    if is_dir)
                 
                 for item_name in orphaned_names:
                     full_path = os.path.join(local_path, item_name)
-                    is_file = os.path.isfile(full_path)
+                    entry = entries_by_name[item_name]
+                    is_file = entry.is_file()
                     
                     # 跳过所有文件夹，只检测孤立文件
                     if not is_file:
-                        print(f"[DEBUG] 跳过文件夹 {item_name}")
                         continue
                     
-                    # 检查这个文件是否在某个被种子引用的文件夹内
-                    is_inside_torrent_folder = False
-                    for ref_folder in referenced_folders:
-                        try:
-                            # 检查文件是否在种子文件夹内
-                            if full_path.startswith(ref_folder + os.sep):
-                                is_inside_torrent_folder = True
-                                print(f"[DEBUG] 文件 {item_name} 在种子文件夹 {ref_folder} 内，跳过")
-                                break
-                        except Exception as e:
-                            logger.debug(f"检查文件路径时出错: {str(e)}")
-                    
-                    # 如果文件在种子文件夹内，不算孤立文件
-                    if is_inside_torrent_folder:
+                    # 如果文件在某个被种子引用的文件夹内，不算孤立文件
+                    if full_path.startswith(referenced_prefixes):
                         continue
                     
                     size = None
                     try:
-                        size = os.path.getsize(full_path)
+                        size = entry.stat().st_size
                     except Exception as e:
                         logger.debug(f"无法获取大小 {full_path}: {str(e)}")
 
                     # 尝试找到原始的远程路径
                     # 优先从该路径下的种子获取，否则尝试反向映射本地路径到远程路径
-                    original_save_path = local_path
                     if path_torrents:
-                        original_save_path = path_torrents[0]['save_path']
+                        original_save_path = path_torrents[0].save_path
                     else:
-                        # 尝试反向映射：从本地路径推断远程路径
-                        for downloader_id, mappings in path_mappings_by_downloader.items(
-                        ):
-                            if downloader_id in remote_downloaders:
-                                continue
-                            for mapping in mappings:
-                                local_root = mapping.get("local",
-                                                         "").rstrip("/")
-                                remote_root = mapping.get("remote",
-                                                          "").rstrip("/")
-                                if local_root and remote_root:
-                                    if local_path == local_root or local_path.startswith(
-                                            local_root + "/"):
-                                        original_save_path = local_path.replace(
-                                            local_root, remote_root, 1)
-                                        break
+                        original_save_path = reverse_path_mapping(local_path)
 
                     orphaned_files.append({
                         "name": item_name,
@@ -639,11 +783,11 @@ def scan_local_files():
                     })
 
                 # 找出正常同步的文件组 (两边都有)
-                for name, found_location in synced_names_with_location.items():
+                for name in synced_names_with_location:
                     torrent_group = torrents_by_name_in_path[name]
                     # 找到原始的远程路径
-                    original_save_path = torrent_group[0][
-                        'save_path'] if torrent_group else local_path
+                    original_save_path = torrent_group[
+                        0].save_path if torrent_group else local_path
                     synced_torrents.append({
                         "name":
                         name,
@@ -652,25 +796,22 @@ def scan_local_files():
                         "torrents_count":
                         len(torrent_group),
                         "downloader_names":
-                        list(set(t["downloader_name"] for t in torrent_group))
+                        list(downloader_names_by_group[(False, local_path,
+                                                        name)])
                     })
 
             except Exception as e:
                 logger.error(f"扫描路径 {local_path} 时出错: {str(e)}")
 
         # 5. 处理远程下载器的路径（通过代理批量检查文件）
-        proxy_configs = {}  # 缓存代理配置
+        # 先收集每个远程路径的检查任务，再并发调用代理
+        remote_jobs = []
         for remote_path, path_torrents in remote_torrents_by_path.items():
             # 获取第一个种子的下载器ID和代理配置
             first_torrent = path_torrents[0]
-            downloader_id = first_torrent.get('downloader_id')
+            downloader_id = first_torrent.downloader_id
 
-            # 获取或缓存代理配置
-            if downloader_id not in proxy_configs:
-                proxy_configs[downloader_id] = _get_downloader_proxy_config(
-                    downloader_id)
-
-            proxy_config = proxy_configs[downloader_id]
+            proxy_config = proxy_config_by_id.get(downloader_id)
             if not proxy_config:
                 logger.warning(f"下载器 {downloader_id} 没有代理配置，跳过检查")
                 continue
@@ -678,7 +819,7 @@ def scan_local_files():
             # 按名称分组，用于后续检查
             torrents_by_name_in_path = defaultdict(list)
             for torrent in path_torrents:
-                torrents_by_name_in_path[torrent['name']].append(torrent)
+                torrents_by_name_in_path[torrent.name].append(torrent)
 
             # 构建需要检查的路径列表
             paths_to_check = []
@@ -686,13 +827,25 @@ def scan_local_files():
                 full_remote_path = os.path.join(remote_path, name)
                 paths_to_check.append(full_remote_path)
 
-            # 批量检查所有文件
             logger.info(
                 f"批量检查远程路径 {remote_path} 下的 {len(paths_to_check)} 个文件, "
                 f"路径列表: {paths_to_check}"
             )
-            check_results = batch_check_remote_files(proxy_config,
-                                                     paths_to_check)
+            remote_jobs.append((remote_path, torrents_by_name_in_path,
+                                proxy_config, paths_to_check))
+
+        # 批量检查所有文件（网络 IO 为主，按提交顺序收集结果以保持输出稳定）
+        with ThreadPoolExecutor(
+                max_workers=REMOTE_CHECK_MAX_WORKERS) as executor:
+            futures = [
+                executor.submit(batch_check_remote_files, proxy_config,
+                                paths_to_check)
+                for _, _, proxy_config, paths_to_check in remote_jobs
+            ]
+
+        for (remote_path, torrents_by_name_in_path, _,
+             _), future in zip(remote_jobs, futures):
+            check_results = future.result()
 
             # 处理检查结果
             for name, torrent_group in torrents_by_name_in_path.items():
@@ -721,9 +874,9 @@ def scan_local_files():
                         "expected_path":
                         full_remote_path,
                         "size":
-                        first.get('size') or 0,
+                        first.size,
                         "downloader_name":
-                        first.get('downloader_name', '未知')
+                        first.downloader_name
                     })
                 else:
                     # 文件存在，添加到正常同步列表
@@ -735,7 +888,8 @@ def scan_local_files():
                         "torrents_count":
                         len(torrent_group),
                         "downloader_names":
-                        list(set(t["downloader_name"] for t in torrent_group))
+                        list(downloader_names_by_group[(True, remote_path,
+                                                        name)])
                     })
 
         # 6. 统计信息
@@ -759,7 +913,7 @@ def scan_local_files():
         # 保存到缓存
         save_scan_cache(result)
 
-        return jsonify(result)
+        return stream_scan_result(result)
 
     except Exception as e:
         logger.error(f"扫描失败: {str(e)}", exc_info=True)
@@ -771,62 +925,78 @@ def analyze_duplicates():
     """查找同名种子（可能在不同下载器/路径）"""
     try:
         db_manager = local_query_bp.db_manager
-        conn = db_manager._get_connection()
-        cursor = db_manager._get_cursor(conn)
-
-        # 查找重复的种子名称
-        cursor.execute("""
-            SELECT name, COUNT(*) as count
-            FROM torrents
-            WHERE name IS NOT NULL AND TRIM(name) != ''
-            GROUP BY name
-            HAVING count > 1
-            ORDER BY count DESC
-        """)
-        duplicate_names = cursor.fetchall()
-
-        duplicates = []
-        total_wasted_space = 0
-
-        for dup_row in duplicate_names:
-            name, count = dict(dup_row).get('name'), dict(dup_row).get('count')
-
-            ph = db_manager.get_placeholder()
-            cursor.execute(
-                f"""
-                SELECT t.hash, t.save_path, t.size, t.downloader_id
-                FROM torrents t
-                WHERE t.name = {ph}
-            """, (name, ))
-            instances = [dict(row) for row in cursor.fetchall()]
-
-            locations = [{
-                "hash":
-                inst['hash'],
-                "downloader_name":
-                get_downloader_name_from_config(inst.get('downloader_id')),
-                "path":
-                inst.get('save_path') or "未知"
-            } for inst in instances]
-
-            total_size = sum(inst.get('size') or 0 for inst in instances)
-
-            # 假设副本中至少有一个是有效存储，浪费的空间是其他副本的大小总和
-            # 如果大小都一样，浪费空间 = (n-1) * size
-            # 如果大小不一样，为简化计算，我们假设最大的那个是保留的，其余是浪费的
-            sizes = [inst.get('size') or 0 for inst in instances]
-            wasted = total_size - (max(sizes) if sizes else 0)
-            total_wasted_space += wasted
-
-            duplicates.append({
-                "name": name,
-                "count": count,
-                "locations": locations,
-                "total_size": total_size,
-                "wasted_size": wasted
-            })
-
-        conn.close()
+        with closing(db_manager._get_connection()) as conn:
+            cursor = db_manager._get_cursor(conn)
+
+            # include_locations=0 时只返回汇总信息，不拉取每个实例的明细行
+            include_locations = request.args.get(
+                'include_locations', '1').lower() not in ('0', 'false', 'no')
+
+            # 重复组的数量、总大小与最大大小均在 SQL 中聚合，并限制返回的组数
+            groups_sql = f"""
+                SELECT name, COUNT(*) AS dup_count,
+                       SUM(COALESCE(size, 0)) AS total_size,
+                       MAX(COALESCE(size, 0)) AS max_size
+                FROM torrents
+                WHERE name IS NOT NULL AND TRIM(name) != ''
+                GROUP BY name
+                HAVING COUNT(*) > 1
+                ORDER BY COUNT(*) DESC
+                LIMIT {DUPLICATE_GROUPS_LIMIT}
+            """
+
+            if include_locations:
+                # 一次查询取回各组及其所有实例（使用派生表而非 IN 子查询，MySQL 不支持 IN 子查询中的 LIMIT）
+                cursor.execute(f"""
+                    SELECT d.name AS group_name, d.dup_count, d.total_size, d.max_size,
+                           t.hash, t.save_path, t.downloader_id
+                    FROM torrents t
+                    JOIN ({groups_sql}) d ON t.name = d.name
+                    ORDER BY d.dup_count DESC, d.name
+                """)
+            else:
+                cursor.execute(f"""
+                    SELECT d.name AS group_name, d.dup_count, d.total_size, d.max_size
+                    FROM ({groups_sql}) d
+                    ORDER BY d.dup_count DESC, d.name
+                """)
+
+            duplicates = []
+            total_wasted_space = 0
+            # 一次读取配置，建立下载器 ID 到名称的映射
+            downloader_names = get_downloader_names_from_config()
+
+            for name, group_rows in groupby(cursor.fetchall(),
+                                            key=lambda row: row['group_name']):
+                # 直接按列名读取行（sqlite3.Row / 字典游标均支持），不再逐行转换为 dict；
+                # 组内聚合值在每行上相同，取首行即可，明细在下面单次遍历中生成
+                group = next(group_rows)
+                count = group['dup_count']
+                # MySQL 的 SUM 返回 Decimal，统一转换为 int
+                total_size = int(group['total_size'] or 0)
+
+                # 假设副本中至少有一个是有效存储，浪费的空间是其他副本的大小总和
+                # 如果大小都一样，浪费空间 = (n-1) * size
+                # 如果大小不一样，为简化计算，我们假设最大的那个是保留的，其余是浪费的
+                wasted = total_size - int(group['max_size'] or 0)
+                total_wasted_space += wasted
+
+                duplicate = {
+                    "name": name,
+                    "count": count,
+                    "total_size": total_size,
+                    "wasted_size": wasted
+                }
+                if include_locations:
+                    duplicate["locations"] = [{
+                        "hash":
+                        inst['hash'],
+                        "downloader_name":
+                        downloader_names.get(inst['downloader_id'], "未知"),
+                        "path":
+                        inst['save_path'] or "未知"
+                    } for inst in chain((group, ), group_rows)]
+                duplicates.append(duplicate)
 
         return jsonify({
             "duplicates": duplicates,
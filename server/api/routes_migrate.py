@@ -1,20 +1,33 @@
 # api/routes_migrate.py
 
+import atexit
 import logging
 import uuid
 import re
+import html
 import os
 import time
 import queue
 import threading
-import copy
 import requests
 import urllib.parse
 import json
+import sqlite3
+import orjson
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import lru_cache
 from datetime import datetime
 from concurrent.futures import ThreadPoolExecutor
-from flask import Blueprint, jsonify, request, Response, stream_with_context
-from bs4 import BeautifulSoup
+from werkzeug.http import parse_options_header
+from flask import (
+    Blueprint,
+    request,
+    Response,
+    stream_with_context,
+    g,
+    has_request_context,
+)
 from utils import (
     upload_data_title,
     upload_data_screenshot,
@@ -25,26 +38,211 @@ from utils import (
     extract_resolution_from_mediainfo,
 )
 from utils.downloader_selector import select_best_downloader
-from core.migrator import TorrentMigrator
+from utils.global_mappings import (
+    GLOBAL_MAPPINGS_CACHE,
+    GLOBAL_MAPPINGS_CACHE_LOCK,
+    load_global_mappings_config,
+)
+from .internal_guard import check_downloader_gate_cached
 
 # 导入种子参数模型
-from models.seed_parameter import SeedParameter
+from models.seed_parameter import (
+    SeedParameter,
+    SEED_IDENTITY_CACHE,
+    SEED_IDENTITY_CACHE_LOCK,
+    SEED_IDENTITY_CACHE_TTL,
+    SEED_IDENTITY_CACHE_MAXSIZE,
+)
 
 # --- [新增] 导入 config_manager ---
 # 确保能够访问到全局的 config_manager 实例
-from config import config_manager, GLOBAL_MAPPINGS
+from config import config_manager, TEMP_DIR, PARALLEL_TORRENT_SEARCH
 
 # --- [新增] 导入日志流管理器 ---
 from utils import log_streamer
 
 # --- [新增] 导入SSE管理器 ---
 from utils.sse_manager import sse_manager
+# 蓝图内的 JSON 响应统一使用 orjson 序列化，调用方式与输出与 flask.jsonify 保持一致（NaN/Infinity 输出为 null）
+from utils.json_response import jsonify_compat as jsonify
 
 migrate_bp = Blueprint("migrate_api", __name__, url_prefix="/api")
 
-MIGRATION_CACHE = {}
-MIGRATION_CACHE_LOCK = threading.Lock()
+# global_mappings.yaml 未配置 default_title_components 时的标题拼接顺序
+DEFAULT_TITLE_ORDER = (
+    "主标题",
+    "季集",
+    "年份",
+    "剧集状态",
+    "发布版本",
+    "分辨率",
+    "片源平台",
+    "媒介",
+    "帧率",
+    "视频编码",
+    "视频格式",
+    "HDR格式",
+    "色深",
+    "音频编码",
+)
+# 发布前拦截的受限标签（原始写法 -> 标准标签）
+RESTRICTED_TAG_MAP = {
+    "禁转": "tag.禁转",
+    "tag.禁转": "tag.禁转",
+    "限转": "tag.限转",
+    "tag.限转": "tag.限转",
+    "分集": "tag.分集",
+    "tag.分集": "tag.分集",
+}
+# 更新种子参数时从 updated_parameters 中读取的简介字段（即映射输入中的 intro）
+INTRO_PARAM_KEYS = (
+    "statement",
+    "poster",
+    "body",
+    "screenshots",
+    "imdb_link",
+    "douban_link",
+    "tmdb_link",
+)
+# 更新种子参数时从标准化参数中读取的字段（tags 默认值为列表，单独处理）
+STANDARD_PARAM_KEYS = (
+    "imdb_link",
+    "douban_link",
+    "tmdb_link",
+    "type",
+    "medium",
+    "video_codec",
+    "audio_codec",
+    "resolution",
+    "team",
+    "source",
+)
+# final_publish_parameters 中的中文标签 -> 标准化参数字段
+FINAL_PUBLISH_PARAM_LABELS = (
+    ("IMDb链接", "imdb_link"),
+    ("豆瓣链接", "douban_link"),
+    ("TMDb链接", "tmdb_link"),
+    ("类型", "type"),
+    ("媒介", "medium"),
+    ("视频编码", "video_codec"),
+    ("音频编码", "audio_codec"),
+    ("分辨率", "resolution"),
+    ("制作组", "team"),
+    ("产地", "source"),
+    ("标签", "tags"),
+)
+# raw_params_for_preview 中的字段名 -> 标准化参数字段
+RAW_PREVIEW_PARAM_NAMES = (
+    ("imdb_link", "imdb_link"),
+    ("douban_link", "douban_link"),
+    ("tmdb_link", "tmdb_link"),
+    ("type", "type"),
+    ("medium", "medium"),
+    ("video_codec", "video_codec"),
+    ("audio_codec", "audio_codec"),
+    ("resolution", "resolution"),
+    ("release_group", "team"),
+    ("source", "source"),
+    ("tags", "tags"),
+)
+
+MIGRATION_CACHE_MAXSIZE = 1024
+MIGRATION_CACHE_TTL = 3600
+
+
+class _MigrationCache:
+    """有容量上限的 LRU 缓存，条目超过 ttl 秒未被访问即过期。
+
+    接口与 dict 保持一致（get / [] / in），内部自带锁，
+    现有调用处仍可在 MIGRATION_CACHE_LOCK 下访问。
+    """
+
+    def __init__(self, maxsize, ttl, on_evict=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._on_evict = on_evict
+        self._data = OrderedDict()  # key -> [last_access, value]
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _evict(self, key):
+        self._data.pop(key, None)
+        self.evictions += 1
+        if self._on_evict:
+            self._on_evict(key)
+
+    def _purge_expired(self, now):
+        # 条目按最近访问时间排列，从最旧的一端清理即可
+        while self._data:
+            key, (last_access, _) = next(iter(self._data.items()))
+            if now - last_access < self.ttl:
+                break
+            self._evict(key)
+
+    def _lookup(self, key):
+        now = time.time()
+        with self._lock:
+            self._purge_expired(now)
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            entry[0] = now
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def get(self, key, default=None):
+        entry = self._lookup(key)
+        return entry[1] if entry is not None else default
+
+    def __getitem__(self, key):
+        entry = self._lookup(key)
+        if entry is None:
+            raise KeyError(key)
+        return entry[1]
+
+    def __contains__(self, key):
+        return self._lookup(key) is not None
+
+    def __setitem__(self, key, value):
+        now = time.time()
+        with self._lock:
+            self._purge_expired(now)
+            self._data[key] = [now, value]
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._evict(next(iter(self._data)))
+
+    def __len__(self):
+        with self._lock:
+            return len(self._data)
+
+    def stats(self):
+        with self._lock:
+            self._purge_expired(time.time())
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
 MIGRATION_TORRENT_FILE_LOCKS = {}
+# 仅保护 MIGRATION_TORRENT_FILE_LOCKS 的创建，避免与缓存写入争用 MIGRATION_CACHE_LOCK
+MIGRATION_TORRENT_FILE_LOCKS_LOCK = threading.Lock()
+# 缓存条目被淘汰时一并释放该任务的种子文件锁
+MIGRATION_CACHE = _MigrationCache(
+    MIGRATION_CACHE_MAXSIZE,
+    MIGRATION_CACHE_TTL,
+    on_evict=lambda task_id: MIGRATION_TORRENT_FILE_LOCKS.pop(task_id, None),
+)
+MIGRATION_CACHE_LOCK = threading.Lock()
 
 INACTIVE_TORRENT_STATES = ("未做种", "已暂停", "已停止", "错误", "等待", "队列")
 EXISTING_TORRENT_HINTS = ("种子已存在", "该种子已存在")
@@ -76,138 +274,298 @@ def _is_existing_torrent_publish_result(result: dict) -> bool:
     return any(hint in content for hint in EXISTING_TORRENT_HINTS)
 
 
-def get_seed_hash(db_manager, torrent_id, site_name):
-    """根据torrent_id/site_name获取hash"""
+# 从种子 comment 中提取站点种子 ID
+COMMENT_TORRENT_ID_RE = re.compile(r"id=(\d+)")
+DIGITS_RE = re.compile(r"\d+")
+# 标题主体部分：非数字之间的点替换为空格，并合并空白
+TITLE_DOT_RE = re.compile(r"(?<!\d)\.(?!\d)")
+WHITESPACE_RE = re.compile(r"\s+")
+# 文件系统不支持的文件名字符
+UNSAFE_FILENAME_RE = re.compile(r'[<>:"/\\|?*]')
+# Content-Disposition 中 RFC 5987 的 filename*= 参数，单独交给 werkzeug 解码
+CD_FILENAME_EXT_RE = re.compile(r"""filename\*="?([^";']*'[^";']*'[^";]+)"?""", re.IGNORECASE)
+# Content-Disposition 中未加引号的 filename=，取到下一个参数分隔符为止（可含空格）
+CD_UNQUOTED_FILENAME_RE = re.compile(r'filename=(?!")([^;]+)', re.IGNORECASE)
+# 详情页中的种子下载链接，group(1) 为 href，group(2) 为种子 ID
+DOWNLOAD_LINK_RE = re.compile(r"""href=["'](download\.php\?id=(\d+)[^"']*)["']""")
+
+# sqlite 常见的 'YYYY-MM-DD HH:MM:SS[.ffffff]'（或以 T 分隔）时间格式
+TIMESTAMP_RE = re.compile(r"^(\d{4})-(\d{2})-(\d{2})[ T](\d{2}):(\d{2}):(\d{2})(?:\.(\d{1,6})\d*)?$")
+
+
+@lru_cache(maxsize=8192)
+def _parse_timestamp_text(text: str) -> float:
+    """解析字符串形式的时间戳；同一批种子的 last_seen 大量重复，结果按原始字符串缓存"""
+    text = text.strip()
+    if not text:
+        return 0
     try:
-        conn = db_manager._get_connection()
-        cursor = db_manager._get_cursor(conn)
-        ph = db_manager.get_placeholder()
-        query = (
-            f"SELECT hash FROM seed_parameters WHERE torrent_id = {ph} AND site_name = {ph} "
-            f"ORDER BY updated_at DESC LIMIT 1"
-        )
-        cursor.execute(query, (torrent_id, site_name))
-        row = cursor.fetchone()
-        cursor.close()
-        conn.close()
-        if not row:
-            return None
-        return row["hash"] if isinstance(row, dict) else row[0]
-    except Exception as e:
-        logging.warning(f"获取hash失败: {e}")
-        return None
+        return float(text)
+    except ValueError:
+        pass
+    match = TIMESTAMP_RE.match(text)
+    if match:
+        year, month, day, hour, minute, second, fraction = match.groups()
+        microsecond = int(fraction.ljust(6, "0")) if fraction else 0
+        try:
+            return datetime(
+                int(year), int(month), int(day), int(hour), int(minute), int(second), microsecond
+            ).timestamp()
+        except ValueError:
+            return 0
+    # 其余 ISO8601 格式（可能带时区或 Z）
+    try:
+        return float(datetime.fromisoformat(text.replace("Z", "+00:00")).timestamp())
+    except Exception:
+        return 0
 
 
-def get_seed_name(db_manager, torrent_id, site_name):
-    """根据torrent_id/site_name获取name"""
+def _to_timestamp(value) -> float:
+    if not value:
+        return 0
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        return _parse_timestamp_text(value)
     try:
-        conn = db_manager._get_connection()
-        cursor = db_manager._get_cursor(conn)
-        ph = db_manager.get_placeholder()
-        query = (
-            f"SELECT name FROM seed_parameters WHERE torrent_id = {ph} AND site_name = {ph} "
-            f"ORDER BY updated_at DESC LIMIT 1"
-        )
-        cursor.execute(query, (torrent_id, site_name))
-        row = cursor.fetchone()
-        cursor.close()
+        ts = getattr(value, "timestamp", None)
+        if callable(ts):
+            return float(ts())
+    except Exception:
+        pass
+    return 0
+
+
+@contextmanager
+def _db_connection(db_manager, conn=None):
+    """获取数据库连接。
+
+    优先使用调用方传入的连接；在请求上下文中复用挂在 flask.g 上的连接
+    （请求结束时由 teardown 关闭）；否则（如后台线程）临时打开并在用完后关闭。
+    """
+    if conn is not None:
+        yield conn
+        return
+
+    if has_request_context():
+        request_conn = g.get("migrate_db_conn")
+        if request_conn is None:
+            request_conn = db_manager._get_connection()
+            g.migrate_db_conn = request_conn
+        try:
+            yield request_conn
+        finally:
+            # 结束只读事务，避免复用连接时读到旧快照
+            request_conn.commit()
+        return
+
+    conn = db_manager._get_connection()
+    try:
+        yield conn
+    finally:
         conn.close()
-        if not row:
-            return None
-        return row["name"] if isinstance(row, dict) else row[0]
+
+
+@migrate_bp.teardown_request
+def _close_request_db_connection(exc):
+    conn = g.pop("migrate_db_conn", None)
+    if conn is not None:
+        try:
+            conn.close()
+        except Exception as e:
+            logging.debug(f"关闭请求数据库连接失败: {e}")
+
+
+def _build_seed_identity_sql(ph):
+    return (
+        f"SELECT hash, name, title FROM seed_parameters WHERE torrent_id = {ph} AND site_name = {ph} "
+        f"ORDER BY updated_at DESC LIMIT 1"
+    )
+
+
+def get_seed_identity(db_manager, torrent_id, site_name, conn=None):
+    """根据torrent_id/site_name获取 (hash, name, title)，未找到时返回 (None, None, None)"""
+    cache_key = (str(torrent_id), site_name)
+    now = time.time()
+    with SEED_IDENTITY_CACHE_LOCK:
+        cached = SEED_IDENTITY_CACHE.get(cache_key)
+    if cached and cached[0] > now:
+        return cached[1]
+
+    try:
+        with _db_connection(db_manager, conn) as conn:
+            cursor = db_manager._get_cursor(conn)
+            db_manager.execute_cached(
+                cursor, "seed_identity", _build_seed_identity_sql, (torrent_id, site_name)
+            )
+            row = cursor.fetchone()
+            cursor.close()
     except Exception as e:
-        logging.warning(f"获取name失败: {e}")
-        return None
+        logging.warning(f"获取种子hash/name失败: {e}")
+        return None, None, None
+
+    if not row:
+        # 未命中的结果不缓存，避免新写入的记录在 TTL 内不可见
+        return None, None, None
+
+    identity = (
+        (row["hash"], row["name"], row["title"])
+        if isinstance(row, dict)
+        else (row[0], row[1], row[2])
+    )
+    with SEED_IDENTITY_CACHE_LOCK:
+        if len(SEED_IDENTITY_CACHE) >= SEED_IDENTITY_CACHE_MAXSIZE:
+            # 超出容量时淘汰最早写入的条目
+            SEED_IDENTITY_CACHE.pop(next(iter(SEED_IDENTITY_CACHE)), None)
+        SEED_IDENTITY_CACHE[cache_key] = (now + SEED_IDENTITY_CACHE_TTL, identity)
+    return identity
+
+
+def get_seed_hash(db_manager, torrent_id, site_name, conn=None):
+    """根据torrent_id/site_name获取hash"""
+    return get_seed_identity(db_manager, torrent_id, site_name, conn)[0]
+
+
+def get_seed_name(db_manager, torrent_id, site_name, conn=None):
+    """根据torrent_id/site_name获取name"""
+    return get_seed_identity(db_manager, torrent_id, site_name, conn)[1]
+
+
+def get_seed_title(db_manager, torrent_id, site_name, conn=None):
+    """根据torrent_id/site_name获取种子标题"""
+    return get_seed_identity(db_manager, torrent_id, site_name, conn)[2]
 
 
-def get_current_torrent_info(db_manager, torrent_name):
+def _supports_window_functions(db_manager):
+    """SQLite 3.25+ 与 PostgreSQL 支持窗口函数；MySQL 需 8.0+，版本未知时不使用"""
+    if db_manager.db_type == "postgresql":
+        return True
+    if db_manager.db_type == "sqlite":
+        return sqlite3.sqlite_version_info >= (3, 25, 0)
+    return False
+
+
+def _build_current_torrent_info_sql(ph, use_window, by_seed=False):
+    """同名种子按活跃状态优先、last_seen 最新排序；use_window 时每个下载器只保留第一条
+
+    by_seed 时种子名称由 seed_parameters 子查询按 (torrent_id, site_name) 取得，
+    名称参数相应替换为 torrent_id、site_name 两个参数。
+    """
+    name_value = (
+        f"(SELECT name FROM seed_parameters WHERE torrent_id = {ph} AND site_name = {ph} "
+        f"ORDER BY updated_at DESC LIMIT 1)"
+        if by_seed
+        else ph
+    )
+    state_placeholders = ", ".join([ph] * len(INACTIVE_TORRENT_STATES))
+    state_rank = f"CASE WHEN state IN ({state_placeholders}) THEN 1 ELSE 0 END"
+    if use_window:
+        # 窗口函数在数据库端为每个下载器只保留排名第一的记录
+        return f"""
+            SELECT save_path, downloader_id, name, state, last_seen
+            FROM (
+                SELECT save_path, downloader_id, name, state, last_seen,
+                       {state_rank} AS state_rank,
+                       ROW_NUMBER() OVER (
+                           PARTITION BY downloader_id
+                           ORDER BY {state_rank}, last_seen DESC
+                       ) AS rn
+                FROM torrents
+                WHERE name = {name_value}
+            ) ranked
+            WHERE rn = 1
+            ORDER BY state_rank, last_seen DESC
+        """
+    return f"""
+        SELECT save_path, downloader_id, name, state, last_seen
+        FROM torrents
+        WHERE name = {name_value}
+        ORDER BY {state_rank}, last_seen DESC
+    """
+
+
+def get_current_torrent_info(db_manager, torrent_name, conn=None):
     """根据种子名称获取当前种子的保存路径/下载器ID（优先活跃状态，优先use_proxy=true）"""
     if not torrent_name:
         return None
+    return _query_current_torrent_info(db_manager, (torrent_name,), False, conn)
 
-    try:
 
-        def _to_timestamp(value) -> float:
-            if not value:
-                return 0
-            try:
-                ts = getattr(value, "timestamp", None)
-                if callable(ts):
-                    return float(ts())
-            except Exception:
-                pass
-            if isinstance(value, (int, float)):
-                return float(value)
-            if isinstance(value, str):
-                text = value.strip()
-                if not text:
-                    return 0
-                try:
-                    return float(text)
-                except ValueError:
-                    pass
-                # sqlite 常见：'YYYY-MM-DD HH:MM:SS' 或 ISO8601（可能带 Z）
-                normalized = text.replace("Z", "+00:00")
-                for parser in (datetime.fromisoformat,):
-                    try:
-                        return float(parser(normalized).timestamp())
-                    except Exception:
-                        pass
-                for fmt in ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M:%S.%f"):
-                    try:
-                        return float(datetime.strptime(text, fmt).timestamp())
-                    except Exception:
-                        pass
-            return 0
+def get_current_torrent_info_by_seed(db_manager, torrent_id, site_name, conn=None):
+    """根据torrent_id/site_name获取当前种子的保存路径/下载器ID
 
-        conn = db_manager._get_connection()
-        cursor = db_manager._get_cursor(conn)
-        ph = db_manager.get_placeholder()
+    种子名称已在 SEED_IDENTITY_CACHE 中时直接按名称查询；否则把名称查询作为子查询，
+    一次往返同时完成 get_seed_name 与 get_current_torrent_info 两步。
+    """
+    with SEED_IDENTITY_CACHE_LOCK:
+        cached = SEED_IDENTITY_CACHE.get((str(torrent_id), site_name))
+    if cached and cached[0] > time.time():
+        return get_current_torrent_info(db_manager, cached[1][1], conn)
+    return _query_current_torrent_info(db_manager, (torrent_id, site_name), True, conn)
 
-        # 查询所有相同名称的种子记录
-        query = f"""
-            SELECT save_path, downloader_id, name, state, last_seen
-            FROM torrents
-            WHERE name = {ph}
-        """
-        cursor.execute(query, (torrent_name,))
-        rows = cursor.fetchall()
-        cursor.close()
-        conn.close()
+
+def _query_current_torrent_info(db_manager, name_params, by_seed, conn=None):
+    """执行当前种子信息查询并选出最佳下载器的记录，name_params 对应种子名称条件的参数"""
+    try:
+        with _db_connection(db_manager, conn) as conn:
+            cursor = db_manager._get_cursor(conn)
+            # 查询所有相同名称的种子记录，在 SQL 中按活跃状态优先、last_seen 最新排序
+            use_window = _supports_window_functions(db_manager)
+            if use_window:
+                params = (*INACTIVE_TORRENT_STATES, *INACTIVE_TORRENT_STATES, *name_params)
+            else:
+                params = (*name_params, *INACTIVE_TORRENT_STATES)
+            db_manager.execute_cached(
+                cursor,
+                ("current_torrent_info", use_window, by_seed),
+                lambda ph: _build_current_torrent_info_sql(ph, use_window, by_seed),
+                params,
+            )
+            rows = cursor.fetchall()
+            cursor.close()
 
         if not rows:
             return None
 
-        # 将结果转换为列表
+        # 将结果转换为列表：每个下载器只保留排序后的第一条（即该下载器的最佳记录），
+        # 其余记录不会影响下载器选择，无需解析时间戳
         torrent_list = []
+        seen_downloader_ids = set()
         for row in rows:
             if isinstance(row, dict):
+                downloader_id = row.get("downloader_id")
+                if downloader_id in seen_downloader_ids:
+                    continue
                 last_seen = row.get("last_seen")
                 torrent_list.append(
                     {
                         "save_path": row.get("save_path"),
-                        "downloader_id": row.get("downloader_id"),
+                        "downloader_id": downloader_id,
                         "name": row.get("name"),
                         "state": row.get("state"),
                         "last_seen": _to_timestamp(last_seen),
                     }
                 )
             else:
+                downloader_id = row[1]
+                if downloader_id in seen_downloader_ids:
+                    continue
                 last_seen = row[4]
                 torrent_list.append(
                     {
                         "save_path": row[0],
-                        "downloader_id": row[1],
+                        "downloader_id": downloader_id,
                         "name": row[2],
                         "state": row[3],
                         "last_seen": _to_timestamp(last_seen),
                     }
                 )
+            seen_downloader_ids.add(downloader_id)
 
-        # 获取所有下载器ID
-        downloader_ids = list(
-            set(t.get("downloader_id") for t in torrent_list if t.get("downloader_id"))
-        )
+        # 获取所有下载器ID；torrent_list 中每个下载器只有一条记录，可直接按ID建立索引，
+        # 下载器ID列表保持 torrent_list 的排序，使选择结果确定
+        torrents_by_downloader = {t["downloader_id"]: t for t in torrent_list}
+        downloader_ids = [dl_id for dl_id in torrents_by_downloader if dl_id]
 
         # 使用工具函数选择最佳下载器
         best_downloader_id = select_best_downloader(
@@ -218,10 +576,7 @@ def get_current_torrent_info(db_manager, torrent_name):
         )
 
         # 找到使用最佳下载器的种子记录
-        first_torrent = next(
-            (t for t in torrent_list if t.get("downloader_id") == best_downloader_id),
-            torrent_list[0],
-        )
+        first_torrent = torrents_by_downloader.get(best_downloader_id, torrent_list[0])
 
         return {
             "save_path": first_torrent.get("save_path"),
@@ -230,7 +585,6 @@ def get_current_torrent_info(db_manager, torrent_name):
         }
     except Exception as e:
         logging.warning(f"获取当前种子信息失败: {e}")
-        print(f"[get_current_torrent_info] 异常: {e}")
         return None
 
 
@@ -263,8 +617,7 @@ def save_cross_seed_settings():
         if not isinstance(new_settings, dict):
             return jsonify({"error": "无效的设置数据格式。"}), 400
 
-        current_config = config_manager.get()
-        existing_settings = current_config.get("cross_seed", {}) or {}
+        existing_settings = config_manager.get().get("cross_seed", {}) or {}
 
         # 合并更新，避免前端只提交部分字段时覆盖掉其他 cross_seed 配置
         merged_settings = existing_settings.copy()
@@ -294,10 +647,8 @@ def save_cross_seed_settings():
             True,
         )
 
-        # 更新配置中的 cross_seed 部分
-        current_config["cross_seed"] = merged_settings
-
-        if config_manager.save(current_config):
+        # 更新配置中的 cross_seed 部分（基于内存中的配置合并，仅写入一次）
+        if config_manager.update("cross_seed", merged_settings):
             return jsonify({"message": "转种设置已成功保存！"})
         else:
             return jsonify({"error": "无法将设置写入配置文件。"}), 500
@@ -307,28 +658,43 @@ def save_cross_seed_settings():
         return jsonify({"error": "服务器内部错误"}), 500
 
 
+@lru_cache(maxsize=None)
+def _get_parameter_mapper():
+    """ParameterMapper 不持有实例状态，全进程共享一个实例。
+
+    首次使用时才导入 extractor 模块（依赖 bs4），避免在蓝图导入阶段加载。
+    """
+    from core.extractors.extractor import ParameterMapper
+
+    return ParameterMapper()
+
+
+@lru_cache(maxsize=None)
+def _publish_concurrency_info():
+    """CPU 线程数与并发上限在进程生命周期内不变，首次计算后缓存"""
+    cpu_threads = os.cpu_count() or 0
+    cpu_threads = int(cpu_threads) if cpu_threads else 1
+    suggested = cpu_threads * 2
+
+    # 与批量发布接口的并发上限保持一致（前端展示用）
+    max_concurrency = BATCH_PUBLISH_MAX_CONCURRENCY
+    effective_suggested = max(1, min(max_concurrency, suggested))
+
+    return {
+        "success": True,
+        "cpu_threads": cpu_threads,
+        "suggested_concurrency": suggested,
+        "effective_suggested_concurrency": effective_suggested,
+        "max_concurrency": max_concurrency,
+        "default_concurrency": BATCH_PUBLISH_DEFAULT_CONCURRENCY,
+    }
+
+
 @migrate_bp.route("/settings/cross_seed/publish_concurrency_info", methods=["GET"])
 def get_publish_concurrency_info():
     """获取服务器 CPU 线程数及推荐并发，用于前端展示并发策略。"""
     try:
-        cpu_threads = os.cpu_count() or 0
-        cpu_threads = int(cpu_threads) if cpu_threads else 1
-        suggested = cpu_threads * 2
-
-        # 与批量发布接口的并发上限保持一致（前端展示用）
-        max_concurrency = BATCH_PUBLISH_MAX_CONCURRENCY
-        effective_suggested = max(1, min(max_concurrency, suggested))
-
-        return jsonify(
-            {
-                "success": True,
-                "cpu_threads": cpu_threads,
-                "suggested_concurrency": suggested,
-                "effective_suggested_concurrency": effective_suggested,
-                "max_concurrency": max_concurrency,
-                "default_concurrency": BATCH_PUBLISH_DEFAULT_CONCURRENCY,
-            }
-        )
+        return jsonify(_publish_concurrency_info())
     except Exception as e:
         logging.error(f"获取并发信息失败: {e}", exc_info=True)
         return jsonify({"success": False, "error": "服务器内部错误"}), 500
@@ -340,6 +706,12 @@ def get_publish_concurrency_info():
 
 
 # 新增：从数据库读取种子信息的API接口
+@migrate_bp.route("/migrate/cache/stats", methods=["GET"])
+def get_migration_cache_stats():
+    """获取迁移任务缓存的使用情况"""
+    return jsonify({"success": True, "stats": MIGRATION_CACHE.stats()})
+
+
 @migrate_bp.route("/migrate/get_db_seed_info", methods=["GET"])
 def get_db_seed_info():
     """从数据库读取种子信息用于展示"""
@@ -366,8 +738,6 @@ def get_db_seed_info():
         # 从数据库读取
         try:
             # 初始化种子参数模型
-            from models.seed_parameter import SeedParameter
-
             seed_param_model = SeedParameter(db_manager)
 
             parameters = seed_param_model.get_parameters(torrent_id, site_name)
@@ -388,19 +758,8 @@ def get_db_seed_info():
                 # 生成task_id并存入缓存，以便发布时使用
                 cache_task_id = str(uuid.uuid4())
 
-                # 获取站点信息
-                source_info = db_manager.get_site_by_nickname(site_name)
-                if not source_info:
-                    # 如果通过昵称找不到，尝试通过英文站点名查找
-                    try:
-                        conn = db_manager._get_connection()
-                        cursor = db_manager._get_cursor(conn)
-                        cursor.execute("SELECT * FROM sites WHERE site = ?", (site_name,))
-                        source_info = cursor.fetchone()
-                        if source_info:
-                            source_info = dict(source_info)
-                    except Exception as e:
-                        logging.warning(f"获取站点信息失败: {e}")
+                # 获取站点信息（昵称或英文站点名）
+                source_info = db_manager.get_site_by_nickname_or_code(site_name)
 
                 # 将数据存入缓存，以便发布时使用
                 with MIGRATION_CACHE_LOCK:
@@ -414,10 +773,14 @@ def get_db_seed_info():
                     }
 
                 if task_id:
-                    # 标记数据库查询步骤完成
-                    log_streamer.emit_log(task_id, "数据库查询", "数据库读取完成", "success")
-                    # 发送完成步骤
-                    log_streamer.emit_log(task_id, "完成", "数据加载完成", "success")
+                    # 标记数据库查询步骤完成并发送完成步骤
+                    log_streamer.emit_log_batch(
+                        task_id,
+                        (
+                            ("数据库查询", "数据库读取完成", "success"),
+                            ("完成", "数据加载完成", "success"),
+                        ),
+                    )
                     # 关闭日志流
                     log_streamer.close_stream(task_id)
 
@@ -460,26 +823,77 @@ def get_db_seed_info():
         return jsonify({"success": False, "message": f"服务器内部错误: {str(e)}"}), 500
 
 
+def _get_title_order():
+    """读取 global_mappings.yaml 中 default_title_components 定义的标题拼接顺序。
+
+    结果随配置缓存一起失效；读取失败或未配置时使用 DEFAULT_TITLE_ORDER。
+    """
+    try:
+        global_config = load_global_mappings_config()
+    except Exception as e:
+        logging.warning(f"读取 global_mappings.yaml 失败，使用默认顺序: {e}")
+        return DEFAULT_TITLE_ORDER
+    if global_config is None:
+        return DEFAULT_TITLE_ORDER
+
+    with GLOBAL_MAPPINGS_CACHE_LOCK:
+        if GLOBAL_MAPPINGS_CACHE["config"] is global_config:
+            cached = GLOBAL_MAPPINGS_CACHE["title_order"]
+            if cached is not None:
+                return cached
+
+    default_title_components = global_config.get("default_title_components", {})
+    if not default_title_components:
+        return DEFAULT_TITLE_ORDER
+
+    # 按照配置文件中的顺序构建拼接顺序
+    order = tuple(
+        config["source_key"]
+        for config in default_title_components.values()
+        if isinstance(config, dict) and "source_key" in config
+    )
+    logging.info(f"从配置文件读取到标题拼接顺序: {list(order)}")
+
+    with GLOBAL_MAPPINGS_CACHE_LOCK:
+        if GLOBAL_MAPPINGS_CACHE["config"] is global_config:
+            GLOBAL_MAPPINGS_CACHE["title_order"] = order
+    return order
+
+
+def _join_title_parts(title_params, order):
+    """按 order 顺序拼接标题参数，列表值以空格连接，空值跳过。"""
+    return " ".join(
+        filter(
+            None,
+            (
+                " ".join(map(str, value)) if isinstance(value, list) else str(value)
+                for value in map(title_params.get, order)
+                if value
+            ),
+        )
+    )
+
+
 def generate_reverse_mappings():
     """生成从标准键到中文显示名称的反向映射"""
     try:
-        # 读取全局映射配置
-        import yaml
-        import os
-
-        # 首先尝试从global_mappings.yaml读取
+        # 首先尝试从global_mappings.yaml读取（按文件 mtime 缓存）
         global_mappings = {}
+        config_data = None
 
-        if os.path.exists(GLOBAL_MAPPINGS):
-            try:
-                with open(GLOBAL_MAPPINGS, "r", encoding="utf-8") as f:
-                    config_data = yaml.safe_load(f)
-                    global_mappings = config_data.get("global_standard_keys", {})
-                logging.info(
-                    f"成功从global_mappings.yaml读取配置，包含{len(global_mappings)}个类别"
-                )
-            except Exception as e:
-                logging.warning(f"读取global_mappings.yaml失败: {e}，将使用配置文件中的设置")
+        try:
+            config_data = load_global_mappings_config()
+            if config_data is not None:
+                global_mappings = config_data.get("global_standard_keys", {})
+        except Exception as e:
+            logging.warning(f"读取global_mappings.yaml失败: {e}，将使用配置文件中的设置")
+
+        if global_mappings:
+            with GLOBAL_MAPPINGS_CACHE_LOCK:
+                cached = GLOBAL_MAPPINGS_CACHE["reverse_mappings"]
+                if cached is not None and GLOBAL_MAPPINGS_CACHE["config"] is config_data:
+                    # 调用方只读取各类别字典，返回外层的浅拷贝即可
+                    return dict(cached)
 
         # 如果YAML文件读取失败，从配置管理器获取
         if not global_mappings:
@@ -509,23 +923,40 @@ def generate_reverse_mappings():
             "tags": global_mappings.get("tag", {}),  # 注意这里YAML中是'tag'而不是'tags'
         }
 
-        # 创建反向映射：从标准值到中文名称
+        # 创建反向映射：从标准值到中文名称（过滤掉null值）
         for category, mappings in categories_mapping.items():
             if category == "tags":
-                # 标签特殊处理，提取中文名作为键，标准值作为值
-                for chinese_name, standard_value in mappings.items():
-                    if standard_value:  # 过滤掉null值
-                        reverse_mappings["tags"][standard_value] = chinese_name
+                # 标签特殊处理：同一标准值对应多个中文名时以最后一个为准
+                reverse_mappings["tags"] = {
+                    standard_value: chinese_name
+                    for chinese_name, standard_value in mappings.items()
+                    if standard_value
+                }
             else:
-                # 其他类别正常处理
-                for chinese_name, standard_value in mappings.items():
-                    if standard_value and standard_value not in reverse_mappings[category]:
-                        reverse_mappings[category][standard_value] = chinese_name
+                # 其他类别以第一个中文名为准：倒序遍历让先出现的覆盖后出现的，
+                # 再按标准值首次出现的顺序输出，保持与配置文件一致的顺序
+                first_names = {
+                    standard_value: chinese_name
+                    for chinese_name, standard_value in reversed(mappings.items())
+                    if standard_value
+                }
+                reverse_mappings[category] = {
+                    standard_value: first_names[standard_value]
+                    for standard_value in mappings.values()
+                    if standard_value
+                }
 
         # 只在必要时添加固定映射项作为后备，避免覆盖YAML配置
         add_fallback_mappings(reverse_mappings)
 
         logging.info(f"成功生成反向映射表: { {k: len(v) for k, v in reverse_mappings.items()} }")
+
+        # 仅缓存由 YAML 生成的结果；来自配置管理器的映射可能随时变化
+        if config_data is not None and global_mappings is config_data.get("global_standard_keys"):
+            with GLOBAL_MAPPINGS_CACHE_LOCK:
+                if GLOBAL_MAPPINGS_CACHE["config"] is config_data:
+                    GLOBAL_MAPPINGS_CACHE["reverse_mappings"] = reverse_mappings
+            return dict(reverse_mappings)
         return reverse_mappings
 
     except Exception as e:
@@ -543,114 +974,147 @@ def generate_reverse_mappings():
         }
 
 
+# 反向映射表的后备映射项，仅在对应类别为空（YAML 配置缺失）时使用
+FALLBACK_REVERSE_MAPPINGS = (
+    (
+        "type",
+        {
+            "category.movie": "电影",
+            "category.tv_series": "剧集",
+            "category.animation": "动画",
+            "category.documentaries": "纪录片",
+            "category.music": "音乐",
+            "category.other": "其他",
+        },
+    ),
+    (
+        "medium",
+        {
+            "medium.bluray": "Blu-ray",
+            "medium.uhd_bluray": "UHD Blu-ray",
+            "medium.remux": "Remux",
+            "medium.encode": "Encode",
+            "medium.webdl": "WEB-DL",
+            "medium.webrip": "WebRip",
+            "medium.hdtv": "HDTV",
+            "medium.dvd": "DVD",
+            "medium.other": "其他",
+        },
+    ),
+    (
+        "video_codec",
+        {
+            "video.h264": "H.264/AVC",
+            "video.h265": "H.265/HEVC",
+            "video.x265": "x265",
+            "video.vc1": "VC-1",
+            "video.mpeg2": "MPEG-2",
+            "video.av1": "AV1",
+            "video.other": "其他",
+        },
+    ),
+    (
+        "audio_codec",
+        {
+            "audio.flac": "FLAC",
+            "audio.dts": "DTS",
+            "audio.dts_hd_ma": "DTS-HD MA",
+            "audio.dtsx": "DTS:X",
+            "audio.truehd": "TrueHD",
+            "audio.truehd_atmos": "TrueHD Atmos",
+            "audio.ac3": "AC-3",
+            "audio.ddp": "E-AC-3",
+            "audio.aac": "AAC",
+            "audio.mp3": "MP3",
+            "audio.other": "其他",
+        },
+    ),
+    (
+        "resolution",
+        {
+            "resolution.r8k": "8K",
+            "resolution.r4k": "4K",
+            "resolution.r2160p": "2160p",
+            "resolution.r1080p": "1080p",
+            "resolution.r1080i": "1080i",
+            "resolution.r720p": "720p",
+            "resolution.r480p": "480p",
+            "resolution.other": "其他",
+        },
+    ),
+    (
+        "source",
+        {
+            "source.china": "中国",
+            "source.hongkong": "香港",
+            "source.taiwan": "台湾",
+            "source.western": "美国",
+            "source.uk": "英国",
+            "source.japan": "日本",
+            "source.korea": "韩国",
+            "source.other": "其他",
+        },
+    ),
+    (
+        "team",
+        {
+            "team.other": "其他",
+        },
+    ),
+    (
+        "tags",
+        {
+            "tag.DIY": "DIY",
+            "tag.中字": "中字",
+            "tag.HDR": "HDR",
+        },
+    ),
+)
+
+
 def add_fallback_mappings(reverse_mappings):
     """添加后备映射项，仅在YAML配置缺失时使用"""
 
     # 检查各个类别是否为空，如果为空则添加基础映射
-    if not reverse_mappings["type"]:
-        logging.warning("type映射为空，添加基础后备映射")
-        reverse_mappings["type"].update(
-            {
-                "category.movie": "电影",
-                "category.tv_series": "剧集",
-                "category.animation": "动画",
-                "category.documentaries": "纪录片",
-                "category.music": "音乐",
-                "category.other": "其他",
-            }
-        )
+    for category, fallback in FALLBACK_REVERSE_MAPPINGS:
+        if not reverse_mappings[category]:
+            logging.warning(f"{category}映射为空，添加基础后备映射")
+            reverse_mappings[category].update(fallback)
 
-    if not reverse_mappings["medium"]:
-        logging.warning("medium映射为空，添加基础后备映射")
-        reverse_mappings["medium"].update(
-            {
-                "medium.bluray": "Blu-ray",
-                "medium.uhd_bluray": "UHD Blu-ray",
-                "medium.remux": "Remux",
-                "medium.encode": "Encode",
-                "medium.webdl": "WEB-DL",
-                "medium.webrip": "WebRip",
-                "medium.hdtv": "HDTV",
-                "medium.dvd": "DVD",
-                "medium.other": "其他",
-            }
-        )
 
-    if not reverse_mappings["video_codec"]:
-        logging.warning("video_codec映射为空，添加基础后备映射")
-        reverse_mappings["video_codec"].update(
-            {
-                "video.h264": "H.264/AVC",
-                "video.h265": "H.265/HEVC",
-                "video.x265": "x265",
-                "video.vc1": "VC-1",
-                "video.mpeg2": "MPEG-2",
-                "video.av1": "AV1",
-                "video.other": "其他",
-            }
-        )
+def _get_source_site(db_manager, site_name):
+    """获取源站点信息及其英文站点名，站点不存在或未配置 Cookie 时返回 (None, None)。"""
+    source_info = db_manager.get_site_by_nickname(site_name)
+    if not source_info or not source_info.get("cookie"):
+        return None, None
+    return source_info, source_info.get("site", site_name.lower())
 
-    if not reverse_mappings["audio_codec"]:
-        logging.warning("audio_codec映射为空，添加基础后备映射")
-        reverse_mappings["audio_codec"].update(
-            {
-                "audio.flac": "FLAC",
-                "audio.dts": "DTS",
-                "audio.dts_hd_ma": "DTS-HD MA",
-                "audio.dtsx": "DTS:X",
-                "audio.truehd": "TrueHD",
-                "audio.truehd_atmos": "TrueHD Atmos",
-                "audio.ac3": "AC-3",
-                "audio.ddp": "E-AC-3",
-                "audio.aac": "AAC",
-                "audio.mp3": "MP3",
-                "audio.other": "其他",
-            }
-        )
 
-    if not reverse_mappings["resolution"]:
-        logging.warning("resolution映射为空，添加基础后备映射")
-        reverse_mappings["resolution"].update(
-            {
-                "resolution.r8k": "8K",
-                "resolution.r4k": "4K",
-                "resolution.r2160p": "2160p",
-                "resolution.r1080p": "1080p",
-                "resolution.r1080i": "1080i",
-                "resolution.r720p": "720p",
-                "resolution.r480p": "480p",
-                "resolution.other": "其他",
-            }
-        )
+SOURCE_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/142.0.0.0 Safari/537.36"
+# requests.Session 不保证线程安全，cloudscraper 实例按线程、按源站点缓存
+SOURCE_SCRAPER_LOCAL = threading.local()
 
-    if not reverse_mappings["source"]:
-        logging.warning("source映射为空，添加基础后备映射")
-        reverse_mappings["source"].update(
-            {
-                "source.china": "中国",
-                "source.hongkong": "香港",
-                "source.taiwan": "台湾",
-                "source.western": "美国",
-                "source.uk": "英国",
-                "source.japan": "日本",
-                "source.korea": "韩国",
-                "source.other": "其他",
-            }
-        )
 
-    if not reverse_mappings["team"]:
-        logging.warning("team映射为空，添加基础后备映射")
-        reverse_mappings["team"].update({"team.other": "其他"})
-
-    if not reverse_mappings["tags"]:
-        logging.warning("tags映射为空，添加基础后备映射")
-        reverse_mappings["tags"].update(
-            {
-                "tag.DIY": "DIY",
-                "tag.中字": "中字",
-                "tag.HDR": "HDR",
-            }
-        )
+def _get_source_scraper(source_site_code):
+    """按线程、按源站点复用 cloudscraper 实例，避免每次重新下载都重新初始化并重建 TLS 连接。
+
+    站点 Cookie 由调用方在请求头中显式传入；每次取用前清空会话的 Cookie 罐，
+    不把上一次发布请求留下的 Cookie 带到下一次。
+    """
+    scrapers = getattr(SOURCE_SCRAPER_LOCAL, "scrapers", None)
+    if scrapers is None:
+        scrapers = SOURCE_SCRAPER_LOCAL.scrapers = {}
+    scraper = scrapers.get(source_site_code)
+    if scraper is None:
+        import cloudscraper
+
+        session = requests.Session()
+        session.verify = False
+        scraper = cloudscraper.create_scraper(sess=session)
+        scrapers[source_site_code] = scraper
+    else:
+        scraper.cookies.clear()
+    return scraper
 
 
 @migrate_bp.route("/migrate/download_torrent_only", methods=["POST"])
@@ -672,27 +1136,20 @@ def download_torrent_only():
 
         db_manager = migrate_bp.db_manager
 
-        # 获取站点信息
-        source_info = db_manager.get_site_by_nickname(site_name)
-        if not source_info or not source_info.get("cookie"):
+        # 获取站点信息及英文站点名（用于文件名前缀）
+        source_info, site_code = _get_source_site(db_manager, site_name)
+        if not source_info:
             return (
                 jsonify({"success": False, "message": f"错误：源站点 '{site_name}' 配置不完整。"}),
                 404,
             )
 
-        # 获取英文站点名（用于文件名前缀）
-        site_code = source_info.get("site", site_name.lower())
-
         # 使用统一的种子目录
-        from config import TEMP_DIR
-        import os
-        import urllib.parse
-        import re
-
         torrent_dir = os.path.join(TEMP_DIR, "torrents")
         os.makedirs(torrent_dir, exist_ok=True)
 
         # 创建TorrentMigrator实例仅用于下载种子文件
+        from core.migrator import TorrentMigrator
         migrator = TorrentMigrator(
             source_site_info=source_info,
             target_site_info=None,
@@ -776,10 +1233,10 @@ def migrate_fetch_and_store():
     log_streamer.emit_log(task_id, "开始抓取", "正在从源站点抓取种子信息...", "processing")
 
     try:
-        # 获取站点信息并获取英文站点名
-        source_info = db_manager.get_site_by_nickname(source_site_name)
+        # 获取站点信息并获取英文站点名（作为唯一标识符）
+        source_info, english_site_name = _get_source_site(db_manager, source_site_name)
 
-        if not source_info or not source_info.get("cookie"):
+        if not source_info:
             return (
                 jsonify(
                     {
@@ -803,10 +1260,8 @@ def migrate_fetch_and_store():
                 403,
             )
 
-        # 获取英文站点名作为唯一标识符
-        english_site_name = source_info.get("site", source_site_name.lower())
-
         # 初始化 Migrator 时不传入目标站点信息
+        from core.migrator import TorrentMigrator
         migrator = TorrentMigrator(
             source_site_info=source_info,
             target_site_info=None,
@@ -880,12 +1335,13 @@ def update_db_seed_info():
 
         try:
             # 更新数据库
-            from models.seed_parameter import SeedParameter
-
             seed_param_model = SeedParameter(db_manager)
 
             logging.info(f"开始更新种子参数: {torrent_id} from {site_name} ({site_name})")
 
+            # 简介相关字段只读取一次，映射输入、存储参数与发布参数共用
+            intro = {key: updated_parameters.get(key, "") for key in INTRO_PARAM_KEYS}
+
             # 检查用户是否提供了修改的标准参数
             user_standardized_params = updated_parameters.get("standardized_params", {})
 
@@ -901,27 +1357,17 @@ def update_db_seed_info():
                 extracted_data = {
                     "title": updated_parameters.get("title", ""),
                     "subtitle": updated_parameters.get("subtitle", ""),
-                    "imdb_link": updated_parameters.get("imdb_link", ""),
-                    "douban_link": updated_parameters.get("douban_link", ""),
-                    "tmdb_link": updated_parameters.get("tmdb_link", ""),
-                    "intro": {
-                        "statement": updated_parameters.get("statement", ""),
-                        "poster": updated_parameters.get("poster", ""),
-                        "body": updated_parameters.get("body", ""),
-                        "screenshots": updated_parameters.get("screenshots", ""),
-                        "imdb_link": updated_parameters.get("imdb_link", ""),
-                        "douban_link": updated_parameters.get("douban_link", ""),
-                        "tmdb_link": updated_parameters.get("tmdb_link", ""),
-                    },
+                    "imdb_link": intro["imdb_link"],
+                    "douban_link": intro["douban_link"],
+                    "tmdb_link": intro["tmdb_link"],
+                    "intro": intro,
                     "mediainfo": updated_parameters.get("mediainfo", ""),
                     "source_params": updated_parameters.get("source_params", {}),
                     "title_components": updated_parameters.get("title_components", []),
                 }
 
                 # 使用ParameterMapper重新标准化参数
-                from core.extractors.extractor import ParameterMapper
-
-                mapper = ParameterMapper()
+                mapper = _get_parameter_mapper()
 
                 # 重新标准化参数
                 standardized_params = mapper.map_parameters(site_name, site_name, extracted_data)
@@ -935,58 +1381,10 @@ def update_db_seed_info():
                 item["key"]: item["value"] for item in title_components if item.get("value")
             }
 
-            # 2. 从 global_mappings.yaml 读取拼接顺序
-            import yaml
-
-            global_mappings_path = GLOBAL_MAPPINGS
-
-            # 默认顺序（如果读取配置失败时使用）
-            order = [
-                "主标题",
-                "季集",
-                "年份",
-                "剧集状态",
-                "发布版本",
-                "分辨率",
-                "片源平台",
-                "媒介",
-                "帧率",
-                "视频编码",
-                "视频格式",
-                "HDR格式",
-                "色深",
-                "音频编码",
-            ]
-
-            try:
-                if os.path.exists(global_mappings_path):
-                    with open(global_mappings_path, "r", encoding="utf-8") as f:
-                        global_config = yaml.safe_load(f)
-                        default_title_components = global_config.get(
-                            "default_title_components", {}
-                        )
-
-                        if default_title_components:
-                            # 按照配置文件中的顺序构建 order 列表
-                            order = []
-                            for key, config in default_title_components.items():
-                                if isinstance(config, dict) and "source_key" in config:
-                                    order.append(config["source_key"])
-
-                            logging.info(f"从配置文件读取到标题拼接顺序: {order}")
-            except Exception as e:
-                logging.warning(f"读取 global_mappings.yaml 失败，使用默认顺序: {e}")
-            title_parts = []
-            for key in order:
-                value = title_params.get(key)
-                if value:
-                    title_parts.append(
-                        " ".join(map(str, value)) if isinstance(value, list) else str(value)
-                    )
-
-            raw_main_part = " ".join(filter(None, title_parts))
-            main_part = re.sub(r"(?<!\d)\.(?!\d)", " ", raw_main_part)
-            main_part = re.sub(r"\s+", " ", main_part).strip()
+            # 2. 按 global_mappings.yaml 中的拼接顺序组合主标题（顺序随配置缓存）
+            raw_main_part = _join_title_parts(title_params, _get_title_order())
+            main_part = TITLE_DOT_RE.sub(" ", raw_main_part)
+            main_part = WHITESPACE_RE.sub(" ", main_part).strip()
             release_group = title_params.get("制作组", "NOGROUP")
             if "N/A" in release_group:
                 release_group = "NOGROUP"
@@ -999,62 +1397,57 @@ def update_db_seed_info():
                 preview_title = f"{main_part}-{release_group}"
             # [新增] 结束：标题拼接完成，结果保存在 preview_title 变量中
 
+            # 各视图共用的取值只读取一次，值对象在各视图之间按引用共享
+            std_values = {key: standardized_params.get(key, "") for key in STANDARD_PARAM_KEYS}
+            std_values["tags"] = standardized_params.get("tags", [])
+            subtitle = updated_parameters.get("subtitle", "")
+
             # 构造完整的存储参数
             final_parameters = {
                 # [修改] 将原来的 title 值替换为新生成的 preview_title
                 "title": preview_title,
-                "subtitle": updated_parameters.get("subtitle", ""),
-                "imdb_link": updated_parameters.get("imdb_link", ""),
-                "douban_link": updated_parameters.get("douban_link", ""),
-                "tmdb_link": updated_parameters.get("tmdb_link", ""),
-                "poster": updated_parameters.get("poster", ""),
-                "screenshots": updated_parameters.get("screenshots", ""),
-                "statement": updated_parameters.get("statement", ""),
-                "body": updated_parameters.get("body", ""),
+                "subtitle": subtitle,
+                "imdb_link": intro["imdb_link"],
+                "douban_link": intro["douban_link"],
+                "tmdb_link": intro["tmdb_link"],
+                "poster": intro["poster"],
+                "screenshots": intro["screenshots"],
+                "statement": intro["statement"],
+                "body": intro["body"],
                 "mediainfo": updated_parameters.get("mediainfo", ""),
-                "type": standardized_params.get("type", ""),
-                "medium": standardized_params.get("medium", ""),
-                "video_codec": standardized_params.get("video_codec", ""),
-                "audio_codec": standardized_params.get("audio_codec", ""),
-                "resolution": standardized_params.get("resolution", ""),
-                "team": standardized_params.get("team", ""),
-                "source": standardized_params.get("source", ""),
-                "tags": standardized_params.get("tags", []),
+                "type": std_values["type"],
+                "medium": std_values["medium"],
+                "video_codec": std_values["video_codec"],
+                "audio_codec": std_values["audio_codec"],
+                "resolution": std_values["resolution"],
+                "team": std_values["team"],
+                "source": std_values["source"],
+                "tags": std_values["tags"],
                 "title_components": title_components,
                 "standardized_params": standardized_params,
                 "is_reviewed": True,  # 标记为已检查
                 "final_publish_parameters": {
                     # [修改] 预览标题也使用新生成的标题
                     "主标题 (预览)": preview_title,
-                    "副标题": updated_parameters.get("subtitle", ""),
-                    "IMDb链接": standardized_params.get("imdb_link", ""),
-                    "豆瓣链接": standardized_params.get("douban_link", ""),
-                    "TMDb链接": standardized_params.get("tmdb_link", ""),
-                    "类型": standardized_params.get("type", ""),
-                    "媒介": standardized_params.get("medium", ""),
-                    "视频编码": standardized_params.get("video_codec", ""),
-                    "音频编码": standardized_params.get("audio_codec", ""),
-                    "分辨率": standardized_params.get("resolution", ""),
-                    "制作组": standardized_params.get("team", ""),
-                    "产地": standardized_params.get("source", ""),
-                    "标签": standardized_params.get("tags", []),
+                    "副标题": subtitle,
+                    **{label: std_values[key] for label, key in FINAL_PUBLISH_PARAM_LABELS},
                 },
                 "complete_publish_params": {
-                    "title_components": updated_parameters.get("title_components", []),
-                    "subtitle": updated_parameters.get("subtitle", ""),
-                    "imdb_link": standardized_params.get("imdb_link", ""),
-                    "douban_link": standardized_params.get("douban_link", ""),
-                    "tmdb_link": standardized_params.get("tmdb_link", ""),
+                    "title_components": title_components,
+                    "subtitle": subtitle,
+                    "imdb_link": std_values["imdb_link"],
+                    "douban_link": std_values["douban_link"],
+                    "tmdb_link": std_values["tmdb_link"],
                     "intro": {
-                        "statement": updated_parameters.get("statement", ""),
-                        "poster": updated_parameters.get("poster", ""),
-                        "body": updated_parameters.get("body", ""),
-                        "screenshots": updated_parameters.get("screenshots", ""),
+                        "statement": intro["statement"],
+                        "poster": intro["poster"],
+                        "body": intro["body"],
+                        "screenshots": intro["screenshots"],
                         "removed_ardtudeclarations": updated_parameters.get(
                             "removed_ardtudeclarations", []
                         ),
-                        "imdb_link": updated_parameters.get("imdb_link", ""),
-                        "douban_link": updated_parameters.get("douban_link", ""),
+                        "imdb_link": intro["imdb_link"],
+                        "douban_link": intro["douban_link"],
                     },
                     "mediainfo": updated_parameters.get("mediainfo", ""),
                     "source_params": updated_parameters.get("source_params", {}),
@@ -1063,18 +1456,8 @@ def update_db_seed_info():
                 "raw_params_for_preview": {
                     # [修改] 原始预览参数也使用新标题
                     "final_main_title": preview_title,
-                    "subtitle": updated_parameters.get("subtitle", ""),
-                    "imdb_link": standardized_params.get("imdb_link", ""),
-                    "douban_link": standardized_params.get("douban_link", ""),
-                    "tmdb_link": standardized_params.get("tmdb_link", ""),
-                    "type": standardized_params.get("type", ""),
-                    "medium": standardized_params.get("medium", ""),
-                    "video_codec": standardized_params.get("video_codec", ""),
-                    "audio_codec": standardized_params.get("audio_codec", ""),
-                    "resolution": standardized_params.get("resolution", ""),
-                    "release_group": standardized_params.get("team", ""),
-                    "source": standardized_params.get("source", ""),
-                    "tags": standardized_params.get("tags", []),
+                    "subtitle": subtitle,
+                    **{name: std_values[key] for name, key in RAW_PREVIEW_PARAM_NAMES},
                 },
             }
 
@@ -1122,661 +1505,349 @@ def update_db_seed_info():
         return jsonify({"success": False, "message": f"服务器内部错误: {str(e)}"}), 500
 
 
-def _migrate_publish_impl(db_manager, data):
-    """发布到单个站点的核心逻辑（可被批量发布复用）。"""
-    data = data or {}
-    task_id = data.get("task_id")
-    upload_data = copy.deepcopy(data.get("upload_data") or {})
-    target_site_name = data.get("targetSite")
-    source_site_name = data.get("sourceSite")
-
-    if not task_id:
-        return {"success": False, "logs": "错误：无效或已过期的任务ID。", "url": None}, 400
-
-    with MIGRATION_CACHE_LOCK:
-        context = MIGRATION_CACHE.get(task_id)
+def _build_batch_enhance_record_sql(ph):
+    placeholders = ", ".join([ph] * 11)
+    return f"""INSERT INTO batch_enhance_records
+        (batch_id, title, torrent_id, source_site, target_site, progress, video_size_gb, status, success_url, error_detail, downloader_add_result)
+        VALUES ({placeholders})"""
 
-    if not context:
-        return {"success": False, "logs": "错误：无效或已过期的任务ID。", "url": None}, 400
 
-    if not target_site_name:
-        return {"success": False, "logs": "错误：必须提供目标站点名称。", "url": None}, 400
+# batch_enhance_records 写后队列：发布线程只入队，后台线程攒批后一次 executemany 写入
+BATCH_RECORD_QUEUE = queue.Queue()
+BATCH_RECORD_FLUSH_INTERVAL = 0.5
+BATCH_RECORD_FLUSH_MAX_ROWS = 100
+BATCH_RECORD_WRITER = None
+BATCH_RECORD_WRITER_LOCK = threading.Lock()
+# 进程退出时放入队列的停止标记，写线程写完手上的一批后退出
+BATCH_RECORD_STOP = object()
+BATCH_RECORD_SHUTDOWN_TIMEOUT = 10
 
-    migrator = None  # 确保在 finally 中可用
 
+def _write_batch_enhance_records(db_manager, rows):
+    """一次 executemany 写入一批记录；整批失败时回滚并逐条重写，避免一条坏数据丢掉整批。"""
+    conn = None
+    cursor = None
     try:
-        # 🚫 发布前标签限制检查：禁转/限转/分集直接拦截
-        restricted_tag_map = {
-            "禁转": "tag.禁转",
-            "tag.禁转": "tag.禁转",
-            "限转": "tag.限转",
-            "tag.限转": "tag.限转",
-            "分集": "tag.分集",
-            "tag.分集": "tag.分集",
-        }
-        standardized_params = (upload_data or {}).get("standardized_params", {})
-        raw_tags = (standardized_params.get("tags") or []) + (upload_data or {}).get("tags", [])
-        restricted_tags = []
-        for tag in raw_tags:
-            mapped_tag = restricted_tag_map.get(tag)
-            if mapped_tag and mapped_tag not in restricted_tags:
-                restricted_tags.append(mapped_tag)
-
-        if restricted_tags:
-            return (
-                {
-                    "success": False,
-                    "logs": f"🚫 发布前标签限制: 检测到禁转/限转/分集标签 {restricted_tags}",
-                    "limit_reached": True,
-                    "pre_check": True,
-                    "url": None,
-                },
-                200,
-            )
-
-        target_info = db_manager.get_site_by_nickname(target_site_name)
-        if not target_info:
-            return (
-                {
-                    "success": False,
-                    "logs": f"错误: 目标站点 '{target_site_name}' 配置不完整。",
-                    "url": None,
-                },
-                404,
-            )
-
-        source_info = context["source_info"]
-        original_torrent_path = context.get("original_torrent_path")
-        torrent_dir = context.get("torrent_dir", "")  # 获取种子目录
-
-        # 从缓存中获取源站点名称（如果前端没有传递）
-        if not source_site_name:
-            source_site_name = context.get("source_site_name", "")
-
-        # 🚫 发布前预检查发种限制 - 在任何发布逻辑之前进行
-        downloader_id = data.get("downloaderId") or data.get("downloader_id")
-        if downloader_id:
+        conn = db_manager._get_connection()
+        cursor = db_manager._get_cursor(conn)
+        sql = db_manager.get_cached_sql(
+            "insert_batch_enhance_record", _build_batch_enhance_record_sql
+        )
+        try:
+            cursor.executemany(sql, rows)
+            conn.commit()
+            return
+        except Exception as e:
+            conn.rollback()
+            logging.warning(f"批量写入转种记录失败({len(rows)} 条)，改为逐条写入: {e}")
+        for row in rows:
             try:
-                from .internal_guard import check_downloader_gate
-
-                can_continue, limit_message = check_downloader_gate(downloader_id)
-
-                if not can_continue:
-                    return (
-                        {
-                            "success": False,
-                            "logs": f"🚫 发布前预检查触发限制: {limit_message}",
-                            "limit_reached": True,
-                            "pre_check": True,
-                            "url": None,
-                        },
-                        200,
-                    )
-                else:
-                    print(f"✅ [发布前预检查] 通过，可以继续发布到 {target_site_name}")
+                cursor.execute(sql, row)
+                conn.commit()
             except Exception as e:
-                print(f"⚠️ [发布前预检查] 检查失败，继续执行: {e}")
+                conn.rollback()
+                logging.error(
+                    f"写入批量转种记录失败(batch_id={row[0]}, torrent_id={row[2]}): {e}"
+                )
+    except Exception as e:
+        logging.error(f"写入批量转种记录失败({len(rows)} 条): {e}", exc_info=True)
+    finally:
+        try:
+            if cursor:
+                cursor.close()
+        except Exception:
+            pass
+        try:
+            if conn:
+                conn.close()
+        except Exception:
+            pass
 
-        # 创建 TorrentMigrator 实例用于发布
-        migrator = TorrentMigrator(
-            source_info,
-            target_info,
-            search_term=context.get("source_torrent_id", ""),
-            save_path=upload_data.get("save_path", "") or upload_data.get("savePath", ""),
-            config_manager=config_manager,
-            db_manager=db_manager,
-        )
 
-        # 检查种子文件是否存在，如果不存在则重新下载
-        # [核心修改] 优先在统一的 torrents 目录中查找
-        source_torrent_id = context.get("source_torrent_id", "")
-        source_site_code = source_info.get("site", (source_site_name or "").lower())
+def _flush_batch_enhance_records(items):
+    """按 db_manager 分组写入一批 (db_manager, row)，并标记队列任务完成。"""
+    grouped = {}
+    for db_manager, row in items:
+        grouped.setdefault(db_manager, []).append(row)
+    try:
+        for db_manager, rows in grouped.items():
+            _write_batch_enhance_records(db_manager, rows)
+    finally:
+        for _ in items:
+            BATCH_RECORD_QUEUE.task_done()
 
-        if original_torrent_path is None or not os.path.exists(original_torrent_path):
-            logging.info("原始种子文件路径不存在，开始在统一目录中查找")
 
-            from config import TEMP_DIR
+def _batch_enhance_record_writer():
+    while True:
+        item = BATCH_RECORD_QUEUE.get()
+        if item is BATCH_RECORD_STOP:
+            BATCH_RECORD_QUEUE.task_done()
+            return
+        items = [item]
+        stopping = False
+        deadline = time.monotonic() + BATCH_RECORD_FLUSH_INTERVAL
+        while len(items) < BATCH_RECORD_FLUSH_MAX_ROWS:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = BATCH_RECORD_QUEUE.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is BATCH_RECORD_STOP:
+                BATCH_RECORD_QUEUE.task_done()
+                stopping = True
+                break
+            items.append(item)
+        _flush_batch_enhance_records(items)
+        if stopping:
+            return
 
-            torrents_dir = os.path.join(TEMP_DIR, "torrents")
 
-            # [新增] 首先在统一的 torrents 目录中查找以"站点-ID-"开头的种子文件
-            if os.path.exists(torrents_dir) and source_torrent_id:
-                prefix = f"{source_site_code}-{source_torrent_id}-"
-                logging.info(f"在统一目录中查找种子文件，前缀: {prefix}")
+def _enqueue_batch_enhance_record(db_manager, row):
+    global BATCH_RECORD_WRITER
+    with BATCH_RECORD_WRITER_LOCK:
+        if BATCH_RECORD_WRITER is None:
+            BATCH_RECORD_WRITER = threading.Thread(
+                target=_batch_enhance_record_writer,
+                name="BatchEnhanceRecordWriter",
+                daemon=True,
+            )
+            BATCH_RECORD_WRITER.start()
+    BATCH_RECORD_QUEUE.put((db_manager, row))
+
+
+@atexit.register
+def flush_pending_batch_enhance_records():
+    """进程退出前让写线程写完已取出的一批后退出，再把队列中剩余的记录同步落库。"""
+    writer = BATCH_RECORD_WRITER
+    if writer is not None and writer.is_alive():
+        BATCH_RECORD_QUEUE.put(BATCH_RECORD_STOP)
+        writer.join(BATCH_RECORD_SHUTDOWN_TIMEOUT)
+        if writer.is_alive():
+            logging.warning(
+                "批量转种记录写线程 %s 秒内未退出，剩余记录可能未写入", BATCH_RECORD_SHUTDOWN_TIMEOUT
+            )
+            return
 
-                try:
-                    for file in os.listdir(torrents_dir):
-                        if file.startswith(prefix) and file.endswith(".torrent"):
-                            original_torrent_path = os.path.join(torrents_dir, file)
-                            torrent_dir = torrents_dir
-                            logging.info(f"✅ 在统一目录中找到种子文件: {file}")
-                            break
-                except Exception as e:
-                    logging.warning(f"遍历统一目录时出错: {e}")
-
-            # 如果在统一目录中没找到，再检查旧格式目录
-            if (
-                original_torrent_path is None or not os.path.exists(original_torrent_path)
-            ) and source_torrent_id:
-                logging.info("统一目录中未找到，检查旧格式目录")
-                old_torrent_dir = os.path.join(TEMP_DIR, f"torrent_{source_torrent_id}")
-                if os.path.exists(old_torrent_dir):
-                    try:
-                        for file in os.listdir(old_torrent_dir):
-                            if file.endswith(".torrent"):
-                                original_torrent_path = os.path.join(old_torrent_dir, file)
-                                torrent_dir = old_torrent_dir
-                                logging.info(
-                                    f"在旧格式临时目录中找到种子文件: {original_torrent_path}"
-                                )
-                                break
-                    except Exception as e:
-                        logging.warning(f"查找旧格式临时目录中的种子文件时出错: {e}")
+    items = []
+    while True:
+        try:
+            items.append(BATCH_RECORD_QUEUE.get_nowait())
+        except queue.Empty:
+            break
+    if items:
+        _flush_batch_enhance_records(items)
 
-                if original_torrent_path is None or not os.path.exists(original_torrent_path):
-                    cached_torrent_dir = context.get("torrent_dir")
-                    if cached_torrent_dir and os.path.exists(cached_torrent_dir):
-                        try:
-                            for file in os.listdir(cached_torrent_dir):
-                                if file.endswith(".torrent"):
-                                    original_torrent_path = os.path.join(cached_torrent_dir, file)
-                                    torrent_dir = cached_torrent_dir
-                                    logging.info(
-                                        f"在新格式临时目录中找到种子文件: {original_torrent_path}"
-                                    )
-                                    break
-                        except Exception as e:
-                            logging.warning(f"查找新格式临时目录中的种子文件时出错: {e}")
 
-                if original_torrent_path is None or not os.path.exists(original_torrent_path):
-                    try:
-                        seed_name = get_seed_name(db_manager, source_torrent_id, source_site_name)
-                        if seed_name:
-                            safe_filename_base = re.sub(r'[<>:"/\\|?*]', "_", seed_name).strip()
-                            seed_name_dir = os.path.join(TEMP_DIR, safe_filename_base)
-                            if os.path.exists(seed_name_dir):
-                                for file in os.listdir(seed_name_dir):
-                                    if file.endswith(".torrent"):
-                                        original_torrent_path = os.path.join(seed_name_dir, file)
-                                        torrent_dir = seed_name_dir
-                                        logging.info(
-                                            f"在种子名称目录中找到种子文件: {original_torrent_path}"
-                                        )
-                                        break
-                    except Exception as e:
-                        logging.warning(f"查找种子名称目录中的种子文件时出错: {e}")
+def _get_source_torrent_info(db_manager, task_id, source_torrent_id, source_site_name):
+    """获取源种子当前的保存路径/下载器信息。
 
-            if original_torrent_path is None or not os.path.exists(original_torrent_path):
-                # 并发发布时，只允许一个线程负责下载/补齐原始 .torrent，避免同时写同一个文件导致损坏
-                with MIGRATION_CACHE_LOCK:
-                    torrent_file_lock = MIGRATION_TORRENT_FILE_LOCKS.setdefault(
-                        task_id, threading.Lock()
-                    )
+    结果在 SEED_IDENTITY_CACHE_TTL 内记录在迁移任务上下文中，批量发布时
+    同一任务的各目标站点线程共用一次查询；未查到时不缓存。
+    """
+    now = time.time()
+    context = MIGRATION_CACHE.get(task_id)
+    cached = context.get("source_torrent_info") if context else None
+    if cached and cached[0] > now:
+        return cached[1]
+
+    torrent_info = get_current_torrent_info_by_seed(db_manager, source_torrent_id, source_site_name)
+    if torrent_info:
+        with MIGRATION_CACHE_LOCK:
+            context = MIGRATION_CACHE.get(task_id)
+            if context is not None:
+                context["source_torrent_info"] = (now + SEED_IDENTITY_CACHE_TTL, torrent_info)
+    return torrent_info
 
-                with torrent_file_lock:
-                    # 另一线程可能已经补齐/下载成功
-                    with MIGRATION_CACHE_LOCK:
-                        refreshed_context = MIGRATION_CACHE.get(task_id) or {}
-                        refreshed_path = refreshed_context.get("original_torrent_path")
-                        refreshed_dir = refreshed_context.get("torrent_dir")
-                    if refreshed_path and os.path.exists(refreshed_path):
-                        original_torrent_path = refreshed_path
-                        if refreshed_dir:
-                            torrent_dir = refreshed_dir
-                    else:
-                        logging.info("需要重新下载种子文件")
-                        try:
-                            import cloudscraper
 
-                            session = requests.Session()
-                            session.verify = False
-                            scraper = cloudscraper.create_scraper(sess=session)
+def _remember_task_torrent_path(task_id, original_torrent_path, torrent_dir):
+    """把找到/下载好的原始种子路径写回迁移任务上下文，供同一任务的其它发布复用。"""
+    with MIGRATION_CACHE_LOCK:
+        context = MIGRATION_CACHE.get(task_id)
+        if context is not None:
+            context["original_torrent_path"] = original_torrent_path
+            if torrent_dir:
+                context["torrent_dir"] = torrent_dir
 
-                            SOURCE_BASE_URL = source_info.get("base_url", "").rstrip("/")
-                            if SOURCE_BASE_URL and not SOURCE_BASE_URL.startswith(
-                                ("http://", "https://")
-                            ):
-                                SOURCE_BASE_URL = "https://" + SOURCE_BASE_URL
-                            SOURCE_COOKIE = source_info.get("cookie", "")
-                            source_torrent_id = context.get("source_torrent_id", "")
 
-                            if SOURCE_BASE_URL and SOURCE_COOKIE and source_torrent_id:
-                                response = scraper.get(
-                                    f"{SOURCE_BASE_URL}/details.php",
-                                    headers={
-                                        "Cookie": SOURCE_COOKIE,
-                                        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/142.0.0.0 Safari/537.36",
-                                    },
-                                    params={"id": source_torrent_id, "hit": "1"},
-                                    timeout=180,
-                                )
-                                response.raise_for_status()
-                                response.encoding = "utf-8"
+def _content_disposition_filename(content_disposition, default):
+    """从 Content-Disposition 响应头中取文件名，未提供时返回 default。
 
-                                soup = BeautifulSoup(response.text, "html.parser")
-                                download_link_tag = soup.select_one(
-                                    f'a.index[href^="download.php?id={source_torrent_id}"]'
-                                )
+    优先使用 RFC 5987 的 filename*=，由 werkzeug 完成解码；werkzeug 在两者并存时
+    取最后出现的一个，因此单独解析 filename*= 参数。
+    部分站点在普通 filename= 中直接放百分号编码的文件名，这种情况再 unquote 一次；
+    werkzeug 会在第一个空格处截断未加引号的文件名，此时改用分号之前的完整值。
+    """
+    if not content_disposition:
+        return default
+    ext_match = CD_FILENAME_EXT_RE.search(content_disposition)
+    if ext_match:
+        _, options = parse_options_header(f"attachment; filename*={ext_match.group(1)}")
+        if options.get("filename"):
+            return options["filename"]
+    _, options = parse_options_header(content_disposition)
+    filename = options.get("filename")
+    if not filename:
+        return default
+    unquoted_match = CD_UNQUOTED_FILENAME_RE.search(content_disposition)
+    if unquoted_match:
+        filename = unquoted_match.group(1).strip()
+    return urllib.parse.unquote(filename)
 
-                                if not download_link_tag:
-                                    logging.error("未找到种子下载链接")
-                                    return (
-                                        {
-                                            "success": False,
-                                            "logs": "错误：未找到种子下载链接。",
-                                            "url": None,
-                                        },
-                                        500,
-                                    )
 
-                                torrent_response = scraper.get(
-                                    f"{SOURCE_BASE_URL}/{download_link_tag['href']}",
-                                    headers={
-                                        "Cookie": SOURCE_COOKIE,
-                                        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/142.0.0.0 Safari/537.36",
-                                    },
-                                    timeout=180,
-                                )
-                                torrent_response.raise_for_status()
+# (目录, 文件名前缀) -> 已找到的种子文件路径，避免每次发布都遍历统一种子目录
+TORRENT_PATH_INDEX = OrderedDict()
+TORRENT_PATH_INDEX_MAXSIZE = 4096
+TORRENT_PATH_INDEX_LOCK = threading.Lock()
 
-                                content_disposition = torrent_response.headers.get(
-                                    "content-disposition"
-                                )
-                                torrent_filename = "unknown.torrent"
-                                if content_disposition:
-                                    filename_match = re.search(
-                                        r'filename\*="?UTF-8\'\'([^"]+)"?',
-                                        content_disposition,
-                                        re.IGNORECASE,
-                                    )
-                                    if filename_match:
-                                        torrent_filename = urllib.parse.unquote(
-                                            filename_match.group(1), encoding="utf-8"
-                                        )
-                                    else:
-                                        filename_match = re.search(
-                                            r'filename="?([^"]+)"?', content_disposition
-                                        )
-                                        if filename_match:
-                                            torrent_filename = urllib.parse.unquote(
-                                                filename_match.group(1)
-                                            )
-
-                                torrent_dir = os.path.join(TEMP_DIR, "torrents")
-                                os.makedirs(torrent_dir, exist_ok=True)
-                                source_site_code = source_info.get(
-                                    "site", (source_site_name or "").lower()
-                                )
 
-                                safe_filename = re.sub(r"[<>:\"/\\\\|?*]", "_", torrent_filename)
-                                if len(safe_filename.encode("utf-8")) > 255:
-                                    name, ext = os.path.splitext(safe_filename)
-                                    max_len = 255 - len(ext.encode("utf-8"))
-                                    safe_filename = (
-                                        name.encode("utf-8")[:max_len].decode("utf-8", "ignore")
-                                        + ext
-                                    )
+def _index_torrent_path(directory, prefix, path):
+    with TORRENT_PATH_INDEX_LOCK:
+        TORRENT_PATH_INDEX[(directory, prefix)] = path
+        TORRENT_PATH_INDEX.move_to_end((directory, prefix))
+        while len(TORRENT_PATH_INDEX) > TORRENT_PATH_INDEX_MAXSIZE:
+            TORRENT_PATH_INDEX.popitem(last=False)
 
-                                prefixed_filename = (
-                                    f"{source_site_code}-{source_torrent_id}-{safe_filename}"
-                                )
-                                original_torrent_path = os.path.join(
-                                    torrent_dir, prefixed_filename
-                                )
-                                tmp_torrent_path = (
-                                    f"{original_torrent_path}.tmp-{uuid.uuid4().hex}"
-                                )
-                                try:
-                                    with open(tmp_torrent_path, "wb") as f:
-                                        f.write(torrent_response.content)
-                                    os.replace(tmp_torrent_path, original_torrent_path)
-                                finally:
-                                    try:
-                                        if os.path.exists(tmp_torrent_path):
-                                            os.remove(tmp_torrent_path)
-                                    except Exception:
-                                        pass
-                                logging.info(f"重新下载种子文件成功: {original_torrent_path}")
-                            else:
-                                logging.error("缺少必要信息，无法重新下载种子")
-                                return (
-                                    {
-                                        "success": False,
-                                        "logs": "错误：缺少必要信息，无法重新下载种子。",
-                                        "url": None,
-                                    },
-                                    500,
-                                )
-                        except Exception as e:
-                            logging.error(f"重新下载种子文件失败: {e}", exc_info=True)
-                            return (
-                                {
-                                    "success": False,
-                                    "logs": f"错误：重新下载种子文件失败: {e}",
-                                    "url": None,
-                                },
-                                500,
-                            )
 
-                    # 下载/补齐后更新缓存，供其它线程复用
-                    if original_torrent_path and os.path.exists(original_torrent_path):
-                        with MIGRATION_CACHE_LOCK:
-                            if task_id in MIGRATION_CACHE:
-                                MIGRATION_CACHE[task_id][
-                                    "original_torrent_path"
-                                ] = original_torrent_path
-                                if torrent_dir:
-                                    MIGRATION_CACHE[task_id]["torrent_dir"] = torrent_dir
-
-        if original_torrent_path and os.path.exists(original_torrent_path):
-            with MIGRATION_CACHE_LOCK:
-                if task_id in MIGRATION_CACHE:
-                    MIGRATION_CACHE[task_id]["original_torrent_path"] = original_torrent_path
-                    if torrent_dir:
-                        MIGRATION_CACHE[task_id]["torrent_dir"] = torrent_dir
-
-        if not original_torrent_path or not os.path.exists(original_torrent_path):
-            raise Exception("原始种子文件路径无效或文件不存在。")
+def _find_torrent_file(directory, prefix=""):
+    """返回目录中第一个（以 prefix 开头的）.torrent 文件路径，目录不存在或未找到时返回 None。
 
-        upload_data["torrent_dir"] = torrent_dir  # 确保上传器能获取到 torrent_dir
-        result = migrator.publish_prepared_torrent(upload_data, original_torrent_path)
+    使用 os.scandir 遍历，文件类型来自目录项本身，找到后立即返回，无需额外 stat。
+    按前缀查找的结果记入 TORRENT_PATH_INDEX，命中且文件仍存在时直接返回。
+    """
+    if prefix:
+        with TORRENT_PATH_INDEX_LOCK:
+            cached = TORRENT_PATH_INDEX.get((directory, prefix))
+        if cached:
+            if os.path.isfile(cached):
+                return cached
+            with TORRENT_PATH_INDEX_LOCK:
+                TORRENT_PATH_INDEX.pop((directory, prefix), None)
 
-        # 3. 如果发布成功，自动添加到下载器
-        if result.get("success") and result.get("url"):
-            config = config_manager.get()
-            cross_seed_cfg = config.get("cross_seed", {}) or {}
-            auto_add = _to_bool(data.get("auto_add_to_downloader", True), True)
-            auto_add_existing_to_downloader = _to_bool(
-                data.get(
-                    "auto_add_existing_to_downloader",
-                    cross_seed_cfg.get("auto_add_existing_to_downloader", True),
-                ),
-                bool(cross_seed_cfg.get("auto_add_existing_to_downloader", True)),
-            )
-            is_existing_torrent = _is_existing_torrent_publish_result(result)
-            print(f"[下载器添加] 发布成功, auto_add={auto_add}, url={result.get('url')}")
-            print(
-                f"[下载器添加] 已存在种子判定={is_existing_torrent}, 已存在是否自动添加={auto_add_existing_to_downloader}"
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                name = entry.name
+                if name.endswith(".torrent") and name.startswith(prefix) and entry.is_file():
+                    if prefix:
+                        _index_torrent_path(directory, prefix, entry.path)
+                    return entry.path
+    except (FileNotFoundError, NotADirectoryError):
+        pass
+    return None
+
+
+TORRENT_SEARCH_EXECUTOR = None
+TORRENT_SEARCH_EXECUTOR_LOCK = threading.Lock()
+
+
+def _get_torrent_search_executor():
+    global TORRENT_SEARCH_EXECUTOR
+    with TORRENT_SEARCH_EXECUTOR_LOCK:
+        if TORRENT_SEARCH_EXECUTOR is None:
+            TORRENT_SEARCH_EXECUTOR = ThreadPoolExecutor(
+                max_workers=4, thread_name_prefix="torrent-search"
             )
+        return TORRENT_SEARCH_EXECUTOR
 
-            if auto_add and (auto_add_existing_to_downloader or not is_existing_torrent):
-                default_downloader = cross_seed_cfg.get("default_downloader")
-
-                downloader_id = data.get("downloaderId") or data.get("downloader_id")
-                save_path = upload_data.get("save_path") or upload_data.get("savePath")
-                print(
-                    f"[下载器添加] 初始参数: downloader_id={downloader_id}, save_path={save_path}"
-                )
-                print(f"[下载器添加] 配置的默认下载器: {default_downloader}")
 
-                if default_downloader and default_downloader != "":
-                    downloader_id = default_downloader
-                    print(f"[下载器添加] 使用配置的默认下载器: {downloader_id}")
+def _search_torrent_candidates(candidates):
+    """按优先级在候选目录 [(说明, 目录, 文件名前缀)] 中查找种子文件，返回 (路径, 目录)。
 
-                    if not save_path:
-                        print(f"[下载器添加] 缺少save_path,从数据库获取源种子的保存路径")
-                        source_torrent_id = context.get("source_torrent_id")
-                        if source_torrent_id and source_site_name:
-                            torrent_name = get_seed_name(
-                                db_manager, source_torrent_id, source_site_name
-                            )
-                            torrent_info = get_current_torrent_info(db_manager, torrent_name)
-                            if torrent_info and torrent_info.get("save_path"):
-                                save_path = torrent_info["save_path"]
-                                print(f"[下载器添加] 从数据库获取到保存路径: {save_path}")
-                            else:
-                                print(f"[下载器添加] 数据库中未找到保存路径")
-                else:
-                    print(f"[下载器添加] 配置为使用源种子下载器,从数据库查询")
-                    source_torrent_id = context.get("source_torrent_id")
-                    if source_torrent_id and source_site_name:
-                        torrent_name = get_seed_name(
-                            db_manager, source_torrent_id, source_site_name
-                        )
-                        torrent_info = get_current_torrent_info(db_manager, torrent_name)
-                        if torrent_info:
-                            downloader_id = torrent_info.get("downloader_id")
-                            if not save_path and torrent_info.get("save_path"):
-                                save_path = torrent_info["save_path"]
-                                print(f"[下载器添加] 从数据库获取到保存路径: {save_path}")
-                            print(f"[下载器添加] 从数据库获取到源种子的下载器ID: {downloader_id}")
-                        else:
-                            print(f"[下载器添加] 数据库中未找到源种子信息")
-
-                    if not downloader_id:
-                        print(f"[下载器添加] 未找到源种子的下载器信息")
-
-                if save_path and downloader_id:
-                    try:
-                        print(
-                            f"[下载器添加] 准备同步添加到下载器: URL={result['url']}, Path={save_path}, DownloaderID={downloader_id}"
-                        )
-                        print(f"[下载器添加] 结果详情: {result}")
-                        print(
-                            f"[下载器添加] 直接下载链接: {result.get('direct_download_url', 'None')}"
-                        )
-
-                        try:
-                            from .internal_guard import check_downloader_gate
-
-                            can_continue, limit_message = check_downloader_gate(downloader_id)
-
-                            if not can_continue:
-                                print(f"🚫 [下载器添加] 发布前预检查触发限制: {limit_message}")
-                                result["auto_add_result"] = {
-                                    "success": False,
-                                    "message": limit_message,
-                                    "sync": True,
-                                    "downloader_id": None,
-                                    "limit_reached": True,
-                                    "pre_check": True,
-                                }
-                                return result, 200
-                            else:
-                                print(f"✅ [下载器添加] 发布前预检查通过，可以继续添加")
-                        except Exception as e:
-                            print(f"⚠️ [下载器添加] 发布前预检查失败，继续执行: {e}")
-
-                        success, message = add_torrent_to_downloader(
-                            detail_page_url=result["url"],
-                            save_path=save_path,
-                            downloader_id=downloader_id,
-                            db_manager=db_manager,
-                            config_manager=config_manager,
-                            direct_download_url=result.get("direct_download_url"),
-                        )
-
-                        limit_reached = success == "LIMIT_REACHED"
-
-                        result["auto_add_result"] = {
-                            "success": not limit_reached,
-                            "message": message,
-                            "sync": True,
-                            "downloader_id": downloader_id if not limit_reached else None,
-                            "limit_reached": limit_reached,
-                        }
-
-                    except Exception as e:
-                        print(f"❌ [下载器添加] 同步添加异常: {e}")
-                        import traceback
-
-                        traceback.print_exc()
-                        result["auto_add_result"] = {
-                            "success": False,
-                            "message": f"添加到下载器失败: {str(e)}",
-                        }
-                else:
-                    missing = []
-                    if not save_path:
-                        missing.append("save_path")
-                    if not downloader_id:
-                        missing.append("downloader_id")
-                    print(f"⚠️ [下载器添加] 跳过: 缺少参数 {', '.join(missing)}")
-                    result["auto_add_result"] = {
-                        "success": False,
-                        "message": f"缺少必要参数: {', '.join(missing)}",
-                    }
-            else:
-                if not auto_add:
-                    print(f"[下载器添加] auto_add=False, 跳过自动添加")
-                elif is_existing_torrent and not auto_add_existing_to_downloader:
-                    print("[下载器添加] 检测到目标站点种子已存在，按设置跳过自动添加")
-                else:
-                    print("[下载器添加] 跳过自动添加（原因未知）")
-
-        # 处理批量转种记录（Go 端批量转种调用 /api/migrate/publish 时会传 batch_id）
-        batch_id = data.get("batch_id")  # Go端传递的批次ID
-        if batch_id:
-            try:
-                source_torrent_id = context.get("source_torrent_id")
-                if source_torrent_id and source_site_name and target_site_name:
-                    seed_title = "未知标题"
-                    try:
-                        seed_param_model = SeedParameter(db_manager)
-                        seed_parameters = seed_param_model.get_parameters(
-                            source_torrent_id, source_site_name
-                        )
-                        if seed_parameters and seed_parameters.get("title"):
-                            seed_title = seed_parameters.get("title")
-                    except Exception:
-                        pass
-
-                    video_size_gb = data.get("video_size_gb")
-                    progress = data.get("batch_progress")
-                    status = "success" if result.get("success") else "failed"
-                    success_url = result.get("url") if result.get("success") else None
-                    error_detail = result.get("logs") if not result.get("success") else None
-                    downloader_add_result = None
-                    if result.get("auto_add_result"):
-                        try:
-                            downloader_add_result = json.dumps(
-                                result.get("auto_add_result"), ensure_ascii=False
-                            )
-                        except Exception:
-                            downloader_add_result = str(result.get("auto_add_result"))
-
-                    source_site_for_record = data.get("nickname") or source_site_name
+    开启 PARALLEL_TORRENT_SEARCH 时各目录并发检查（网络挂载上单次目录遍历延迟较高），
+    结果仍按候选顺序选取，与顺序查找命中同一个文件。
+    """
 
-                    # 兼容不同数据库参数占位符（sqlite: ?, mysql/postgresql: %s）
-                    try:
-                        ph = db_manager.get_placeholder()
-                    except Exception:
-                        ph = "%s"
-                    placeholders = ", ".join([ph] * 11)
-                    insert_sql = f"""INSERT INTO batch_enhance_records
-                        (batch_id, title, torrent_id, source_site, target_site, progress, video_size_gb, status, success_url, error_detail, downloader_add_result)
-                        VALUES ({placeholders})"""
-
-                    conn = None
-                    cursor = None
-                    try:
-                        conn = db_manager._get_connection()
-                        cursor = db_manager._get_cursor(conn)
-                        cursor.execute(
-                            insert_sql,
-                            (
-                                batch_id,
-                                seed_title,
-                                source_torrent_id,
-                                source_site_for_record,
-                                target_site_name,
-                                progress,
-                                video_size_gb,
-                                status,
-                                success_url,
-                                error_detail,
-                                downloader_add_result,
-                            ),
-                        )
-                        conn.commit()
-                    finally:
-                        try:
-                            if cursor:
-                                cursor.close()
-                        except Exception:
-                            pass
-                        try:
-                            if conn:
-                                conn.close()
-                        except Exception:
-                            pass
-            except Exception:
-                pass
+    def check(candidate):
+        label, directory, prefix = candidate
+        try:
+            return _find_torrent_file(directory, prefix)
+        except OSError as e:
+            logging.warning(f"查找{label}中的种子文件时出错: {e}")
+            return None
 
-        return result, 200
+    futures = []
+    if PARALLEL_TORRENT_SEARCH and len(candidates) > 1:
+        executor = _get_torrent_search_executor()
+        futures = [executor.submit(check, c) for c in candidates]
+        results = (future.result() for future in futures)
+    else:
+        results = (check(c) for c in candidates)
 
-    except Exception as e:
-        logging.error(f"migrate_publish to {target_site_name} 发生意外错误: {e}", exc_info=True)
-        return {"success": False, "logs": f"服务器内部错误: {e}", "url": None}, 500
-    finally:
-        if migrator:
-            migrator.cleanup()
+    for (label, directory, _prefix), path in zip(candidates, results):
+        if path:
+            for future in futures:
+                future.cancel()
+            logging.info(f"在{label}中找到种子文件: {path}")
+            return path, directory
+    return None, None
 
 
-@migrate_bp.route("/migrate/publish", methods=["POST"])
-def migrate_publish():
-    # 新实现：委托给可复用的核心逻辑，便于批量并发发布使用。
-    result, status_code = _migrate_publish_impl(migrate_bp.db_manager, request.json)
-    return jsonify(result), status_code
+def _migrate_publish_impl(db_manager, data):
+    """发布到单个站点的核心逻辑（可被批量发布复用）。"""
+    data = data or {}
+    task_id = data.get("task_id")
+    # 批量发布时多个站点线程共享同一份 upload_data：
+    # 本函数只写入顶层键，上传器只会改写 standardized_params 的顶层键，浅拷贝这两层即可
+    upload_data = dict(data.get("upload_data") or {})
+    if isinstance(upload_data.get("standardized_params"), dict):
+        upload_data["standardized_params"] = dict(upload_data["standardized_params"])
+    save_path = upload_data.get("save_path") or upload_data.get("savePath")
+    downloader_id = data.get("downloaderId") or data.get("downloader_id")
+    target_site_name = data.get("targetSite")
+    source_site_name = data.get("sourceSite")
 
-    db_manager = migrate_bp.db_manager
-    data = request.json
-    task_id, upload_data, target_site_name, source_site_name = (
-        data.get("task_id"),
-        data.get("upload_data"),
-        data.get("targetSite"),
-        data.get("sourceSite"),
-    )
+    if not task_id:
+        return {"success": False, "logs": "错误：无效或已过期的任务ID。", "url": None}, 400
 
-    if not task_id or task_id not in MIGRATION_CACHE:
-        return jsonify({"success": False, "logs": "错误：无效或已过期的任务ID。"}), 400
+    # MIGRATION_CACHE 自带锁，只读访问无需再持有全局锁
+    context = MIGRATION_CACHE.get(task_id)
 
-    if not target_site_name:
-        return jsonify({"success": False, "logs": "错误：必须提供目标站点名称。"}), 400
+    if not context:
+        return {"success": False, "logs": "错误：无效或已过期的任务ID。", "url": None}, 400
 
-    context = MIGRATION_CACHE[task_id]
+    if not target_site_name:
+        return {"success": False, "logs": "错误：必须提供目标站点名称。", "url": None}, 400
 
     migrator = None  # 确保在 finally 中可用
 
     try:
         # 🚫 发布前标签限制检查：禁转/限转/分集直接拦截
-        restricted_tag_map = {
-            "禁转": "tag.禁转",
-            "tag.禁转": "tag.禁转",
-            "限转": "tag.限转",
-            "tag.限转": "tag.限转",
-            "分集": "tag.分集",
-            "tag.分集": "tag.分集",
-        }
         standardized_params = (upload_data or {}).get("standardized_params", {})
         raw_tags = (standardized_params.get("tags") or []) + (upload_data or {}).get("tags", [])
-        restricted_tags = []
-        for tag in raw_tags:
-            mapped_tag = restricted_tag_map.get(tag)
-            if mapped_tag and mapped_tag not in restricted_tags:
-                restricted_tags.append(mapped_tag)
+        # 按首次出现的顺序去重
+        restricted_tags = list(
+            dict.fromkeys(
+                RESTRICTED_TAG_MAP[tag] for tag in raw_tags if tag in RESTRICTED_TAG_MAP
+            )
+        )
 
         if restricted_tags:
-            return jsonify(
+            return (
                 {
                     "success": False,
                     "logs": f"🚫 发布前标签限制: 检测到禁转/限转/分集标签 {restricted_tags}",
                     "limit_reached": True,
                     "pre_check": True,
-                }
+                    "url": None,
+                },
+                200,
             )
 
         target_info = db_manager.get_site_by_nickname(target_site_name)
         if not target_info:
             return (
-                jsonify(
-                    {"success": False, "logs": f"错误: 目标站点 '{target_site_name}' 配置不完整。"}
-                ),
+                {
+                    "success": False,
+                    "logs": f"错误: 目标站点 '{target_site_name}' 配置不完整。",
+                    "url": None,
+                },
                 404,
             )
 
         source_info = context["source_info"]
-        original_torrent_path = context["original_torrent_path"]
+        original_torrent_path = context.get("original_torrent_path")
         torrent_dir = context.get("torrent_dir", "")  # 获取种子目录
 
         # 从缓存中获取源站点名称（如果前端没有传递）
@@ -1784,33 +1855,36 @@ def migrate_publish():
             source_site_name = context.get("source_site_name", "")
 
         # 🚫 发布前预检查发种限制 - 在任何发布逻辑之前进行
-        downloader_id = data.get("downloaderId") or data.get("downloader_id")
+        # 预检查通过后，本次发布添加到下载器时不再重复检查同一下载器
+        gate_passed_downloader_id = None
         if downloader_id:
             try:
-                from .internal_guard import check_downloader_gate
-
-                can_continue, limit_message = check_downloader_gate(downloader_id)
+                can_continue, limit_message = check_downloader_gate_cached(downloader_id)
 
                 if not can_continue:
-                    return jsonify(
+                    return (
                         {
                             "success": False,
                             "logs": f"🚫 发布前预检查触发限制: {limit_message}",
                             "limit_reached": True,
                             "pre_check": True,
-                        }
+                            "url": None,
+                        },
+                        200,
                     )
                 else:
-                    print(f"✅ [发布前预检查] 通过，可以继续发布到 {target_site_name}")
+                    gate_passed_downloader_id = downloader_id
+                    logging.debug("✅ [发布前预检查] 通过，可以继续发布到 %s", target_site_name)
             except Exception as e:
-                print(f"⚠️ [发布前预检查] 检查失败，继续执行: {e}")
+                logging.warning("⚠️ [发布前预检查] 检查失败，继续执行: %s", e)
 
         # 创建 TorrentMigrator 实例用于发布
+        from core.migrator import TorrentMigrator
         migrator = TorrentMigrator(
             source_info,
             target_info,
             search_term=context.get("source_torrent_id", ""),
-            save_path=upload_data.get("save_path", "") or upload_data.get("savePath", ""),
+            save_path=save_path or "",
             config_manager=config_manager,
             db_manager=db_manager,
         )
@@ -1818,392 +1892,312 @@ def migrate_publish():
         # 检查种子文件是否存在，如果不存在则重新下载
         # [核心修改] 优先在统一的 torrents 目录中查找
         source_torrent_id = context.get("source_torrent_id", "")
-        source_site_code = source_info.get("site", source_site_name.lower())
+        source_site_code = source_info.get("site", (source_site_name or "").lower())
 
         if original_torrent_path is None or not os.path.exists(original_torrent_path):
             logging.info("原始种子文件路径不存在，开始在统一目录中查找")
 
-            from config import TEMP_DIR
-
             torrents_dir = os.path.join(TEMP_DIR, "torrents")
+            found_path = None
 
-            # [新增] 首先在统一的 torrents 目录中查找以"站点-ID-"开头的种子文件
-            if os.path.exists(torrents_dir) and source_torrent_id:
+            # [新增] 首先在统一的 torrents 目录中查找以"站点-ID-"开头的种子文件，
+            # 其次是旧格式目录和任务缓存中的目录
+            if source_torrent_id:
                 prefix = f"{source_site_code}-{source_torrent_id}-"
-                logging.info(f"在统一目录中查找种子文件，前缀: {prefix}")
+                logging.info("在统一目录中查找种子文件，前缀: %s", prefix)
+                candidates = [
+                    ("统一目录", torrents_dir, prefix),
+                    (
+                        "旧格式临时目录",
+                        os.path.join(TEMP_DIR, f"torrent_{source_torrent_id}"),
+                        "",
+                    ),
+                ]
+                cached_torrent_dir = context.get("torrent_dir")
+                if cached_torrent_dir:
+                    candidates.append(("新格式临时目录", cached_torrent_dir, ""))
 
-                try:
-                    for file in os.listdir(torrents_dir):
-                        if file.startswith(prefix) and file.endswith(".torrent"):
-                            original_torrent_path = os.path.join(torrents_dir, file)
-                            logging.info(f"✅ 在统一目录中找到种子文件: {file}")
-                            break
-                except Exception as e:
-                    logging.warning(f"遍历统一目录时出错: {e}")
-
-            # 如果在统一目录中没找到，再检查旧格式目录
-            if (
-                original_torrent_path is None or not os.path.exists(original_torrent_path)
-            ) and source_torrent_id:
-                logging.info("统一目录中未找到，检查旧格式目录")
-                # 检查旧格式目录
-                old_torrent_dir = os.path.join(TEMP_DIR, f"torrent_{source_torrent_id}")
-                if os.path.exists(old_torrent_dir):
+                found_path, found_dir = _search_torrent_candidates(candidates)
+
+                # 最后按种子名称目录查找，需要查询种子名称，前面都未命中时才执行
+                if not found_path:
                     try:
-                        # 查找old_torrent_dir中的.torrent文件
-                        for file in os.listdir(old_torrent_dir):
-                            if file.endswith(".torrent"):
-                                original_torrent_path = os.path.join(old_torrent_dir, file)
-                                logging.info(
-                                    f"在旧格式临时目录中找到种子文件: {original_torrent_path}"
-                                )
-                                break
+                        seed_name = get_seed_name(db_manager, source_torrent_id, source_site_name)
                     except Exception as e:
-                        logging.warning(f"查找旧格式临时目录中的种子文件时出错: {e}")
+                        seed_name = None
+                        logging.warning("获取种子名称失败: %s", e)
+                    if seed_name:
+                        safe_filename_base = UNSAFE_FILENAME_RE.sub("_", seed_name).strip()
+                        found_path, found_dir = _search_torrent_candidates(
+                            [("种子名称目录", os.path.join(TEMP_DIR, safe_filename_base), "")]
+                        )
 
-                # 如果在旧格式目录中没找到，检查以种子名称命名的目录（新格式）
-                if original_torrent_path is None or not os.path.exists(original_torrent_path):
-                    # 尝试从缓存中获取种子目录路径
-                    cached_torrent_dir = context.get("torrent_dir")
-                    if cached_torrent_dir and os.path.exists(cached_torrent_dir):
-                        try:
-                            # 查找cached_torrent_dir中的.torrent文件
-                            for file in os.listdir(cached_torrent_dir):
-                                if file.endswith(".torrent"):
-                                    original_torrent_path = os.path.join(cached_torrent_dir, file)
-                                    logging.info(
-                                        f"在新格式临时目录中找到种子文件: {original_torrent_path}"
-                                    )
-                                    break
-                        except Exception as e:
-                            logging.warning(f"查找新格式临时目录中的种子文件时出错: {e}")
+                if found_path:
+                    torrent_dir = found_dir
+
+            if found_path:
+                original_torrent_path = found_path
+                _remember_task_torrent_path(task_id, original_torrent_path, torrent_dir)
+            else:
+                # 并发发布时，只允许一个线程负责下载/补齐原始 .torrent，避免同时写同一个文件导致损坏
+                with MIGRATION_TORRENT_FILE_LOCKS_LOCK:
+                    torrent_file_lock = MIGRATION_TORRENT_FILE_LOCKS.setdefault(
+                        task_id, threading.Lock()
+                    )
+
+                with torrent_file_lock:
+                    # 另一线程可能已经补齐/下载成功（写入方在释放本锁前已更新缓存）
+                    refreshed_context = MIGRATION_CACHE.get(task_id) or {}
+                    refreshed_path = refreshed_context.get("original_torrent_path")
+                    refreshed_dir = refreshed_context.get("torrent_dir")
+                    if refreshed_path and os.path.exists(refreshed_path):
+                        original_torrent_path = refreshed_path
+                        if refreshed_dir:
+                            torrent_dir = refreshed_dir
                     else:
-                        # 如果缓存中没有torrent_dir或目录不存在，尝试重构路径
-                        # 使用种子ID从数据库获取种子信息，然后重建目录路径
+                        logging.info("需要重新下载种子文件")
                         try:
-                            from models.seed_parameter import SeedParameter
-                            from flask import current_app
-
-                            db_manager = current_app.config["DB_MANAGER"]
-                            seed_param_model = SeedParameter(db_manager)
+                            scraper = _get_source_scraper(
+                                source_info.get("site", (source_site_name or "").lower())
+                            )
 
+                            SOURCE_BASE_URL = source_info.get("base_url", "").rstrip("/")
+                            if SOURCE_BASE_URL and not SOURCE_BASE_URL.startswith(
+                                ("http://", "https://")
+                            ):
+                                SOURCE_BASE_URL = "https://" + SOURCE_BASE_URL
+                            SOURCE_COOKIE = source_info.get("cookie", "")
                             source_torrent_id = context.get("source_torrent_id", "")
-                            source_site_name = context.get("source_site_name", "")
 
-                            if source_torrent_id and source_site_name:
-                                # 从数据库获取种子参数
-                                parameters = seed_param_model.get_parameters(
-                                    source_torrent_id, source_site_name
+                            if SOURCE_BASE_URL and SOURCE_COOKIE and source_torrent_id:
+                                source_headers = {
+                                    "Cookie": SOURCE_COOKIE,
+                                    "User-Agent": SOURCE_USER_AGENT,
+                                }
+                                response = scraper.get(
+                                    f"{SOURCE_BASE_URL}/details.php",
+                                    headers=source_headers,
+                                    params={"id": source_torrent_id, "hit": "1"},
+                                    timeout=180,
                                 )
-                                if parameters and parameters.get("title"):
-                                    # 重建种子目录路径
-                                    from config import TEMP_DIR
-                                    import re
-
-                                    original_main_title = parameters.get("title", "")
-                                    safe_filename_base = re.sub(
-                                        r'[\\/*?:"<>|]', "_", original_main_title
-                                    )[:150]
-                                    reconstructed_torrent_dir = os.path.join(
-                                        TEMP_DIR, safe_filename_base
+                                response.raise_for_status()
+                                response.encoding = "utf-8"
+                                details_html = response.text
+
+                                # 只需要一个 href，先用正则直接匹配，未命中再退回完整解析
+                                download_href = next(
+                                    (
+                                        html.unescape(m.group(1))
+                                        for m in DOWNLOAD_LINK_RE.finditer(details_html)
+                                        if m.group(2) == str(source_torrent_id)
+                                    ),
+                                    None,
+                                )
+                                if not download_href:
+                                    from bs4 import BeautifulSoup
+
+                                    soup = BeautifulSoup(details_html, "lxml")
+                                    download_link_tag = soup.select_one(
+                                        f'a.index[href^="download.php?id={source_torrent_id}"]'
                                     )
+                                    if download_link_tag:
+                                        download_href = download_link_tag["href"]
 
-                                    if os.path.exists(reconstructed_torrent_dir):
-                                        try:
-                                            # 查找reconstructed_torrent_dir中的.torrent文件
-                                            for file in os.listdir(reconstructed_torrent_dir):
-                                                if file.endswith(".torrent"):
-                                                    original_torrent_path = os.path.join(
-                                                        reconstructed_torrent_dir, file
-                                                    )
-                                                    logging.info(
-                                                        f"在重构的目录中找到种子文件: {original_torrent_path}"
-                                                    )
-                                                    break
-                                        except Exception as e:
-                                            logging.warning(f"查找重构目录中的种子文件时出错: {e}")
-                        except Exception as e:
-                            logging.warning(f"尝试重构种子目录路径时出错: {e}")
+                                if not download_href:
+                                    logging.error("未找到种子下载链接")
+                                    return (
+                                        {
+                                            "success": False,
+                                            "logs": "错误：未找到种子下载链接。",
+                                            "url": None,
+                                        },
+                                        500,
+                                    )
 
-            # 如果仍然没有找到，直接在TEMP_DIR中查找以种子名称命名的目录
-            if original_torrent_path is None or not os.path.exists(original_torrent_path):
-                try:
-                    # 从数据库获取种子参数来确定目录名
-                    from models.seed_parameter import SeedParameter
-                    from flask import current_app
+                                torrent_response = None
+                                try:
+                                    torrent_response = scraper.get(
+                                        f"{SOURCE_BASE_URL}/{download_href}",
+                                        headers=source_headers,
+                                        timeout=180,
+                                        stream=True,
+                                    )
+                                    torrent_response.raise_for_status()
 
-                    db_manager = current_app.config["DB_MANAGER"]
-                    seed_param_model = SeedParameter(db_manager)
+                                    content_disposition = torrent_response.headers.get(
+                                        "content-disposition"
+                                    )
+                                    torrent_filename = _content_disposition_filename(
+                                        content_disposition, "unknown.torrent"
+                                    )
 
-                    source_torrent_id = context.get("source_torrent_id", "")
-                    source_site_name = context.get("source_site_name", "")
+                                    torrent_dir = os.path.join(TEMP_DIR, "torrents")
+                                    os.makedirs(torrent_dir, exist_ok=True)
+                                    source_site_code = source_info.get(
+                                        "site", (source_site_name or "").lower()
+                                    )
 
-                    if source_torrent_id and source_site_name:
-                        # 从数据库获取种子参数
-                        parameters = seed_param_model.get_parameters(
-                            source_torrent_id, source_site_name
-                        )
-                        if parameters and parameters.get("title"):
-                            # 重建种子目录路径
-                            from config import TEMP_DIR
-                            import re
-
-                            original_main_title = parameters.get("title", "")
-                            safe_filename_base = re.sub(r'[\\/*?:"<>|]', "_", original_main_title)[
-                                :150
-                            ]
-                            seed_name_dir = os.path.join(TEMP_DIR, safe_filename_base)
-
-                            # 在该目录中查找.torrent文件
-                            if os.path.exists(seed_name_dir):
-                                for file in os.listdir(seed_name_dir):
-                                    if file.endswith(".torrent"):
-                                        original_torrent_path = os.path.join(seed_name_dir, file)
-                                        logging.info(
-                                            f"在种子名称目录中找到种子文件: {original_torrent_path}"
+                                    safe_filename = UNSAFE_FILENAME_RE.sub("_", torrent_filename)
+                                    encoded_filename = safe_filename.encode("utf-8")
+                                    if len(encoded_filename) > 255:
+                                        # 文件名主体是编码结果的前缀，直接截断已编码的字节即可
+                                        ext = os.path.splitext(safe_filename)[1]
+                                        max_len = 255 - len(ext.encode("utf-8"))
+                                        safe_filename = (
+                                            encoded_filename[:max_len].decode("utf-8", "ignore")
+                                            + ext
                                         )
-                                        break
-                except Exception as e:
-                    logging.warning(f"查找种子名称目录中的种子文件时出错: {e}")
-
-            # 如果仍然没有找到有效的种子文件，则重新下载
-            if original_torrent_path is None or not os.path.exists(original_torrent_path):
-                logging.info("需要重新下载种子文件")
-                # 重新下载种子文件
-                try:
-                    import cloudscraper
-                    import re
-                    from config import TEMP_DIR
-
-                    # 初始化scraper
-                    session = requests.Session()
-                    session.verify = False
-                    scraper = cloudscraper.create_scraper(sess=session)
-
-                    # 构造下载链接
-                    SOURCE_BASE_URL = source_info.get("base_url", "").rstrip("/")
-                    # 确保URL有正确的协议前缀
-                    if SOURCE_BASE_URL and not SOURCE_BASE_URL.startswith(("http://", "https://")):
-                        SOURCE_BASE_URL = "https://" + SOURCE_BASE_URL
-                    SOURCE_COOKIE = source_info.get("cookie", "")
-                    source_torrent_id = context.get("source_torrent_id", "")
-
-                    if SOURCE_BASE_URL and SOURCE_COOKIE and source_torrent_id:
-                        # 获取详情页以找到下载链接
-                        response = scraper.get(
-                            f"{SOURCE_BASE_URL}/details.php",
-                            headers={
-                                "Cookie": SOURCE_COOKIE,
-                                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/142.0.0.0 Safari/537.36",
-                            },
-                            params={"id": source_torrent_id, "hit": "1"},
-                            timeout=180,
-                        )
-                        response.raise_for_status()
-                        response.encoding = "utf-8"
-
-                        from bs4 import BeautifulSoup
-
-                        soup = BeautifulSoup(response.text, "html.parser")
-                        download_link_tag = soup.select_one(
-                            f'a.index[href^="download.php?id={source_torrent_id}"]'
-                        )
-
-                        if download_link_tag:
-                            # 下载种子文件
-                            torrent_response = scraper.get(
-                                f"{SOURCE_BASE_URL}/{download_link_tag['href']}",
-                                headers={
-                                    "Cookie": SOURCE_COOKIE,
-                                    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/142.0.0.0 Safari/537.36",
-                                },
-                                timeout=180,
-                            )
-                            torrent_response.raise_for_status()
 
-                            # 从响应头中尝试获取文件名
-                            content_disposition = torrent_response.headers.get(
-                                "content-disposition"
-                            )
-                            torrent_filename = "unknown.torrent"
-                            if content_disposition:
-                                # 尝试匹配filename*（支持UTF-8编码）和filename
-                                filename_match = re.search(
-                                    r'filename\*="?UTF-8\'\'([^"]+)"?',
-                                    content_disposition,
-                                    re.IGNORECASE,
-                                )
-                                if filename_match:
-                                    torrent_filename = filename_match.group(1)
-                                    # URL解码文件名（UTF-8编码）
-                                    torrent_filename = urllib.parse.unquote(
-                                        torrent_filename, encoding="utf-8"
+                                    prefixed_filename = (
+                                        f"{source_site_code}-{source_torrent_id}-{safe_filename}"
                                     )
-                                else:
-                                    # 尝试匹配普通的filename
-                                    filename_match = re.search(
-                                        r'filename="?([^"]+)"?', content_disposition
+                                    original_torrent_path = os.path.join(
+                                        torrent_dir, prefixed_filename
                                     )
-                                    if filename_match:
-                                        torrent_filename = filename_match.group(1)
-                                        # URL解码文件名
-                                        torrent_filename = urllib.parse.unquote(torrent_filename)
-
-                            # 使用统一的种子目录
-                            from config import TEMP_DIR
-
-                            torrent_dir = os.path.join(TEMP_DIR, "torrents")
-                            os.makedirs(torrent_dir, exist_ok=True)
-
-                            # 获取站点代码用于文件名前缀
-                            source_site_code = source_info.get("site", source_site_name.lower())
-
-                            # 保存种子文件，添加站点-ID-前缀
-                            try:
-                                # 对文件名进行文件系统安全的处理
-                                safe_filename = torrent_filename
-                                # 移除或替换文件系统不支持的字符
-                                safe_filename = re.sub(r'[<>:"/\\|?*]', "_", safe_filename)
-                                # 确保文件名不超过文件系统限制
-                                if len(safe_filename.encode("utf-8")) > 255:
-                                    # 如果文件名太长，截断并保持扩展名
-                                    name, ext = os.path.splitext(safe_filename)
-                                    max_len = 255 - len(ext.encode("utf-8"))
-                                    safe_filename = (
-                                        name.encode("utf-8")[:max_len].decode("utf-8", "ignore")
-                                        + ext
+                                    tmp_torrent_path = (
+                                        f"{original_torrent_path}.tmp-{uuid.uuid4().hex}"
                                     )
-
-                                # 添加站点-ID-前缀
-                                prefixed_filename = (
-                                    f"{source_site_code}-{source_torrent_id}-{safe_filename}"
-                                )
-                                original_torrent_path = os.path.join(
-                                    torrent_dir, prefixed_filename
-                                )
-                                with open(original_torrent_path, "wb") as f:
-                                    f.write(torrent_response.content)
-                                logging.info(f"种子文件已保存: {prefixed_filename}")
-                            except OSError as e:
-                                # 如果文件名有问题，使用默认名称
-                                logging.warning(f"使用原始文件名保存失败: {e}, 使用默认名称")
-                                prefixed_filename = (
-                                    f"{source_site_code}-{source_torrent_id}-torrent.torrent"
-                                )
-                                original_torrent_path = os.path.join(
-                                    torrent_dir, prefixed_filename
+                                    try:
+                                        with open(tmp_torrent_path, "wb") as f:
+                                            for chunk in torrent_response.iter_content(64 * 1024):
+                                                if chunk:
+                                                    f.write(chunk)
+                                        os.replace(tmp_torrent_path, original_torrent_path)
+                                        _index_torrent_path(
+                                            torrent_dir,
+                                            f"{source_site_code}-{source_torrent_id}-",
+                                            original_torrent_path,
+                                        )
+                                    finally:
+                                        # 成功时临时文件已被 os.replace 移走，直接删除并忽略不存在
+                                        try:
+                                            os.remove(tmp_torrent_path)
+                                        except OSError:
+                                            pass
+                                    logging.info("重新下载种子文件成功: %s", original_torrent_path)
+                                    # 在释放文件锁前更新缓存，供其它线程复用
+                                    _remember_task_torrent_path(
+                                        task_id, original_torrent_path, torrent_dir
+                                    )
+                                finally:
+                                    if torrent_response is not None:
+                                        torrent_response.close()
+                            else:
+                                logging.error("缺少必要信息，无法重新下载种子")
+                                return (
+                                    {
+                                        "success": False,
+                                        "logs": "错误：缺少必要信息，无法重新下载种子。",
+                                        "url": None,
+                                    },
+                                    500,
                                 )
-                                with open(original_torrent_path, "wb") as f:
-                                    f.write(torrent_response.content)
-
-                            logging.info(f"重新下载种子文件成功: {original_torrent_path}")
-                        else:
-                            logging.error("未找到种子下载链接")
+                        except Exception as e:
+                            logging.error("重新下载种子文件失败: %s", e, exc_info=True)
                             return (
-                                jsonify({"success": False, "logs": "错误：未找到种子下载链接。"}),
-                                404,
+                                {
+                                    "success": False,
+                                    "logs": f"错误：重新下载种子文件失败: {e}",
+                                    "url": None,
+                                },
+                                500,
                             )
-                    else:
-                        logging.error("缺少必要的源站点信息")
-                        return (
-                            jsonify({"success": False, "logs": "错误：缺少必要的源站点信息。"}),
-                            400,
-                        )
-                except Exception as e:
-                    logging.error(f"重新下载种子文件失败: {e}")
-                    return jsonify({"success": False, "logs": f"重新下载种子文件失败: {e}"}), 500
 
-        # 1. 直接使用原始种子文件路径进行发布（不再修改种子）
         if not original_torrent_path or not os.path.exists(original_torrent_path):
             raise Exception("原始种子文件路径无效或文件不存在。")
 
-        # 2. 发布 (传递 torrent_dir 给上传器)
         upload_data["torrent_dir"] = torrent_dir  # 确保上传器能获取到 torrent_dir
         result = migrator.publish_prepared_torrent(upload_data, original_torrent_path)
 
         # 3. 如果发布成功，自动添加到下载器
         if result.get("success") and result.get("url"):
-            auto_add = data.get("auto_add_to_downloader", True)  # 默认自动添加
-            print(f"[下载器添加] 发布成功, auto_add={auto_add}, url={result.get('url')}")
-
-            if auto_add:
-                # 先获取配置的默认下载器
-                config = config_manager.get()
-                default_downloader = config.get("cross_seed", {}).get("default_downloader")
-
-                # 从请求中获取下载器ID和保存路径
-                downloader_id = data.get("downloaderId") or data.get("downloader_id")
-                save_path = upload_data.get("save_path") or upload_data.get("savePath")
-                print(
-                    f"[下载器添加] 初始参数: downloader_id={downloader_id}, save_path={save_path}"
-                )
-                print(f"[下载器添加] 配置的默认下载器: {default_downloader}")
+            config = config_manager.get()
+            cross_seed_cfg = config.get("cross_seed", {}) or {}
+            auto_add = _to_bool(data.get("auto_add_to_downloader", True), True)
+            auto_add_existing_to_downloader = _to_bool(
+                data.get(
+                    "auto_add_existing_to_downloader",
+                    cross_seed_cfg.get("auto_add_existing_to_downloader", True),
+                ),
+                bool(cross_seed_cfg.get("auto_add_existing_to_downloader", True)),
+            )
+            is_existing_torrent = _is_existing_torrent_publish_result(result)
+            logging.debug(
+                "[下载器添加] 发布成功, auto_add=%s, url=%s", auto_add, result.get("url")
+            )
+            logging.debug(
+                "[下载器添加] 已存在种子判定=%s, 已存在是否自动添加=%s",
+                is_existing_torrent,
+                auto_add_existing_to_downloader,
+            )
 
-                # 判断逻辑:
-                # 1. 如果配置了具体的默认下载器(非空非None),使用它
-                # 2. 如果配置为空或"使用源种子下载器",则从数据库查询源种子的下载器
-                # 3. 无论哪种情况,如果缺少save_path,都尝试从数据库获取
+            if auto_add and (auto_add_existing_to_downloader or not is_existing_torrent):
+                default_downloader = cross_seed_cfg.get("default_downloader")
+
+                logging.debug(
+                    "[下载器添加] 初始参数: downloader_id=%s, save_path=%s", downloader_id, save_path
+                )
+                logging.debug("[下载器添加] 配置的默认下载器: %s", default_downloader)
 
                 if default_downloader and default_downloader != "":
-                    # 配置了具体的下载器,使用配置的下载器
                     downloader_id = default_downloader
-                    print(f"[下载器添加] 使用配置的默认下载器: {downloader_id}")
+                    logging.debug("[下载器添加] 使用配置的默认下载器: %s", downloader_id)
 
-                    # 如果没有save_path,尝试从数据库获取源种子的save_path
                     if not save_path:
-                        print(f"[下载器添加] 缺少save_path,从数据库获取源种子的保存路径")
+                        logging.debug("[下载器添加] 缺少save_path,从数据库获取源种子的保存路径")
                         source_torrent_id = context.get("source_torrent_id")
                         if source_torrent_id and source_site_name:
-                            torrent_name = get_seed_name(
-                                db_manager, source_torrent_id, source_site_name
+                            torrent_info = _get_source_torrent_info(
+                                db_manager, task_id, source_torrent_id, source_site_name
                             )
-                            torrent_info = get_current_torrent_info(db_manager, torrent_name)
                             if torrent_info and torrent_info.get("save_path"):
                                 save_path = torrent_info["save_path"]
-                                print(f"[下载器添加] 从数据库获取到保存路径: {save_path}")
+                                logging.debug("[下载器添加] 从数据库获取到保存路径: %s", save_path)
                             else:
-                                print(f"[下载器添加] 数据库中未找到保存路径")
+                                logging.debug("[下载器添加] 数据库中未找到保存路径")
                 else:
-                    # 配置为"使用源种子所在的下载器"或未配置
-                    # 尝试从数据库查询原始种子的下载器和保存路径
-                    print(f"[下载器添加] 配置为使用源种子下载器,从数据库查询")
+                    logging.debug("[下载器添加] 配置为使用源种子下载器,从数据库查询")
                     source_torrent_id = context.get("source_torrent_id")
                     if source_torrent_id and source_site_name:
-                        torrent_name = get_seed_name(
-                            db_manager, source_torrent_id, source_site_name
+                        torrent_info = _get_source_torrent_info(
+                            db_manager, task_id, source_torrent_id, source_site_name
                         )
-                        torrent_info = get_current_torrent_info(db_manager, torrent_name)
                         if torrent_info:
                             downloader_id = torrent_info.get("downloader_id")
                             if not save_path and torrent_info.get("save_path"):
                                 save_path = torrent_info["save_path"]
-                                print(f"[下载器添加] 从数据库获取到保存路径: {save_path}")
-                            print(f"[下载器添加] 从数据库获取到源种子的下载器ID: {downloader_id}")
+                                logging.debug("[下载器添加] 从数据库获取到保存路径: %s", save_path)
+                            logging.debug("[下载器添加] 从数据库获取到源种子的下载器ID: %s", downloader_id)
                         else:
-                            print(f"[下载器添加] 数据库中未找到源种子信息")
+                            logging.debug("[下载器添加] 数据库中未找到源种子信息")
 
                     if not downloader_id:
-                        print(f"[下载器添加] 未找到源种子的下载器信息")
+                        logging.debug("[下载器添加] 未找到源种子的下载器信息")
 
-                # 调用添加到下载器
                 if save_path and downloader_id:
                     try:
-                        print(
-                            f"[下载器添加] 准备同步添加到下载器: URL={result['url']}, Path={save_path}, DownloaderID={downloader_id}"
+                        logging.debug(
+                            "[下载器添加] 准备同步添加到下载器: URL=%s, Path=%s, DownloaderID=%s",
+                            result["url"],
+                            save_path,
+                            downloader_id,
                         )
-                        print(f"[下载器添加] 结果详情: {result}")
-                        print(
-                            f"[下载器添加] 直接下载链接: {result.get('direct_download_url', 'None')}"
+                        logging.debug("[下载器添加] 结果详情: %s", result)
+                        logging.debug(
+                            "[下载器添加] 直接下载链接: %s",
+                            result.get("direct_download_url", "None"),
                         )
 
-                        # 🚫 发布前预检查发种限制
                         try:
-                            from .internal_guard import check_downloader_gate
-
-                            can_continue, limit_message = check_downloader_gate(downloader_id)
+                            if downloader_id == gate_passed_downloader_id:
+                                can_continue, limit_message = True, ""
+                            else:
+                                can_continue, limit_message = check_downloader_gate_cached(
+                                    downloader_id
+                                )
 
                             if not can_continue:
-                                print(f"🚫 [下载器添加] 发布前预检查触发限制: {limit_message}")
+                                logging.warning("🚫 [下载器添加] 发布前预检查触发限制: %s", limit_message)
                                 result["auto_add_result"] = {
                                     "success": False,
                                     "message": limit_message,
@@ -2212,13 +2206,12 @@ def migrate_publish():
                                     "limit_reached": True,
                                     "pre_check": True,
                                 }
-                                return jsonify(result)
+                                return result, 200
                             else:
-                                print(f"✅ [下载器添加] 发布前预检查通过，可以继续添加")
+                                logging.debug("✅ [下载器添加] 发布前预检查通过，可以继续添加")
                         except Exception as e:
-                            print(f"⚠️ [下载器添加] 发布前预检查失败，继续执行: {e}")
+                            logging.warning("⚠️ [下载器添加] 发布前预检查失败，继续执行: %s", e)
 
-                        # 同步调用 add_torrent_to_downloader 函数
                         success, message = add_torrent_to_downloader(
                             detail_page_url=result["url"],
                             save_path=save_path,
@@ -2228,29 +2221,18 @@ def migrate_publish():
                             direct_download_url=result.get("direct_download_url"),
                         )
 
-                        # 检查是否触发发种限制
                         limit_reached = success == "LIMIT_REACHED"
 
                         result["auto_add_result"] = {
-                            "success": not limit_reached,  # 限制触发时视为失败
+                            "success": not limit_reached,
                             "message": message,
                             "sync": True,
                             "downloader_id": downloader_id if not limit_reached else None,
                             "limit_reached": limit_reached,
                         }
 
-                        if not limit_reached and success:
-                            print(f"✅ [下载器添加] 同步添加成功: {message}")
-                        elif limit_reached:
-                            print(f"🚫 [下载器添加] 同步添加被限制: {message}")
-                        else:
-                            print(f"❌ [下载器添加] 同步添加失败: {message}")
-
                     except Exception as e:
-                        print(f"❌ [下载器添加] 同步添加异常: {e}")
-                        import traceback
-
-                        traceback.print_exc()
+                        logging.error("❌ [下载器添加] 同步添加异常: %s", e, exc_info=True)
                         result["auto_add_result"] = {
                             "success": False,
                             "message": f"添加到下载器失败: {str(e)}",
@@ -2261,147 +2243,82 @@ def migrate_publish():
                         missing.append("save_path")
                     if not downloader_id:
                         missing.append("downloader_id")
-                    print(f"⚠️ [下载器添加] 跳过: 缺少参数 {', '.join(missing)}")
+                    logging.warning("⚠️ [下载器添加] 跳过: 缺少参数 %s", ", ".join(missing))
                     result["auto_add_result"] = {
                         "success": False,
                         "message": f"缺少必要参数: {', '.join(missing)}",
                     }
             else:
-                print(f"[下载器添加] auto_add=False, 跳过自动添加")
-        else:
-            if not result.get("success"):
-                print(f"[下载器添加] 发布失败,跳过下载器添加")
-            elif not result.get("url"):
-                print(f"[下载器添加] 发布成功但未返回URL,跳过下载器添加")
+                if not auto_add:
+                    logging.debug("[下载器添加] auto_add=False, 跳过自动添加")
+                elif is_existing_torrent and not auto_add_existing_to_downloader:
+                    logging.debug("[下载器添加] 检测到目标站点种子已存在，按设置跳过自动添加")
+                else:
+                    logging.debug("[下载器添加] 跳过自动添加（原因未知）")
 
-        # 处理批量转种记录 - 创建 batch_enhance_records 表记录
+        # 处理批量转种记录（Go 端批量转种调用 /api/migrate/publish 时会传 batch_id）
         batch_id = data.get("batch_id")  # Go端传递的批次ID
-        print(f"\n{'='*80}")
-        print(f"[批量转种记录] 检测到batch_id参数: {batch_id}")
-
         if batch_id:
             try:
-                # 从 context 中获取种子信息
                 source_torrent_id = context.get("source_torrent_id")
-                print(
-                    f"[批量转种记录] 种子信息: torrent_id={source_torrent_id}, source_site={source_site_name}, target_site={target_site_name}"
-                )
-
                 if source_torrent_id and source_site_name and target_site_name:
-                    # [修复] 从数据库获取种子标题
-                    seed_title = "未知标题"
-                    try:
-                        from models.seed_parameter import SeedParameter
-
-                        seed_param_model = SeedParameter(db_manager)
-                        seed_parameters = seed_param_model.get_parameters(
-                            source_torrent_id, source_site_name
-                        )
-                        if seed_parameters and seed_parameters.get("title"):
-                            seed_title = seed_parameters.get("title")
-                            print(f"[批量转种记录] 从数据库获取到种子标题: {seed_title}")
-                        else:
-                            print(f"[批量转种记录] ⚠️ 数据库中未找到种子标题，使用默认值")
-                    except Exception as e:
-                        print(f"[批量转种记录] ⚠️ 查询种子标题失败: {e}")
-
-                    conn = db_manager._get_connection()
-                    cursor = db_manager._get_cursor(conn)
+                    # 与种子名称共用 seed_parameters 的缓存查询，不再单独读取整行参数
+                    seed_title = (
+                        get_seed_title(db_manager, source_torrent_id, source_site_name)
+                        or "未知标题"
+                    )
 
-                    # 准备记录数据
-                    video_size_gb = data.get("video_size_gb")  # Go端可能传递的视频大小
+                    video_size_gb = data.get("video_size_gb")
+                    progress = data.get("batch_progress")
                     status = "success" if result.get("success") else "failed"
                     success_url = result.get("url") if result.get("success") else None
                     error_detail = result.get("logs") if not result.get("success") else None
+                    downloader_add_result = None
+                    if result.get("auto_add_result"):
+                        try:
+                            downloader_add_result = orjson.dumps(
+                                result.get("auto_add_result")
+                            ).decode("utf-8")
+                        except Exception:
+                            downloader_add_result = str(result.get("auto_add_result"))
 
-                    print(
-                        f"[批量转种记录] 发布结果: status={status}, success_url={success_url}, video_size_gb={video_size_gb}"
-                    )
+                    source_site_for_record = data.get("nickname") or source_site_name
 
-                    # 生成下载器添加结果文本
-                    downloader_result = None
-                    if "auto_add_result" in result:
-                        auto_result = result["auto_add_result"]
-                        print(f"[批量转种记录] 下载器添加结果: {auto_result}")
-                        if auto_result["success"]:
-                            downloader_result = f"成功: {auto_result['message']}"
-                        else:
-                            downloader_result = f"失败: {auto_result['message']}"
-                    else:
-                        print(f"[批量转种记录] ⚠️ 未找到auto_add_result字段")
-                        print(f"[批量转种记录] result所有键: {list(result.keys())}")
-                        print(f"[批量转种记录] result完整内容: {result}")
-
-                    print(f"[批量转种记录] 准备写入数据库: downloader_result={downloader_result}")
-
-                    # 直接插入记录(发布的种子不会先被Go端插入,只有过滤的种子才会)
-                    if db_manager.db_type == "mysql":
-                        insert_sql = """INSERT INTO batch_enhance_records
-                                      (batch_id, title, torrent_id, source_site, target_site, progress, video_size_gb, status, success_url, error_detail, downloader_add_result)
-                                      VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)"""
-                    elif db_manager.db_type == "postgresql":
-                        insert_sql = """INSERT INTO batch_enhance_records
-                                      (batch_id, title, torrent_id, source_site, target_site, progress, video_size_gb, status, success_url, error_detail, downloader_add_result)
-                                      VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)"""
-                    else:  # sqlite
-                        insert_sql = """INSERT INTO batch_enhance_records
-                                      (batch_id, title, torrent_id, source_site, target_site, progress, video_size_gb, status, success_url, error_detail, downloader_add_result)
-                                      VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"""
-
-                    print(
-                        f"[批量转种记录] 执行SQL插入: batch_id={batch_id}, torrent_id={source_torrent_id}, title={seed_title}"
-                    )
-                    cursor.execute(
-                        insert_sql,
+                    # 入队后由后台线程批量写入，不在发布请求路径上占用数据库连接
+                    _enqueue_batch_enhance_record(
+                        db_manager,
                         (
                             batch_id,
                             seed_title,
                             source_torrent_id,
-                            data.get("nickname", source_site_name),
+                            source_site_for_record,
                             target_site_name,
-                            data.get("batch_progress"),
+                            progress,
                             video_size_gb,
                             status,
                             success_url,
                             error_detail,
-                            downloader_result,
+                            downloader_add_result,
                         ),
                     )
-                    conn.commit()
-                    cursor.close()
-                    conn.close()
-
-                    print(
-                        f"✅ [批量转种记录] 成功写入数据库: {source_torrent_id} -> {target_site_name}"
-                    )
-                    print(f"   状态: {status}")
-                    print(f"   下载器结果: {downloader_result}")
-                else:
-                    print(f"❌ [批量转种记录] 缺少必要的种子信息:")
-                    print(f"   torrent_id={source_torrent_id}")
-                    print(f"   source_site={source_site_name}")
-                    print(f"   target_site={target_site_name}")
-
-            except Exception as e:
-                print(f"❌ [批量转种记录] 记录时出错: {e}")
-                import traceback
-
-                traceback.print_exc()
-        else:
-            print(f"[批量转种记录] 未检测到batch_id参数,跳过记录到batch_enhance_records表")
-
-        print(f"{'='*80}\n")
+            except Exception:
+                pass
 
-        return jsonify(result)
+        return result, 200
 
     except Exception as e:
-        logging.error(f"migrate_publish to {target_site_name} 发生意外错误: {e}", exc_info=True)
-        return jsonify({"success": False, "logs": f"服务器内部错误: {e}", "url": None}), 500
+        logging.error("migrate_publish to %s 发生意外错误: %s", target_site_name, e, exc_info=True)
+        return {"success": False, "logs": f"服务器内部错误: {e}", "url": None}, 500
     finally:
         if migrator:
             migrator.cleanup()
-        # 注意：此处不删除 MIGRATION_CACHE[task_id]，因为它可能被用于发布到其他站点。
-        # 建议设置一个独立的定时任务来清理过期的缓存。
+
+
+@migrate_bp.route("/migrate/publish", methods=["POST"])
+def migrate_publish():
+    # 新实现：委托给可复用的核心逻辑，便于批量并发发布使用。
+    result, status_code = _migrate_publish_impl(migrate_bp.db_manager, request.json)
+    return jsonify(result), status_code
 
 
 # ===================================================================
@@ -2410,10 +2327,19 @@ def migrate_publish():
 
 BATCH_PUBLISH_TASKS = {}
 BATCH_PUBLISH_LOCK = threading.Lock()
+# 批量任务表只保留最近的若干个已结束任务，避免长期运行时无限增长
+BATCH_TASKS_KEEP_FINISHED = 50
 BATCH_PUBLISH_MAX_CONCURRENCY = 200
 BATCH_PUBLISH_DEFAULT_CONCURRENCY = 5
 
 
+def _prune_finished_batch_tasks(tasks: dict, keep: int = BATCH_TASKS_KEEP_FINISHED):
+    """按创建顺序移除最早的已结束任务，只保留最近 keep 个，运行中的任务不受影响。"""
+    finished = [task_id for task_id, task in list(tasks.items()) if not task.get("isRunning")]
+    for task_id in finished[: max(0, len(finished) - keep)]:
+        tasks.pop(task_id, None)
+
+
 def _batch_publish_emit_event(batch_id: str, payload: dict):
     stream = log_streamer.get_stream(batch_id)
     if not stream:
@@ -2688,6 +2614,7 @@ def migrate_publish_batch_start():
     batch_id = str(uuid.uuid4())
 
     with BATCH_PUBLISH_LOCK:
+        _prune_finished_batch_tasks(BATCH_PUBLISH_TASKS)
         BATCH_PUBLISH_TASKS[batch_id] = {
             "batch_id": batch_id,
             "task_id": task_id,
@@ -2840,6 +2767,7 @@ def migrate_torrent():
                 404,
             )
 
+        from core.migrator import TorrentMigrator
         migrator = TorrentMigrator(
             source_info,
             target_info,
@@ -3034,8 +2962,7 @@ def get_downloader_info():
         return jsonify({"success": False, "message": "缺少必要参数: torrent_id 或 site_name"}), 400
 
     try:
-        torrent_name = get_seed_name(db_manager, torrent_id, site_name)
-        torrent_info = get_current_torrent_info(db_manager, torrent_name)
+        torrent_info = get_current_torrent_info_by_seed(db_manager, torrent_id, site_name)
 
         if torrent_info:
             return jsonify(
@@ -3257,17 +3184,9 @@ def update_preview_data():
                 "色深",
                 "音频编码",
             ]
-            title_parts = []
-            for key in order:
-                value = title_params.get(key)
-                if value:
-                    title_parts.append(
-                        " ".join(map(str, value)) if isinstance(value, list) else str(value)
-                    )
-
-            raw_main_part = " ".join(filter(None, title_parts))
-            main_part = re.sub(r"(?<!\d)\.(?!\d)", " ", raw_main_part)
-            main_part = re.sub(r"\s+", " ", main_part).strip()
+            raw_main_part = _join_title_parts(title_params, order)
+            main_part = TITLE_DOT_RE.sub(" ", raw_main_part)
+            main_part = WHITESPACE_RE.sub(" ", main_part).strip()
             release_group = title_params.get("制作组", "NOGROUP")
             if "N/A" in release_group:
                 release_group = "NOGROUP"
@@ -3320,10 +3239,10 @@ def update_preview_data():
             mock_soup = BeautifulSoup(mock_html, "html.parser")
 
             # 初始化提取器
-            from core.extractors.extractor import Extractor, ParameterMapper
+            from core.extractors.extractor import Extractor
 
             extractor = Extractor()
-            mapper = ParameterMapper()
+            mapper = _get_parameter_mapper()
 
             # 创建提取数据结构，模拟从网页提取的数据
             extracted_data = {
@@ -3339,8 +3258,6 @@ def update_preview_data():
             standardized_params = mapper.map_parameters(source_site_name, "", extracted_data)
 
             # 保存参数到文件用于调试
-            import os
-
             tmp_dir = "data/tmp"
             os.makedirs(tmp_dir, exist_ok=True)
 
@@ -3571,6 +3488,7 @@ def batch_fetch_seed_data():
         task_id = str(uuid.uuid4())
 
         # 初始化任务进度
+        _prune_finished_batch_tasks(BATCH_FETCH_TASKS)
         BATCH_FETCH_TASKS[task_id] = {
             "total": len(torrent_names),
             "processed": 0,
@@ -3600,9 +3518,6 @@ def batch_fetch_seed_data():
 
 def _process_batch_fetch(task_id, torrent_names, source_sites_priority, db_manager, config_manager):
     """后台处理批量获取任务"""
-    import time
-    import re
-
     # 记录每个站点的最后请求时间，用于控制请求间隔
     site_last_request_time = {}
     # 默认请求间隔（秒）
@@ -3612,11 +3527,11 @@ def _process_batch_fetch(task_id, torrent_names, source_sites_priority, db_manag
         def extract_torrent_id(comment: str):
             if not comment:
                 return None
-            id_match = re.search(r"id=(\d+)", comment)
+            id_match = COMMENT_TORRENT_ID_RE.search(comment)
             if id_match:
                 return id_match.group(1)
             stripped = comment.strip()
-            if re.fullmatch(r"\d+", stripped):
+            if DIGITS_RE.fullmatch(stripped):
                 return stripped
             return None
 
@@ -3923,16 +3838,7 @@ def _process_batch_fetch(task_id, torrent_names, source_sites_priority, db_manag
                             if torrent.get("sites") == site_name:
                                 # 提取种子ID
                                 comment = torrent.get("details", "")
-                                torrent_id = None
-                                if comment:
-                                    # 尝试从comment中提取ID
-                                    import re
-
-                                    id_match = re.search(r"id=(\d+)", comment)
-                                    if id_match:
-                                        torrent_id = id_match.group(1)
-                                    elif re.match(r"^\d+$", comment.strip()):
-                                        torrent_id = comment.strip()
+                                torrent_id = extract_torrent_id(comment)
                                 if torrent_id:
                                     source_found = {
                                         "site": site_name,
@@ -3973,15 +3879,7 @@ def _process_batch_fetch(task_id, torrent_names, source_sites_priority, db_manag
                     for torrent in torrents:
                         if torrent.get("sites") == priority_site:
                             comment = torrent.get("details", "")
-                            torrent_id = None
-                            if comment:
-                                import re
-
-                                id_match = re.search(r"id=(\d+)", comment)
-                                if id_match:
-                                    torrent_id = id_match.group(1)
-                                elif re.match(r"^\d+$", comment.strip()):
-                                    torrent_id = comment.strip()
+                            torrent_id = extract_torrent_id(comment)
 
                             if torrent_id:
                                 all_available_sites.append(
@@ -4030,15 +3928,7 @@ def _process_batch_fetch(task_id, torrent_names, source_sites_priority, db_manag
                 for site_name, torrent, source_info, _ in sorted_sites:
                     # 提取种子ID
                     comment = torrent.get("details", "")
-                    torrent_id = None
-                    if comment:
-                        import re
-
-                        id_match = re.search(r"id=(\d+)", comment)
-                        if id_match:
-                            torrent_id = id_match.group(1)
-                        elif re.match(r"^\d+$", comment.strip()):
-                            torrent_id = comment.strip()
+                    torrent_id = extract_torrent_id(comment)
 
                     if torrent_id:
                         all_available_sites.append(
@@ -4091,6 +3981,7 @@ def _process_batch_fetch(task_id, torrent_names, source_sites_priority, db_manag
                             migrator = None
                             try:
                                 # 初始化TorrentMigrator
+                                from core.migrator import TorrentMigrator
                                 migrator = TorrentMigrator(
                                     source_site_info=site_attempt["site_info"],
                                     target_site_info=None,
@@ -4,7 +4,7 @@ import os
 import json
 import logging
 import sys
-import copy
+import threading
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -51,6 +51,9 @@ os.makedirs(DATA_DIR, exist_ok=True)
 TEMP_DIR = os.path.join(DATA_DIR, "tmp")
 os.makedirs(TEMP_DIR, exist_ok=True)
 
+# 临时目录位于网络挂载（NFS/SMB 等）时开启，发布时并发检查多个候选种子目录
+PARALLEL_TORRENT_SEARCH = os.getenv("PARALLEL_TORRENT_SEARCH", "false").lower() == "true"
+
 CONFIG_FILE = os.path.join(DATA_DIR, "config.json")
 
 
@@ -59,6 +62,7 @@ class ConfigManager:
 
     def __init__(self):
         self._config = {}
+        self._lock = threading.RLock()
         self.load()
 
     def _get_default_config(self):
@@ -282,29 +286,60 @@ class ConfigManager:
         """返回当前缓存的配置。"""
         return self._config
 
+    def _write(self, config_data):
+        """将配置写入 config.json，不修改传入的字典。"""
+        # 仅复制需要脱敏的 cookiecloud 部分，避免深拷贝整个配置
+        config_to_save = dict(config_data)
+
+        # 从内存中移除 CookieCloud 的端到端密码，避免写入文件
+        cookiecloud = config_to_save.get("cookiecloud")
+        if isinstance(cookiecloud, dict) and cookiecloud.get("e2e_password"):
+            # 如果用户在UI中输入了密码，我们不希望它被保存
+            config_to_save["cookiecloud"] = {**cookiecloud, "e2e_password": ""}
+
+        with open(CONFIG_FILE, "w", encoding="utf-8") as f:
+            json.dump(config_to_save, f, ensure_ascii=False, indent=4)
+
     def save(self, config_data):
         """将配置字典保存到 config.json 文件并更新缓存。"""
         logging.info(f"正在将新配置保存到 {CONFIG_FILE}。")
         try:
-            # 深拷贝以避免意外修改内存中的配置
-            config_to_save = copy.deepcopy(config_data)
-
-            # 从内存中移除 CookieCloud 的端到端密码，避免写入文件
-            if "cookiecloud" in config_to_save and "e2e_password" in config_to_save["cookiecloud"]:
-                # 如果用户在UI中输入了密码，我们不希望它被保存
-                if config_to_save["cookiecloud"]["e2e_password"]:
-                    config_to_save["cookiecloud"]["e2e_password"] = ""
+            with self._lock:
+                self._write(config_data)
+                self._config = config_data
+            return True
+        except IOError as e:
+            logging.error(f"无法写入配置到 {CONFIG_FILE}: {e}")
+            return False
 
-            with open(CONFIG_FILE, "w", encoding="utf-8") as f:
-                json.dump(config_to_save, f, ensure_ascii=False, indent=4)
+    def update(self, section, values):
+        """将 values 合并到配置的 section 部分并写入文件，只序列化一次。
 
-            self._config = config_data
+        基于内存中的缓存配置合并，无需重新读取；写入成功后才替换缓存。
+        """
+        logging.info(f"正在更新配置 {section} 部分并保存到 {CONFIG_FILE}。")
+        try:
+            with self._lock:
+                merged_section = dict(self._config.get(section) or {})
+                merged_section.update(values)
+                new_config = {**self._config, section: merged_section}
+                self._write(new_config)
+                self._config = new_config
             return True
         except IOError as e:
             logging.error(f"无法写入配置到 {CONFIG_FILE}: {e}")
             return False
 
 
+def _get_db_pool_size():
+    """读取 DB_POOL_SIZE 环境变量（MySQL/PostgreSQL 空闲连接池大小，0 表示禁用）。"""
+    try:
+        return max(0, int(os.getenv("DB_POOL_SIZE", 5)))
+    except ValueError:
+        logging.warning(f"DB_POOL_SIZE ('{os.getenv('DB_POOL_SIZE')}') 不是有效的整数，使用默认值 5。")
+        return 5
+
+
 # ... (文件其余部分 get_db_config 和 config_manager 实例保持不变) ...
 def get_db_config():
     """根据环境变量 DB_TYPE 显式选择数据库。"""
@@ -328,7 +363,7 @@ def get_db_config():
             logging.error(f"关键错误: MYSQL_PORT ('{mysql_config['port']}') 不是一个有效的整数！")
             sys.exit(1)
         logging.info("MySQL 配置验证通过。")
-        return {"db_type": "mysql", "mysql": mysql_config}
+        return {"db_type": "mysql", "mysql": mysql_config, "pool_size": _get_db_pool_size()}
 
     elif db_choice == "postgresql":
         logging.info("数据库类型选择为 PostgreSQL。正在检查相关环境变量...")
@@ -350,7 +385,11 @@ def get_db_config():
             )
             sys.exit(1)
         logging.info("PostgreSQL 配置验证通过。")
-        return {"db_type": "postgresql", "postgresql": postgresql_config}
+        return {
+            "db_type": "postgresql",
+            "postgresql": postgresql_config,
+            "pool_size": _get_db_pool_size(),
+        }
 
     elif db_choice == "sqlite":
         logging.info("数据库类型选择为 SQLite。")
@@ -6,6 +6,9 @@ import mysql.connector
 import psycopg2
 import json
 import os
+import queue
+import threading
+import time
 from datetime import datetime
 from psycopg2.extras import RealDictCursor
 
@@ -24,9 +27,76 @@ from core.services import _prepare_api_config
 from database_migrations import DatabaseMigrationManager
 
 
+class _PooledConnection:
+    """连接池中连接的代理：close() 时归还连接池而不是真正断开。"""
+
+    __slots__ = ("_conn", "_pool")
+
+    def __init__(self, conn, pool):
+        self._conn = conn
+        self._pool = pool
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def close(self):
+        conn, self._conn = self._conn, None
+        # 允许重复 close，只有第一次会归还连接
+        if conn is not None:
+            self._pool.release(conn)
+
+
+class _ConnectionPool:
+    """MySQL/PostgreSQL 连接池，复用空闲连接以省去每次请求的建连开销。
+
+    只限制空闲连接数量，不限制并发借出的连接数，池空时直接新建连接，
+    避免嵌套获取连接的代码在池耗尽时互相等待。
+    """
+
+    # 空闲超过该秒数的连接直接丢弃，避免使用已被服务端断开的连接
+    IDLE_TIMEOUT = 300
+
+    def __init__(self, connect, size, is_alive):
+        self._connect = connect
+        self._is_alive = is_alive
+        self._idle = queue.LifoQueue(maxsize=size)
+
+    def acquire(self):
+        while True:
+            try:
+                conn, released_at = self._idle.get_nowait()
+            except queue.Empty:
+                return _PooledConnection(self._connect(), self)
+            if (time.monotonic() - released_at < self.IDLE_TIMEOUT
+                    and self._is_alive(conn)):
+                return _PooledConnection(conn, self)
+            self._discard(conn)
+
+    def release(self, conn):
+        try:
+            # 回滚未提交的事务，保证下一个使用者拿到干净的连接
+            conn.rollback()
+            self._idle.put_nowait((conn, time.monotonic()))
+        except queue.Full:
+            self._discard(conn)
+        except Exception as e:
+            logging.debug(f"归还数据库连接失败，已丢弃: {e}")
+            self._discard(conn)
+
+    @staticmethod
+    def _discard(conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+
 class DatabaseManager:
     """处理与配置的数据库（MySQL、PostgreSQL 或 SQLite）的所有交互。"""
 
+    # 站点信息缓存的有效期（秒），站点增删改时会主动清空
+    SITE_CACHE_TTL = 30
+
     def __init__(self, config):
         """根据提供的配置初始化 DatabaseManager。"""
         self.db_type = config.get("db_type", "sqlite")
@@ -44,6 +114,25 @@ class DatabaseManager:
             self.sqlite_path = config.get("path", "data/pt_stats.db")
             logging.info(f"数据库后端设置为 SQLite。路径: {self.sqlite_path}")
             # SQLite 会自动创建文件，无需额外处理
+            # WAL 模式写入数据库文件后持久生效，每个进程只需设置一次
+            self._sqlite_wal_enabled = False
+
+        # execute_cached 使用的 SQL 文本缓存：key -> 已替换占位符的 SQL
+        self._sql_cache = {}
+
+        # 站点信息缓存：昵称或英文站点名 -> (过期时间, 站点信息)
+        self._site_cache = {}
+        self._site_cache_lock = threading.Lock()
+
+        # MySQL/PostgreSQL 使用连接池；SQLite 为本地文件，建连开销可以忽略
+        pool_size = int(config.get("pool_size", 5) or 0)
+        self._pool = None
+        if self.db_type == "mysql" and pool_size > 0:
+            self._pool = _ConnectionPool(self._connect, pool_size,
+                                         lambda conn: conn.is_connected())
+        elif self.db_type == "postgresql" and pool_size > 0:
+            self._pool = _ConnectionPool(self._connect, pool_size,
+                                         lambda conn: conn.closed == 0)
 
         # 初始化迁移管理器
         self.migration_manager = DatabaseMigrationManager(self)
@@ -123,7 +212,13 @@ class DatabaseManager:
                 raise
 
     def _get_connection(self):
-        """返回一个新的数据库连接。"""
+        """返回一个数据库连接，启用连接池时 close() 会将其归还连接池。"""
+        if self._pool is not None:
+            return self._pool.acquire()
+        return self._connect()
+
+    def _connect(self):
+        """建立一个新的数据库连接。"""
         if self.db_type == "mysql":
             # 添加字符集配置以避免字符集冲突
             mysql_config = self.mysql_config.copy()
@@ -134,7 +229,25 @@ class DatabaseManager:
         elif self.db_type == "postgresql":
             return psycopg2.connect(**self.postgresql_config)
         else:
-            return sqlite3.connect(self.sqlite_path, timeout=20)
+            # 放大 SQLite 内置的预编译语句缓存，相同 SQL 文本复用已解析的语句
+            conn = sqlite3.connect(self.sqlite_path, timeout=20, cached_statements=256)
+            self._apply_sqlite_pragmas(conn)
+            return conn
+
+    def _apply_sqlite_pragmas(self, conn):
+        """为 SQLite 连接设置性能相关的 PRAGMA。"""
+        try:
+            if not self._sqlite_wal_enabled:
+                # WAL 允许读写并发，读取（如扫描、查重）不再被写入阻塞
+                conn.execute("PRAGMA journal_mode=WAL")
+                self._sqlite_wal_enabled = True
+            # 以下设置仅对当前连接有效
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA mmap_size=268435456")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            conn.execute("PRAGMA cache_size=-65536")
+        except sqlite3.Error as e:
+            logging.warning(f"设置 SQLite PRAGMA 失败: {e}")
 
     def _get_cursor(self, conn):
         """从连接中返回一个游标。"""
@@ -150,32 +263,72 @@ class DatabaseManager:
         """返回数据库类型对应的正确参数占位符。"""
         return "%s" if self.db_type in ["mysql", "postgresql"] else "?"
 
-    def get_site_by_nickname(self, nickname):
-        """通过站点昵称从数据库中获取站点的完整信息。"""
+    def get_cached_sql(self, key, sql_builder):
+        """返回按 key 缓存的 SQL 文本，sql_builder(placeholder) 只在首次使用该 key 时调用。"""
+        sql = self._sql_cache.get(key)
+        if sql is None:
+            sql = sql_builder(self.get_placeholder())
+            self._sql_cache[key] = sql
+        return sql
+
+    def execute_cached(self, cursor, key, sql_builder, params=()):
+        """执行按 key 缓存的 SQL。
+
+        sql_builder(placeholder) 只在首次使用该 key 时调用以生成 SQL 文本，之后直接复用；
+        SQL 文本保持不变，SQLite 也能命中连接上的预编译语句缓存。
+        适用于每个请求都会执行、结构固定的查询，key 应能唯一标识查询结构。
+        """
+        cursor.execute(self.get_cached_sql(key, sql_builder), params)
+        return cursor
+
+    def get_site_by_nickname_or_code(self, name):
+        """通过站点昵称或英文站点名从数据库中获取站点的完整信息。
+
+        单条查询同时匹配 nickname 与 site 字段，昵称命中的记录优先。
+        结果缓存 SITE_CACHE_TTL 秒，站点增删改时由 invalidate_site_cache() 清空。
+        """
+        now = time.monotonic()
+        with self._site_cache_lock:
+            cached = self._site_cache.get(name)
+        if cached is not None and cached[0] > now:
+            # 返回副本，调用方修改结果不会污染缓存
+            return dict(cached[1])
+
         conn = self._get_connection()
         cursor = self._get_cursor(conn)
         try:
-            # 首先尝试通过nickname查询
-            cursor.execute(
-                f"SELECT * FROM sites WHERE nickname = {self.get_placeholder()}",
-                (nickname, ))
+            self.execute_cached(
+                cursor,
+                "site_by_nickname_or_code",
+                lambda ph: (f"SELECT * FROM sites WHERE nickname = {ph} OR site = {ph} "
+                            f"ORDER BY CASE WHEN nickname = {ph} THEN 0 ELSE 1 END "
+                            "LIMIT 1"),
+                (name, name, name),
+            )
             site_data = cursor.fetchone()
-
-            # 如果通过nickname没有找到，尝试通过site字段查询
             if not site_data:
-                cursor.execute(
-                    f"SELECT * FROM sites WHERE site = {self.get_placeholder()}",
-                    (nickname, ))
-                site_data = cursor.fetchone()
-
-            return dict(site_data) if site_data else None
+                return None
+            site_data = dict(site_data)
+            # 只缓存命中的结果，新增站点后无需等待过期即可查到
+            with self._site_cache_lock:
+                self._site_cache[name] = (now + self.SITE_CACHE_TTL, site_data)
+            return dict(site_data)
         except Exception as e:
-            logging.error(f"通过昵称 '{nickname}' 获取站点信息时出错: {e}")
+            logging.error(f"通过昵称或站点名 '{name}' 获取站点信息时出错: {e}")
             return None
         finally:
             cursor.close()
             conn.close()
 
+    def invalidate_site_cache(self):
+        """清空站点信息缓存，站点数据发生写入后调用。"""
+        with self._site_cache_lock:
+            self._site_cache.clear()
+
+    def get_site_by_nickname(self, nickname):
+        """通过站点昵称从数据库中获取站点的完整信息（昵称未命中时按英文站点名查找）。"""
+        return self.get_site_by_nickname_or_code(nickname)
+
     def add_site(self, site_data):
         """向数据库中添加一个新站点。"""
         conn = self._get_connection()
@@ -230,6 +383,7 @@ class DatabaseManager:
             conn.rollback()
             return False
         finally:
+            self.invalidate_site_cache()
             cursor.close()
             conn.close()
 
@@ -285,6 +439,7 @@ class DatabaseManager:
             conn.rollback()
             return False
         finally:
+            self.invalidate_site_cache()
             cursor.close()
             conn.close()
 
@@ -330,6 +485,7 @@ class DatabaseManager:
             conn.rollback()
             return False
         finally:
+            self.invalidate_site_cache()
             cursor.close()
             conn.close()
 
@@ -352,6 +508,7 @@ class DatabaseManager:
             conn.rollback()
             return False
         finally:
+            self.invalidate_site_cache()
             cursor.close()
             conn.close()
 
@@ -582,6 +739,7 @@ class DatabaseManager:
                 logging.error(f"同步站点数据时出错: {e}", exc_info=True)
                 return False
             finally:
+                self.invalidate_site_cache()
                 if cursor:
                     cursor.close()
                 if conn:
@@ -87,7 +87,10 @@ class DatabaseMigrationManager:
                         },
                         'primary_key': ['hash', 'downloader_id'],
                         'engine': 'InnoDB',
-                        'row_format': 'Dynamic'
+                        'row_format': 'Dynamic',
+                        'indexes': [
+                            'CREATE INDEX idx_torrents_name_size ON torrents(name(255), size)'
+                        ]
                     },
                     'torrent_upload_stats': {
                         'columns': {
@@ -157,7 +160,10 @@ class DatabaseMigrationManager:
                         },
                         'primary_key': ['hash', 'torrent_id', 'site_name'],
                         'engine': 'InnoDB',
-                        'row_format': 'DYNAMIC'
+                        'row_format': 'DYNAMIC',
+                        'indexes': [
+                            'CREATE INDEX idx_seed_params_tid_site_updated ON seed_parameters(torrent_id, site_name, updated_at DESC)'
+                        ]
                     },
                     'batch_enhance_records': {
                         'columns': {
@@ -232,7 +238,10 @@ class DatabaseMigrationManager:
                             'iyuu_last_check': 'TIMESTAMP NULL',
                             'seeders': 'INTEGER DEFAULT 0'
                         },
-                        'primary_key': ['hash', 'downloader_id']
+                        'primary_key': ['hash', 'downloader_id'],
+                        'indexes': [
+                            'CREATE INDEX IF NOT EXISTS idx_torrents_name_size ON torrents(name, size)'
+                        ]
                     },
                     'torrent_upload_stats': {
                         'columns': {
@@ -296,7 +305,10 @@ class DatabaseMigrationManager:
                             'created_at': 'TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP',
                             'updated_at': 'TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP'
                         },
-                        'primary_key': ['hash', 'torrent_id', 'site_name']
+                        'primary_key': ['hash', 'torrent_id', 'site_name'],
+                        'indexes': [
+                            'CREATE INDEX IF NOT EXISTS idx_seed_params_tid_site_updated ON seed_parameters(torrent_id, site_name, updated_at DESC)'
+                        ]
                     },
                     'batch_enhance_records': {
                         'columns': {
@@ -369,7 +381,10 @@ class DatabaseMigrationManager:
                             'iyuu_last_check': 'TEXT NULL',
                             'seeders': 'INTEGER DEFAULT 0'
                         },
-                        'primary_key': ['hash', 'downloader_id']
+                        'primary_key': ['hash', 'downloader_id'],
+                        'indexes': [
+                            'CREATE INDEX IF NOT EXISTS idx_torrents_name_size ON torrents(name, size)'
+                        ]
                     },
                     'torrent_upload_stats': {
                         'columns': {
@@ -433,7 +448,10 @@ class DatabaseMigrationManager:
                             'created_at': 'TEXT NOT NULL',
                             'updated_at': 'TEXT NOT NULL'
                         },
-                        'primary_key': ['hash', 'torrent_id', 'site_name']
+                        'primary_key': ['hash', 'torrent_id', 'site_name'],
+                        'indexes': [
+                            'CREATE INDEX IF NOT EXISTS idx_seed_params_tid_site_updated ON seed_parameters(torrent_id, site_name, updated_at DESC)'
+                        ]
                     },
                     'batch_enhance_records': {
                         'columns': {
@@ -835,8 +853,8 @@ class DatabaseMigrationManager:
                     if 'CREATE INDEX' in index_sql:
                         # 更准确地提取索引名，处理带反引号的情况
                         parts = index_sql.split()
-                        if len(parts) >= 4 and parts[2].upper() == 'INDEX':
-                            index_name = parts[3].strip('`"')
+                        if len(parts) >= 4 and parts[1].upper() == 'INDEX':
+                            index_name = parts[2].strip('`"')
                         else:
                             continue
 
@@ -5,11 +5,36 @@
 
 import json
 import logging
+import threading
 from datetime import datetime
 from typing import Dict, Any, Optional, List
 from flask import g
 
 
+# (torrent_id, site_name) -> (expires_at, (hash, name, title))，迁移批次内种子参数基本不变
+# 由 api.routes_migrate.get_seed_identity 读写，本模块的写入/删除方法负责失效
+SEED_IDENTITY_CACHE = {}
+SEED_IDENTITY_CACHE_LOCK = threading.Lock()
+SEED_IDENTITY_CACHE_TTL = 60
+SEED_IDENTITY_CACHE_MAXSIZE = 4096
+
+
+def invalidate_seed_identity_cache(torrent_id=None, site_name=None, hash=None):
+    """写入/删除 seed_parameters 后调用；不传参数时清空全部缓存
+
+    传入 hash 时同时移除缓存中 hash 相同的条目（按 hash 更新可能改动 torrent_id/site_name）。
+    """
+    with SEED_IDENTITY_CACHE_LOCK:
+        if torrent_id is None and site_name is None and hash is None:
+            SEED_IDENTITY_CACHE.clear()
+            return
+        if torrent_id is not None or site_name is not None:
+            SEED_IDENTITY_CACHE.pop((str(torrent_id), site_name), None)
+        if hash is not None:
+            for key in [k for k, v in SEED_IDENTITY_CACHE.items() if v[1][0] == hash]:
+                del SEED_IDENTITY_CACHE[key]
+
+
 class SeedParameter:
     """种子参数模型类"""
 
@@ -281,6 +306,9 @@ class SeedParameter:
 
             cursor.execute(insert_sql, params)
             conn.commit()
+            invalidate_seed_identity_cache(torrent_id, site_name)
+            if is_placeholder:
+                invalidate_seed_identity_cache(torrent_id, correct_site_name)
 
             return True
 
@@ -448,6 +476,7 @@ class SeedParameter:
                 conn.commit()
                 cursor.close()
                 conn.close()
+                invalidate_seed_identity_cache(torrent_id, site_name)
 
                 logging.info(
                     f"种子参数数据库记录已删除: {torrent_id} from {site_name}, count: {deleted_count}"
@@ -656,6 +685,9 @@ class SeedParameter:
 
             cursor.close()
             conn.close()
+            invalidate_seed_identity_cache(
+                parameters.get("torrent_id"), parameters.get("site_name"), hash=hash
+            )
 
             return True
 
@@ -779,6 +811,9 @@ class SeedParameter:
 
             cursor.close()
             conn.close()
+            invalidate_seed_identity_cache(
+                processed_parameters.get("torrent_id"), processed_parameters.get("site_name")
+            )
 
             return True
 
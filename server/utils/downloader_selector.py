@@ -19,7 +19,7 @@ def select_best_downloader(
     5. 如果都没有 use_proxy=true，选择第一个下载器
     
     Args:
-        downloader_ids: 下载器ID列表
+        downloader_ids: 下载器ID列表（有序，"第一个"按此顺序确定）
         config_manager: 配置管理器
         torrent_list: 可选，种子列表（包含 downloader_id, state, last_seen）
         inactive_torrent_states: 可选，非活跃状态列表
@@ -49,9 +49,10 @@ def select_best_downloader(
     # 如果提供了 torrent_list，按完整逻辑排序
     if torrent_list:
         # 过滤出在 downloader_ids 中的种子
+        downloader_id_set = set(downloader_ids)
         filtered_torrents = [
             t for t in torrent_list
-            if t.get("downloader_id") in downloader_ids
+            if t.get("downloader_id") in downloader_id_set
         ]
         
         if not filtered_torrents:
@@ -0,0 +1,96 @@
+"""
+global_mappings.yaml 的读取与缓存
+
+解析结果按文件 mtime 缓存在进程内，并在同目录写入 JSON 缓存文件加速冷启动；
+由生成结果派生的数据（反向映射表、标题拼接顺序）也存放在 GLOBAL_MAPPINGS_CACHE 中，随配置一起失效。
+"""
+
+import logging
+import os
+import threading
+
+import orjson
+import yaml
+
+from config import GLOBAL_MAPPINGS
+
+# 优先使用 libyaml 提供的 C 解析器，未安装 libyaml 时退回纯 Python 的 SafeLoader
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# global_mappings.yaml 的解析结果及由其生成的反向映射表，按文件 mtime 失效
+GLOBAL_MAPPINGS_CACHE = {
+    "mtime_ns": None,
+    "config": None,
+    "reverse_mappings": None,
+    "title_order": None,
+}
+GLOBAL_MAPPINGS_CACHE_LOCK = threading.Lock()
+# global_mappings.yaml 同目录下的 JSON 缓存文件后缀
+GLOBAL_MAPPINGS_JSON_SUFFIX = ".cache.json"
+
+
+def _ensure_mapping_cache_json(yaml_stat):
+    """读取 global_mappings.yaml 的内容，优先使用同目录下的 JSON 缓存文件。
+
+    JSON 缓存记录了生成时 YAML 的 mtime 与大小，两者一致时直接解析 JSON（比 YAML 快一个数量级）；
+    否则解析 YAML 并原子地重写 JSON 缓存。缓存写入失败不影响读取结果。
+    """
+    source_key = [yaml_stat.st_mtime_ns, yaml_stat.st_size]
+    sidecar_path = GLOBAL_MAPPINGS + GLOBAL_MAPPINGS_JSON_SUFFIX
+    try:
+        with open(sidecar_path, "rb") as f:
+            cached = orjson.loads(f.read())
+        if cached.get("source") == source_key:
+            return cached["data"]
+    except (OSError, orjson.JSONDecodeError, AttributeError, KeyError):
+        pass
+
+    with open(GLOBAL_MAPPINGS, "r", encoding="utf-8") as f:
+        config_data = yaml.load(f, Loader=YAML_LOADER) or {}
+
+    tmp_path = f"{sidecar_path}.{os.getpid()}.tmp"
+    try:
+        # YAML 中出现非字符串键等 JSON 无法等价表示的内容时 orjson 会抛出 TypeError，此时不写缓存
+        payload = orjson.dumps({"source": source_key, "data": config_data})
+        with open(tmp_path, "wb") as f:
+            f.write(payload)
+        os.replace(tmp_path, sidecar_path)
+    except (OSError, TypeError) as e:
+        logging.debug(f"写入 global_mappings JSON 缓存失败: {e}")
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+    return config_data
+
+
+def load_global_mappings_config():
+    """读取 global_mappings.yaml 的解析结果，文件未修改（mtime 不变）时直接返回缓存。
+
+    文件不存在时返回 None；解析失败时抛出异常，由调用方处理。返回值为共享对象，调用方只读。
+    """
+    try:
+        yaml_stat = os.stat(GLOBAL_MAPPINGS)
+    except OSError:
+        return None
+    mtime_ns = yaml_stat.st_mtime_ns
+
+    with GLOBAL_MAPPINGS_CACHE_LOCK:
+        if GLOBAL_MAPPINGS_CACHE["mtime_ns"] == mtime_ns:
+            return GLOBAL_MAPPINGS_CACHE["config"]
+
+    try:
+        config_data = _ensure_mapping_cache_json(yaml_stat)
+    except FileNotFoundError:
+        # stat 之后文件被删除或替换，按文件不存在处理
+        return None
+    logging.info(
+        f"成功从global_mappings.yaml读取配置，包含{len(config_data.get('global_standard_keys') or {})}个类别"
+    )
+
+    with GLOBAL_MAPPINGS_CACHE_LOCK:
+        GLOBAL_MAPPINGS_CACHE["mtime_ns"] = mtime_ns
+        GLOBAL_MAPPINGS_CACHE["config"] = config_data
+        GLOBAL_MAPPINGS_CACHE["reverse_mappings"] = None
+        GLOBAL_MAPPINGS_CACHE["title_order"] = None
+    return config_data
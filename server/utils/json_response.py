@@ -0,0 +1,61 @@
+"""
+基于 orjson 的 JSON 响应工具
+"""
+from datetime import date
+from decimal import Decimal
+
+import orjson
+from flask import current_app
+from werkzeug.http import http_date
+
+
+def _orjson_default(obj):
+    """orjson 不支持的类型（如 MySQL 聚合返回的 Decimal）在此转换"""
+    if isinstance(obj, Decimal):
+        return int(obj) if obj == obj.to_integral_value() else float(obj)
+    raise TypeError
+
+
+def _flask_compat_default(obj):
+    """与 Flask 默认 JSON provider 保持一致：日期输出 HTTP 日期格式，Decimal 输出字符串"""
+    if isinstance(obj, date):
+        return http_date(obj)
+    if isinstance(obj, Decimal):
+        return str(obj)
+    raise TypeError
+
+
+def dumps(obj):
+    """序列化为 JSON bytes，允许非字符串键"""
+    return orjson.dumps(obj, default=_orjson_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+def jsonify_compat(*args, **kwargs):
+    """orjson 版的 flask.jsonify，调用方式与输出与之保持一致（键排序、日期与 Decimal 格式），可直接替换
+
+    与 flask.jsonify 相同：单个位置参数原样序列化，多个位置参数序列化为列表，
+    关键字参数序列化为对象，两者不能同时传入。
+    orjson 无法序列化的值（如超出 64 位的整数）退回 Flask 自带的 JSON provider；
+    唯一的差异是 NaN/Infinity 会输出为 null，而不是非标准的 NaN/Infinity 字面量。
+    """
+    if args and kwargs:
+        raise TypeError("jsonify_compat() takes either args or kwargs, not both")
+    if not args and not kwargs:
+        obj = None
+    elif len(args) == 1:
+        obj = args[0]
+    else:
+        obj = args or kwargs
+
+    try:
+        body = orjson.dumps(
+            obj,
+            default=_flask_compat_default,
+            option=orjson.OPT_NON_STR_KEYS
+            | orjson.OPT_SORT_KEYS
+            | orjson.OPT_PASSTHROUGH_DATETIME
+            | orjson.OPT_APPEND_NEWLINE,
+        )
+    except orjson.JSONEncodeError:
+        return current_app.json.response(obj)
+    return current_app.response_class(body, mimetype="application/json")
@@ -75,6 +75,35 @@ class LogStreamer:
         else:
             logger.warning(f"未找到日志流: {task_id}")
     
+    def emit_log_batch(self, task_id: str, events):
+        """一次性发送多条日志事件，只查找一次日志流
+        
+        Args:
+            task_id: 任务ID
+            events: (step, message, status) 或 (step, message, status, extra) 元组的序列
+        """
+        stream = self.get_stream(task_id)
+        if not stream:
+            logger.warning(f"未找到日志流: {task_id}")
+            return
+        
+        timestamp = time.time()
+        for step, message, status, *rest in events:
+            event = {
+                "timestamp": timestamp,
+                "step": step,
+                "message": message,
+                "status": status
+            }
+            if rest and rest[0]:
+                event.update(rest[0])
+            try:
+                stream.put_nowait(event)
+            except queue.Full:
+                logger.warning(f"日志队列已满，丢弃消息: {task_id}")
+                break
+            logger.debug(f"[{task_id}] {step}: {message} ({status})")
+    
     def close_stream(self, task_id: str):
         """关闭并清理日志流
         